@@ -20,6 +20,7 @@ from .agents import (
     PerplexityResearchAgent,
 )
 from .memory import Memory, SQLiteMemoryStore
+from .tools.legal_tools import close_shared_session as close_legal_session
 
 try:
     from .memory import RedisMemoryStore
@@ -696,6 +697,12 @@ class RegulatoryMultiAgentSystem:
                     except Exception as e:
                         logger.warning("tool_cleanup_failed", tool=type(tool).__name__, error=str(e))
         
+        # Close the HTTP session the jurisprudence tools share
+        try:
+            await close_legal_session()
+        except Exception as e:
+            logger.warning("legal_session_cleanup_failed", error=str(e))
+        
         # Clean up memory store
         try:
             if hasattr(self.memory_store, "close"):
@@ -1,54 +1,238 @@
 """Real legal analysis tools for Grupo Soluto regulatory system."""
 
 import asyncio
+import heapq
 import json
+import math
 import re
+import string
+import sys
+import time
+import unicodedata
+import weakref
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
 from urllib.parse import quote, urljoin
 
 import aiohttp
-from bs4 import BeautifulSoup
-from pydantic import BaseModel, Field
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 
+from ..utils import get_logger
 from .base import BaseTool
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
 
-class BrazilianLegalDatabase(BaseModel):
-    """Database of Brazilian legal sources and courts."""
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# orjson decode errors subclass json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+_minute_timestamp: Tuple[int, str] = (-1, "")
+
+
+def _current_minute_timestamp() -> str:
+    """Return the current time as 'dd/mm/YYYY HH:MM', formatted once per minute."""
+    global _minute_timestamp
+    minute = int(time.time() // 60)
+    if minute != _minute_timestamp[0]:
+        _minute_timestamp = (minute, datetime.fromtimestamp(minute * 60).strftime('%d/%m/%Y %H:%M'))
+    return _minute_timestamp[1]
+
+
+def _has_any_class(*class_names: str) -> Callable[[Any], bool]:
+    """Build a SoupStrainer class filter.
     
-    sources: Dict[str, Dict[str, Any]] = Field(default_factory=lambda: {
-        "stf": {
-            "name": "Supremo Tribunal Federal",
-            "base_url": "https://portal.stf.jus.br",
-            "search_endpoint": "/jurisprudencia/pesquisar",
-            "areas": ["constitucional", "administrativo", "tributario"]
-        },
-        "stj": {
-            "name": "Superior Tribunal de Justiça",
-            "base_url": "https://www.stj.jus.br",
-            "search_endpoint": "/sites/portalp/Paginas/Jurisprudencia/pesquisa-jurisprudencia.aspx",
-            "areas": ["civil", "penal", "administrativo", "tributario"]
-        },
-        "tst": {
-            "name": "Tribunal Superior do Trabalho",
-            "base_url": "https://www.tst.jus.br",
-            "search_endpoint": "/jurisprudencia/pesquisa-jurisprudencia",
-            "areas": ["trabalhista"]
-        },
-        "tcu": {
-            "name": "Tribunal de Contas da União",
-            "base_url": "https://www.tcu.gov.br",
-            "search_endpoint": "/jurisprudencia/pesquisa",
-            "areas": ["administrativo", "financeiro", "orcamentario"]
-        },
-        "cjf": {
-            "name": "Conselho da Justiça Federal",
-            "base_url": "https://www.cjf.jus.br",
-            "search_endpoint": "/jurisprudencia/unificada",
-            "areas": ["federal", "previdenciario", "tributario"]
-        }
-    })
+    While parsing, strainers see the raw ``class`` attribute string (e.g.
+    "resultado destaque"), not the split list ``find_all`` matches against.
+    """
+    wanted = frozenset(class_names)
+    
+    def matches(value: Any) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(classes)
+        
+    return matches
+
+
+# Restrict court page parsing to the elements each parser actually reads
+_STF_RESULT_STRAINER = SoupStrainer('div', class_=_has_any_class('resultado-jurisprudencia', 'item-jurisprudencia'))
+_JSON_SCRIPT_STRAINER = SoupStrainer('script', type='application/json')
+_STJ_RESULT_STRAINER = SoupStrainer('div', class_=_has_any_class('resultado', 'item-resultado'))
+
+# STJ search form lookups, compiled once and evaluated directly on the lxml tree
+_STJ_SEARCH_FORM_XPATH = etree.XPath("boolean(//form[@id='frmPesquisa' or @id='form1'])")
+_VIEWSTATE_XPATH = etree.XPath("string(//input[@name='__VIEWSTATE']/@value)")
+
+def _element_texts(element) -> Tuple[str, str]:
+    """Return an element's raw and stripped text from a single walk of its strings.
+
+    Equivalent to ``(element.get_text(), element.get_text(strip=True))``.
+    """
+    strings = list(element.strings)
+    stripped = (text.strip() for text in strings)
+    return "".join(strings), "".join(text for text in stripped if text)
+
+
+# Class names identifying fields inside an STF result block
+_STF_PROCESSO_CLASSES = frozenset(('numero-processo', 'processo'))
+_STF_EMENTA_CLASSES = frozenset(('ementa', 'texto-ementa'))
+_STF_DATA_CLASSES = frozenset(('data-julgamento', 'data'))
+
+# Court page text filters, compiled once
+_STF_RELATOR_LABEL_RE = re.compile(r'Rel\.?\s*Min\.?')
+_STJ_RELATOR_LABEL_RE = re.compile(r'Ministr[oa]')
+_CNJ_PROCESS_NUMBER_RE = re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}')
+
+# Common patterns for relator extraction, tried in order
+_RELATOR_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Rel\.?\s*Min\.?\s*([A-ZÁÇÃÕ\s]+)',
+        r'Ministr[oa]\s+([A-ZÁÇÃÕ\s]+)',
+        r'Relator[a]?\s*:\s*([A-ZÁÇÃÕ\s]+)',
+    )
+)
+
+
+# Values repeated across every jurisprudence result dict, shared as one object
+_NA = sys.intern("N/A")
+_STF = sys.intern("STF")
+_STJ = sys.intern("STJ")
+
+# Relevance weight per term found in an ementa
+_CASE_RELEVANCE_TERMS: Dict[str, float] = {
+    # Legal importance indicators
+    **dict.fromkeys((
+        'constitucional', 'inconstitucionalidade', 'recurso extraordinário',
+        'repercussão geral', 'precedente', 'jurisprudência consolidada',
+        'súmula', 'orientação jurisprudencial'
+    ), 0.3),
+    # Regulatory terms relevant to Grupo Soluto
+    **dict.fromkeys((
+        'anvisa', 'anatel', 'inmetro', 'regulação', 'vigilância sanitária',
+        'telecomunicações', 'agência reguladora', 'compliance', 'lgpd'
+    ), 0.5),
+}
+
+
+def _build_relevance_automaton() -> Optional[Any]:
+    """Build an Aho-Corasick automaton over the relevance terms, if available.
+    
+    A single pass then reports every term, including overlapping ones such as
+    'constitucional' inside 'inconstitucionalidade'.
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in _CASE_RELEVANCE_TERMS:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+_CASE_RELEVANCE_AUTOMATON = _build_relevance_automaton()
+
+# HTTP session shared by every jurisprudence tool, one per event loop: a
+# session is bound to the loop that created it. Entries go away with their
+# loop; close_shared_session() closes the current loop's one at shutdown
+_shared_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_shared_session() -> aiohttp.ClientSession:
+    """Get or create the running loop's shared HTTP session.
+    
+    Reusing one session keeps TCP/TLS connections (and cookies) to the court
+    hosts alive across tool instances and calls. Nothing between the lookup
+    and the creation awaits, so concurrent callers on the loop can't race
+    and no lock is needed.
+    """
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            # Keep-alive pool with cached DNS for the handful of court hosts
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            # Fail fast on unreachable or stalled courts
+            timeout=aiohttp.ClientTimeout(total=30, connect=10, sock_read=20),
+            # Accept-Encoding is negotiated by aiohttp (br when brotli is installed)
+            headers={
+                "User-Agent": "Grupo Soluto Legal Research/2.0",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            }
+        )
+        _shared_sessions[loop] = session
+    return session
+
+
+async def close_shared_session() -> None:
+    """Close the running loop's shared HTTP session; call once at shutdown.
+    
+    The next search, if any, opens a new session.
+    """
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+# Jurisprudence search results are reused for this long (seconds)
+_SEARCH_CACHE_TTL = 600
+_SEARCH_CACHE_MAX_ENTRIES = 256
+
+
+# Brazilian legal sources and courts (read-only, shared by all tools)
+BRAZILIAN_LEGAL_SOURCES: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    "stf": {
+        "name": "Supremo Tribunal Federal",
+        "base_url": "https://portal.stf.jus.br",
+        "search_endpoint": "/jurisprudencia/pesquisar",
+        "areas": ["constitucional", "administrativo", "tributario"]
+    },
+    "stj": {
+        "name": "Superior Tribunal de Justiça",
+        "base_url": "https://www.stj.jus.br",
+        "search_endpoint": "/sites/portalp/Paginas/Jurisprudencia/pesquisa-jurisprudencia.aspx",
+        "areas": ["civil", "penal", "administrativo", "tributario"]
+    },
+    "tst": {
+        "name": "Tribunal Superior do Trabalho",
+        "base_url": "https://www.tst.jus.br",
+        "search_endpoint": "/jurisprudencia/pesquisa-jurisprudencia",
+        "areas": ["trabalhista"]
+    },
+    "tcu": {
+        "name": "Tribunal de Contas da União",
+        "base_url": "https://www.tcu.gov.br",
+        "search_endpoint": "/jurisprudencia/pesquisa",
+        "areas": ["administrativo", "financeiro", "orcamentario"]
+    },
+    "cjf": {
+        "name": "Conselho da Justiça Federal",
+        "base_url": "https://www.cjf.jus.br",
+        "search_endpoint": "/jurisprudencia/unificada",
+        "areas": ["federal", "previdenciario", "tributario"]
+    }
+})
 
 
 class RealJurisprudenceSearchTool(BaseTool):
@@ -59,20 +243,38 @@ class RealJurisprudenceSearchTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.db = BrazilianLegalDatabase()
-        self.session = None
+        self.db_sources = BRAZILIAN_LEGAL_SOURCES
+        # (tribunal, normalized query, area, limit) -> (stored at, results)
+        self._search_cache: Dict[Tuple[str, str, Optional[str], int], Tuple[float, List[Dict]]] = {}
         
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=60),
-                headers={
-                    "User-Agent": "Grupo Soluto Legal Research/2.0",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                }
-            )
-        return self.session
+        """Get the HTTP session shared by the jurisprudence tools."""
+        return _get_shared_session()
+        
+    async def _cached_search(
+        self,
+        tribunal: str,
+        search: Callable[[str, Optional[str], int], Awaitable[List[Dict]]],
+        termo: str,
+        area: Optional[str],
+        limit: int,
+    ) -> List[Dict]:
+        """Run a tribunal search, reusing results fetched in the last few minutes."""
+        key = (tribunal, termo.strip().lower(), area, limit)
+        cached = self._search_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL:
+            return list(cached[1])
+            
+        results = await search(termo, area, limit)
+        
+        # Empty results usually mean a failed request; don't pin them
+        if results:
+            self._search_cache.pop(key, None)
+            if len(self._search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = (time.monotonic(), list(results))
+        return results
         
     async def _search_stf(self, termo: str, area: str = None, limit: int = 10) -> List[Dict]:
         """Search STF jurisprudence."""
@@ -113,27 +315,25 @@ class RealJurisprudenceSearchTool(BaseTool):
             async with session.get(search_url) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    soup = BeautifulSoup(html, 'lxml', parse_only=_STF_RESULT_STRAINER)
                     
                     results = []
                     jurisprudence_items = soup.find_all('div', class_=['resultado-jurisprudencia', 'item-jurisprudencia'])[:limit]
                     
                     for item in jurisprudence_items:
                         # Extract case information
-                        processo_elem = item.find(['span', 'strong'], class_=['numero-processo', 'processo'])
-                        relator_elem = item.find(['span'], text=re.compile(r'Rel\.?\s*Min\.?'))
-                        ementa_elem = item.find(['div', 'p'], class_=['ementa', 'texto-ementa'])
-                        data_elem = item.find(['span'], class_=['data-julgamento', 'data'])
+                        processo_elem, relator_elem, ementa_elem, data_elem = self._find_stf_fields(item)
                         
                         if processo_elem or ementa_elem:
+                            ementa_raw, ementa_text = _element_texts(ementa_elem) if ementa_elem else ("", "")
                             results.append({
-                                "processo": processo_elem.get_text(strip=True) if processo_elem else "N/A",
+                                "processo": processo_elem.get_text(strip=True) if processo_elem else _NA,
                                 "relator": self._extract_relator(relator_elem.get_text() if relator_elem else ""),
-                                "ementa": ementa_elem.get_text(strip=True)[:500] + "..." if ementa_elem else "N/A",
-                                "data_julgamento": data_elem.get_text(strip=True) if data_elem else "N/A",
-                                "tribunal": "STF",
+                                "ementa": ementa_text[:500] + "..." if ementa_elem else _NA,
+                                "data_julgamento": data_elem.get_text(strip=True) if data_elem else _NA,
+                                "tribunal": _STF,
                                 "url": self._extract_case_url(item),
-                                "relevancia": self._calculate_case_relevance(ementa_elem.get_text() if ementa_elem else "", termo)
+                                "relevancia": self._calculate_case_relevance(ementa_raw, termo)
                             })
                     
                     return results
@@ -143,25 +343,53 @@ class RealJurisprudenceSearchTool(BaseTool):
             
         return []
         
+    def _find_stf_fields(self, item) -> Tuple[Any, Any, Any, Any]:
+        """Locate the processo, relator, ementa and data elements of an STF result.
+        
+        Equivalent to one ``item.find`` per field, but walks the item's
+        descendants once and stops as soon as every field is found.
+        """
+        processo_elem = relator_elem = ementa_elem = data_elem = None
+        
+        for element in item.find_all(['span', 'strong', 'div', 'p']):
+            name = element.name
+            classes = element.get('class') or ()
+            if name == 'span' or name == 'strong':
+                if processo_elem is None and not _STF_PROCESSO_CLASSES.isdisjoint(classes):
+                    processo_elem = element
+                if name == 'span':
+                    if relator_elem is None and element.string and _STF_RELATOR_LABEL_RE.search(element.string):
+                        relator_elem = element
+                    if data_elem is None and not _STF_DATA_CLASSES.isdisjoint(classes):
+                        data_elem = element
+            elif ementa_elem is None and not _STF_EMENTA_CLASSES.isdisjoint(classes):
+                ementa_elem = element
+                
+            if processo_elem is not None and relator_elem is not None and ementa_elem is not None and data_elem is not None:
+                break
+                
+        return processo_elem, relator_elem, ementa_elem, data_elem
+        
     def _parse_stf_results(self, html: str, termo: str) -> List[Dict]:
         """Parse STF search results."""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml', parse_only=_JSON_SCRIPT_STRAINER)
         results = []
         
         # Parse JSON results if available
         script_tags = soup.find_all('script', type='application/json')
         for script in script_tags:
             try:
-                data = json.loads(script.string)
+                # orjson only accepts exact str, not bs4's NavigableString subclass
+                data = _json_loads(str(script.string or ""))
                 if 'resultados' in data:
                     for item in data['resultados']:
                         results.append({
-                            "processo": item.get('numeroProcesso', 'N/A'),
-                            "relator": item.get('relator', 'N/A'),
-                            "ementa": item.get('ementa', 'N/A')[:500] + "...",
-                            "data_julgamento": item.get('dataJulgamento', 'N/A'),
-                            "tribunal": "STF",
-                            "url": item.get('url', 'N/A'),
+                            "processo": item.get('numeroProcesso', _NA),
+                            "relator": item.get('relator', _NA),
+                            "ementa": item.get('ementa', _NA)[:500] + "...",
+                            "data_julgamento": item.get('dataJulgamento', _NA),
+                            "tribunal": _STF,
+                            "url": item.get('url', _NA),
                             "relevancia": self._calculate_case_relevance(item.get('ementa', ''), termo)
                         })
                     break
@@ -181,14 +409,13 @@ class RealJurisprudenceSearchTool(BaseTool):
             async with session.get(search_url) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    root = lxml.html.fromstring(html)
                     
                     # Find search form and extract necessary parameters
-                    form = soup.find('form', id=['frmPesquisa', 'form1'])
-                    if form:
+                    if _STJ_SEARCH_FORM_XPATH(root):
                         # Prepare POST data for search
                         form_data = {
-                            '__VIEWSTATE': soup.find('input', {'name': '__VIEWSTATE'})['value'] if soup.find('input', {'name': '__VIEWSTATE'}) else '',
+                            '__VIEWSTATE': _VIEWSTATE_XPATH(root) or '',
                             'txtPesquisaLivre': termo,
                             'btnPesquisar': 'Pesquisar'
                         }
@@ -205,45 +432,40 @@ class RealJurisprudenceSearchTool(BaseTool):
         
     def _parse_stj_results(self, html: str, termo: str) -> List[Dict]:
         """Parse STJ search results."""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml', parse_only=_STJ_RESULT_STRAINER)
         results = []
         
         # STJ specific result parsing
         result_items = soup.find_all('div', class_=['resultado', 'item-resultado'])
         
         for item in result_items:
-            processo_elem = item.find(['strong', 'span'], text=re.compile(r'\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}'))
-            relator_elem = item.find(text=re.compile(r'Ministr[oa]'))
+            processo_elem = item.find(['strong', 'span'], text=_CNJ_PROCESS_NUMBER_RE)
+            relator_elem = item.find(text=_STJ_RELATOR_LABEL_RE)
             ementa_elem = item.find(['div', 'p'], class_=['ementa', 'texto'])
             
             if processo_elem or ementa_elem:
+                ementa_raw, ementa_text = _element_texts(ementa_elem) if ementa_elem else ("", "")
                 results.append({
-                    "processo": processo_elem.get_text(strip=True) if processo_elem else "N/A",
+                    "processo": processo_elem.get_text(strip=True) if processo_elem else _NA,
                     "relator": self._extract_relator(relator_elem.parent.get_text() if relator_elem else ""),
-                    "ementa": ementa_elem.get_text(strip=True)[:500] + "..." if ementa_elem else "N/A",
-                    "data_julgamento": "N/A",
-                    "tribunal": "STJ",
+                    "ementa": ementa_text[:500] + "..." if ementa_elem else _NA,
+                    "data_julgamento": _NA,
+                    "tribunal": _STJ,
                     "url": self._extract_case_url(item),
-                    "relevancia": self._calculate_case_relevance(ementa_elem.get_text() if ementa_elem else "", termo)
+                    "relevancia": self._calculate_case_relevance(ementa_raw, termo)
                 })
                 
         return results
         
     def _extract_relator(self, text: str) -> str:
         """Extract relator name from text."""
-        # Common patterns for relator extraction
-        patterns = [
-            r'Rel\.?\s*Min\.?\s*([A-ZÁÇÃÕ\s]+)',
-            r'Ministr[oa]\s+([A-ZÁÇÃÕ\s]+)',
-            r'Relator[a]?\s*:\s*([A-ZÁÇÃÕ\s]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _RELATOR_PATTERNS:
+            match = pattern.search(text)
             if match:
-                return match.group(1).strip()
+                # Few distinct ministers appear across many results
+                return sys.intern(match.group(1).strip())
                 
-        return "N/A"
+        return _NA
         
     def _extract_case_url(self, element) -> str:
         """Extract case URL from element."""
@@ -254,7 +476,7 @@ class RealJurisprudenceSearchTool(BaseTool):
                 return href
             elif href.startswith('/'):
                 return f"https://portal.stf.jus.br{href}"
-        return "N/A"
+        return _NA
         
     def _calculate_case_relevance(self, ementa: str, termo: str) -> float:
         """Calculate relevance score for jurisprudence case."""
@@ -270,26 +492,15 @@ class RealJurisprudenceSearchTool(BaseTool):
         if termo_lower in ementa_lower:
             score += 1.0
             
-        # Legal importance indicators
-        importance_terms = [
-            'constitucional', 'inconstitucionalidade', 'recurso extraordinário',
-            'repercussão geral', 'precedente', 'jurisprudência consolidada',
-            'súmula', 'orientação jurisprudencial'
-        ]
-        
-        for term in importance_terms:
-            if term in ementa_lower:
-                score += 0.3
-                
-        # Regulatory terms relevant to Grupo Soluto
-        regulatory_terms = [
-            'anvisa', 'anatel', 'inmetro', 'regulação', 'vigilância sanitária',
-            'telecomunicações', 'agência reguladora', 'compliance', 'lgpd'
-        ]
-        
-        for term in regulatory_terms:
-            if term in ementa_lower:
-                score += 0.5
+        # Legal importance indicators and regulatory terms, each counted once
+        if _CASE_RELEVANCE_AUTOMATON is not None:
+            found = {term for _, term in _CASE_RELEVANCE_AUTOMATON.iter(ementa_lower)}
+        else:
+            found = {term for term in _CASE_RELEVANCE_TERMS if term in ementa_lower}
+            
+        for term, weight in _CASE_RELEVANCE_TERMS.items():
+            if term in found:
+                score += weight
                 
         return min(score, 2.0)
         
@@ -298,101 +509,128 @@ class RealJurisprudenceSearchTool(BaseTool):
         try:
             all_results = []
             
-            # Search specific tribunal or all
+            # Search specific tribunal or all, with tribunals queried concurrently
+            searches = []
             if tribunal.lower() == "stf" or tribunal.lower() == "todos":
-                stf_results = await self._search_stf(query, area, limit // 2)
-                all_results.extend(stf_results)
+                searches.append(("STF", self._cached_search("stf", self._search_stf, query, area, limit // 2)))
                 
             if tribunal.lower() == "stj" or tribunal.lower() == "todos":
-                stj_results = await self._search_stj(query, area, limit // 2)
-                all_results.extend(stj_results)
+                searches.append(("STJ", self._cached_search("stj", self._search_stj, query, area, limit // 2)))
+                
+            search_results = await asyncio.gather(
+                *(search for _, search in searches), return_exceptions=True
+            )
+            for (source, _), results in zip(searches, search_results):
+                if isinstance(results, Exception):
+                    logger.error(f"Erro ao buscar {source}: {results}")
+                    continue
+                all_results.extend(results)
                 
-            # Sort by relevance
-            all_results.sort(key=lambda x: x.get('relevancia', 0), reverse=True)
+            # Select the most relevant cases, already ordered by relevance
+            top_results = heapq.nlargest(limit, all_results, key=lambda x: x.get('relevancia', 0))
             
             if not all_results:
                 return f"Nenhuma jurisprudência encontrada para '{query}' no(s) tribunal(is) {tribunal}"
                 
             # Format results
-            result = f"# Jurisprudência Encontrada\n\n"
-            result += f"**Termo pesquisado:** {query}\n"
-            result += f"**Tribunal(is):** {tribunal}\n"
-            result += f"**Área:** {area or 'Todas'}\n"
-            result += f"**Total de resultados:** {len(all_results)}\n\n"
-            
-            for i, case in enumerate(all_results[:limit], 1):
-                result += f"## {i}. Processo: {case['processo']}\n"
-                result += f"**Tribunal:** {case['tribunal']}\n"
-                result += f"**Relator:** {case['relator']}\n"
-                result += f"**Data:** {case['data_julgamento']}\n"
-                result += f"**Relevância:** {case['relevancia']:.1f}/2.0\n\n"
-                result += f"**Ementa:** {case['ementa']}\n\n"
-                if case['url'] != "N/A":
-                    result += f"**Link:** {case['url']}\n"
-                result += "\n---\n\n"
+            parts: List[str] = ["# Jurisprudência Encontrada\n\n"]
+            parts.append(f"**Termo pesquisado:** {query}\n")
+            parts.append(f"**Tribunal(is):** {tribunal}\n")
+            parts.append(f"**Área:** {area or 'Todas'}\n")
+            parts.append(f"**Total de resultados:** {len(all_results)}\n\n")
+            
+            for i, case in enumerate(top_results, 1):
+                parts.append(f"## {i}. Processo: {case['processo']}\n")
+                parts.append(f"**Tribunal:** {case['tribunal']}\n")
+                parts.append(f"**Relator:** {case['relator']}\n")
+                parts.append(f"**Data:** {case['data_julgamento']}\n")
+                parts.append(f"**Relevância:** {case['relevancia']:.1f}/2.0\n\n")
+                parts.append(f"**Ementa:** {case['ementa']}\n\n")
+                if case['url'] != _NA:
+                    parts.append(f"**Link:** {case['url']}\n")
+                parts.append("\n---\n\n")
                 
-            return result
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Erro na busca de jurisprudência: {e}")
             return f"Erro na busca de jurisprudência: {str(e)}"
             
     async def cleanup(self):
-        """Clean up resources."""
-        if self.session:
-            await self.session.close()
+        """Clean up resources.
+        
+        The HTTP session is shared with other instances, so it is left open;
+        ``close_shared_session`` closes it at shutdown.
+        """
 
 
-class ContractAnalysisTool(BaseTool):
-    """Real contract analysis tool with legal validation."""
-    
-    name = "contract_analysis"
-    description = "Análise real de contratos com validação legal e identificação de riscos"
-    
-    def __init__(self):
-        super().__init__()
-        self.risk_patterns = self._load_risk_patterns()
-        self.clause_templates = self._load_clause_templates()
-        
-    def _load_risk_patterns(self) -> Dict[str, List[str]]:
-        """Load contract risk patterns."""
-        return {
-            "high_risk": [
-                r"sem limite de responsabilidade",
-                r"responsabilidade ilimitada",
-                r"renúncia.*direitos",
-                r"irrevogável.*irretratável",
-                r"multa.*superior.*30%",
-                r"cláusula.*leonina",
-                r"foro.*exclusivo.*[^brasil]"
-            ],
-            "medium_risk": [
-                r"rescisão.*imotivada",
-                r"multa.*rescisória",
-                r"prazo.*prorrogação.*automática",
-                r"alteração.*unilateral",
-                r"confidencialidade.*período.*superior.*5.*anos"
-            ],
-            "compliance_risk": [
-                r"sem.*adequação.*lgpd",
-                r"transferência.*dados.*exterior",
-                r"ausência.*cláusula.*anticorrupção",
-                r"não.*menciona.*compliance",
-                r"sem.*auditoria.*terceiros"
-            ],
-            "regulatory_risk": [
-                r"não.*atende.*anvisa",
-                r"sem.*certificação.*anatel",
-                r"ausência.*licenças.*ambientais",
-                r"não.*contempla.*normas.*técnicas",
-                r"sem.*validação.*inmetro"
-            ]
-        }
-        
-    def _load_clause_templates(self) -> Dict[str, str]:
-        """Load standard clause templates."""
-        return {
-            "lgpd_compliance": """
+# Descriptions for known risk patterns, matched against the pattern source
+_RISK_DESCRIPTIONS = tuple(
+    (re.compile(desc_pattern), description)
+    for desc_pattern, description in (
+        ("sem limite de responsabilidade", "Responsabilidade ilimitada pode expor a empresa a riscos financeiros excessivos"),
+        ("multa.*superior.*30%", "Multa excessiva pode indicar desequilíbrio contratual"),
+        ("rescisão.*imotivada", "Possibilidade de rescisão sem justa causa pode criar instabilidade"),
+        ("não.*adequação.*lgpd", "Ausência de adequação à LGPD pode resultar em multas regulatórias"),
+        ("transferência.*dados.*exterior", "Transferência internacional de dados requer salvaguardas especiais"),
+    )
+)
+
+
+# Score added per match of a pattern at each risk level, and the score cap
+_RISK_LEVEL_WEIGHTS = MappingProxyType({
+    "high_risk": 1.0,
+    "medium_risk": 0.6,
+    "compliance_risk": 0.8,
+    "regulatory_risk": 0.7,
+})
+_MAX_RISK_SCORE = 10.0
+
+# Contract risk patterns per risk level
+_RISK_PATTERN_SOURCES: Dict[str, List[str]] = {
+    "high_risk": [
+        r"sem limite de responsabilidade",
+        r"responsabilidade ilimitada",
+        r"renúncia.*direitos",
+        r"irrevogável.*irretratável",
+        r"multa.*superior.*30%",
+        r"cláusula.*leonina",
+        r"foro.*exclusivo.*[^brasil]"
+    ],
+    "medium_risk": [
+        r"rescisão.*imotivada",
+        r"multa.*rescisória",
+        r"prazo.*prorrogação.*automática",
+        r"alteração.*unilateral",
+        r"confidencialidade.*período.*superior.*5.*anos"
+    ],
+    "compliance_risk": [
+        r"sem.*adequação.*lgpd",
+        r"transferência.*dados.*exterior",
+        r"ausência.*cláusula.*anticorrupção",
+        r"não.*menciona.*compliance",
+        r"sem.*auditoria.*terceiros"
+    ],
+    "regulatory_risk": [
+        r"não.*atende.*anvisa",
+        r"sem.*certificação.*anatel",
+        r"ausência.*licenças.*ambientais",
+        r"não.*contempla.*normas.*técnicas",
+        r"sem.*validação.*inmetro"
+    ]
+}
+
+# Keywords (regex fragments) evidencing each essential clause
+_ESSENTIAL_CLAUSE_KEYWORDS: Dict[str, List[str]] = {
+    "lgpd": ["lgpd", "proteção.*dados", "privacidade", "dados.*pessoais"],
+    "anticorrupcao": ["anticorrupção", "compliance", "integridade", "lei.*12.846"],
+    "responsabilidade": ["responsabilidade", "limitação.*danos", "indenização"],
+    "resolucao_disputas": ["foro", "arbitragem", "mediação", "jurisdição"]
+}
+
+# Standard clause templates suggested for missing clauses
+_CLAUSE_TEMPLATES: Dict[str, str] = {
+    "lgpd_compliance": """
             CLÁUSULA DE PROTEÇÃO DE DADOS PESSOAIS
             
             As partes declaram conhecer e se comprometem a cumprir integralmente as disposições da Lei nº 13.709/2018 (Lei Geral de Proteção de Dados Pessoais - LGPD), especialmente:
@@ -402,8 +640,8 @@ class ContractAnalysisTool(BaseTool):
             c) Notificar a outra parte sobre qualquer incidente de segurança em até 24 horas;
             d) Permitir auditoria sobre as práticas de proteção de dados.
             """,
-            
-            "anticorrupcao": """
+    
+    "anticorrupcao": """
             CLÁUSULA ANTICORRUPÇÃO
             
             As partes declaram conhecer e se comprometem a cumprir rigorosamente as disposições da Lei nº 12.846/2013 (Lei Anticorrupção), comprometendo-se a:
@@ -413,16 +651,16 @@ class ContractAnalysisTool(BaseTool):
             c) Reportar imediatamente qualquer suspeita de ato de corrupção;
             d) Permitir auditorias periódicas de compliance.
             """,
-            
-            "responsabilidade_limitada": """
+    
+    "responsabilidade_limitada": """
             CLÁUSULA DE LIMITAÇÃO DE RESPONSABILIDADE
             
             A responsabilidade das partes por danos diretos será limitada ao valor total do contrato nos 12 (doze) meses anteriores ao evento que deu origem ao dano.
             
             Fica excluída a responsabilidade por danos indiretos, lucros cessantes, danos morais ou consequenciais, exceto em casos de dolo ou culpa grave.
             """,
-            
-            "resolucao_disputas": """
+    
+    "resolucao_disputas": """
             CLÁUSULA DE RESOLUÇÃO DE DISPUTAS
             
             As partes se comprometem a resolver eventuais controvérsias preferencialmente através de:
@@ -433,7 +671,42 @@ class ContractAnalysisTool(BaseTool):
             
             O foro será da comarca de São Paulo/SP, aplicando-se a lei brasileira.
             """
-        }
+}
+
+# Compiled once at import time and shared by every ContractAnalysisTool.
+# All contract patterns are case-insensitive.
+_RISK_PATTERNS: Dict[str, List[re.Pattern]] = {
+    risk_level: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for risk_level, patterns in _RISK_PATTERN_SOURCES.items()
+}
+
+# One alternation per risk level: a single scan tells whether any of the
+# level's patterns occurs before counting each one
+_RISK_LEVEL_SCREENS: Dict[str, re.Pattern] = {
+    risk_level: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for risk_level, patterns in _RISK_PATTERN_SOURCES.items()
+}
+
+# Each clause type's keywords joined into one alternation, so a single search
+# tells whether any of them occurs in the contract
+_ESSENTIAL_CLAUSE_PATTERNS: Dict[str, re.Pattern] = {
+    clause_type: re.compile("|".join(f"(?:{keyword})" for keyword in keywords), re.IGNORECASE)
+    for clause_type, keywords in _ESSENTIAL_CLAUSE_KEYWORDS.items()
+}
+
+
+class ContractAnalysisTool(BaseTool):
+    """Real contract analysis tool with legal validation."""
+    
+    name = "contract_analysis"
+    description = "Análise real de contratos com validação legal e identificação de riscos"
+    
+    def __init__(self):
+        super().__init__()
+        self.risk_patterns = _RISK_PATTERNS
+        self._risk_level_screens = _RISK_LEVEL_SCREENS
+        self.essential_clauses = _ESSENTIAL_CLAUSE_PATTERNS
+        self.clause_templates = _CLAUSE_TEMPLATES
         
     def _analyze_contract_text(self, contract_text: str) -> Dict[str, Any]:
         """Analyze contract text for risks and compliance."""
@@ -445,33 +718,30 @@ class ContractAnalysisTool(BaseTool):
             "recommendations": []
         }
         
-        contract_lower = contract_text.lower()
-        
-        # Analyze risk patterns
+        # Analyze risk patterns. All contract patterns are compiled
+        # case-insensitive, so the text is matched without a lowercased copy
+        score = 0.0
         for risk_level, patterns in self.risk_patterns.items():
+            if not self._risk_level_screens[risk_level].search(contract_text):
+                continue
+            weight = _RISK_LEVEL_WEIGHTS.get(risk_level, 0.5)
             for pattern in patterns:
-                matches = re.findall(pattern, contract_lower, re.IGNORECASE)
-                if matches:
-                    risk_weight = {"high_risk": 1.0, "medium_risk": 0.6, "compliance_risk": 0.8, "regulatory_risk": 0.7}
-                    analysis["risk_score"] += risk_weight.get(risk_level, 0.5) * len(matches)
-                    
+                match_count = len(pattern.findall(contract_text))
+                # Past the cap more matches can't change the normalized score
+                if score < _MAX_RISK_SCORE:
+                    score += weight * match_count
+                if match_count:
                     analysis["identified_risks"].append({
-                        "pattern": pattern,
+                        "pattern": pattern.pattern,
                         "level": risk_level,
-                        "matches": len(matches),
-                        "description": self._get_risk_description(pattern, risk_level)
+                        "matches": match_count,
+                        "description": self._get_risk_description(pattern.pattern, risk_level)
                     })
+        analysis["risk_score"] = score
                     
         # Check for missing essential clauses
-        essential_clauses = {
-            "lgpd": ["lgpd", "proteção.*dados", "privacidade", "dados.*pessoais"],
-            "anticorrupcao": ["anticorrupção", "compliance", "integridade", "lei.*12.846"],
-            "responsabilidade": ["responsabilidade", "limitação.*danos", "indenização"],
-            "resolucao_disputas": ["foro", "arbitragem", "mediação", "jurisdição"]
-        }
-        
-        for clause_type, keywords in essential_clauses.items():
-            if not any(re.search(keyword, contract_lower) for keyword in keywords):
+        for clause_type, keywords in self.essential_clauses.items():
+            if not keywords.search(contract_text):
                 analysis["missing_clauses"].append(clause_type)
                 
         # Compliance gap analysis
@@ -485,22 +755,14 @@ class ContractAnalysisTool(BaseTool):
         analysis["recommendations"] = self._generate_recommendations(analysis)
         
         # Normalize risk score (0-10)
-        analysis["risk_score"] = min(analysis["risk_score"], 10.0)
+        analysis["risk_score"] = min(analysis["risk_score"], _MAX_RISK_SCORE)
         
         return analysis
         
     def _get_risk_description(self, pattern: str, risk_level: str) -> str:
         """Get description for identified risk pattern."""
-        descriptions = {
-            "sem limite de responsabilidade": "Responsabilidade ilimitada pode expor a empresa a riscos financeiros excessivos",
-            "multa.*superior.*30%": "Multa excessiva pode indicar desequilíbrio contratual",
-            "rescisão.*imotivada": "Possibilidade de rescisão sem justa causa pode criar instabilidade",
-            "não.*adequação.*lgpd": "Ausência de adequação à LGPD pode resultar em multas regulatórias",
-            "transferência.*dados.*exterior": "Transferência internacional de dados requer salvaguardas especiais"
-        }
-        
-        for desc_pattern, description in descriptions.items():
-            if re.search(desc_pattern, pattern):
+        for desc_pattern, description in _RISK_DESCRIPTIONS:
+            if desc_pattern.search(pattern):
                 return description
                 
         return f"Risco identificado no padrão: {pattern}"
@@ -536,59 +798,61 @@ class ContractAnalysisTool(BaseTool):
             if len(contract_text) < 100:
                 return "Texto do contrato muito curto para análise efetiva. Forneça o texto completo."
                 
-            analysis = self._analyze_contract_text(contract_text)
+            # Regex scans over long contracts are CPU-bound; run in thread pool
+            loop = asyncio.get_event_loop()
+            analysis = await loop.run_in_executor(None, self._analyze_contract_text, contract_text)
             
             # Format analysis results
-            result = f"# Análise de Contrato - {contract_type.title()}\n\n"
-            result += f"**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-            result += f"**Tamanho do Contrato:** {len(contract_text)} caracteres\n\n"
+            parts: List[str] = [f"# Análise de Contrato - {contract_type.title()}\n\n"]
+            parts.append(f"**Data da Análise:** {_current_minute_timestamp()}\n")
+            parts.append(f"**Tamanho do Contrato:** {len(contract_text)} caracteres\n\n")
             
             # Risk Score
             risk_level = "BAIXO" if analysis["risk_score"] < 3 else "MÉDIO" if analysis["risk_score"] < 7 else "ALTO"
-            result += f"## Pontuação de Risco: {analysis['risk_score']:.1f}/10.0 ({risk_level})\n\n"
+            parts.append(f"## Pontuação de Risco: {analysis['risk_score']:.1f}/10.0 ({risk_level})\n\n")
             
             # Identified Risks
             if analysis["identified_risks"]:
-                result += "## Riscos Identificados\n\n"
+                parts.append("## Riscos Identificados\n\n")
                 for risk in analysis["identified_risks"]:
-                    result += f"- **{risk['level'].upper()}**: {risk['description']}\n"
-                result += "\n"
+                    parts.append(f"- **{risk['level'].upper()}**: {risk['description']}\n")
+                parts.append("\n")
                 
             # Missing Clauses
             if analysis["missing_clauses"]:
-                result += "## Cláusulas Ausentes\n\n"
+                parts.append("## Cláusulas Ausentes\n\n")
                 for clause in analysis["missing_clauses"]:
-                    result += f"- {clause.upper()}: {self._get_clause_importance(clause)}\n"
-                result += "\n"
+                    parts.append(f"- {clause.upper()}: {self._get_clause_importance(clause)}\n")
+                parts.append("\n")
                 
             # Compliance Gaps
             if analysis["compliance_gaps"]:
-                result += "## Lacunas de Compliance\n\n"
+                parts.append("## Lacunas de Compliance\n\n")
                 for gap in analysis["compliance_gaps"]:
-                    result += f"- {gap}\n"
-                result += "\n"
+                    parts.append(f"- {gap}\n")
+                parts.append("\n")
                 
             # Recommendations
             if analysis["recommendations"]:
-                result += "## Recomendações\n\n"
+                parts.append("## Recomendações\n\n")
                 for i, rec in enumerate(analysis["recommendations"], 1):
-                    result += f"{i}. {rec}\n"
-                result += "\n"
+                    parts.append(f"{i}. {rec}\n")
+                parts.append("\n")
                 
             # Suggested Clauses
             if detailed_analysis and analysis["missing_clauses"]:
-                result += "## Cláusulas Sugeridas\n\n"
+                parts.append("## Cláusulas Sugeridas\n\n")
                 for missing_clause in analysis["missing_clauses"]:
                     if missing_clause in self.clause_templates:
-                        result += f"### {missing_clause.upper()}\n"
-                        result += self.clause_templates[missing_clause]
-                        result += "\n\n"
+                        parts.append(f"### {missing_clause.upper()}\n")
+                        parts.append(self.clause_templates[missing_clause])
+                        parts.append("\n\n")
                         
-            result += "---\n\n"
-            result += "**Aviso Legal:** Esta análise é apenas informativa e não substitui a consultoria jurídica especializada.\n"
-            result += "**Recomendação:** Sempre consulte um advogado antes de assinar contratos importantes."
+            parts.append("---\n\n")
+            parts.append("**Aviso Legal:** Esta análise é apenas informativa e não substitui a consultoria jurídica especializada.\n")
+            parts.append("**Recomendação:** Sempre consulte um advogado antes de assinar contratos importantes.")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Erro na análise de contrato: {e}")
@@ -605,6 +869,203 @@ class ContractAnalysisTool(BaseTool):
         return importance_map.get(clause_type, "Cláusula recomendada para melhor proteção jurídica")
 
 
+_PUNCTUATION_TO_SPACE = str.maketrans({char: " " for char in string.punctuation + "•–—"})
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace.
+    
+    'Programas (PPRA, PCMSO)' and 'programas ppra pcmso' normalize identically,
+    as do 'Licenças' and 'licencas'.
+    """
+    text = text.lower().translate(_PUNCTUATION_TO_SPACE)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(text.split())
+
+
+# Implemented items beyond this are ignored by the audit
+_MAX_AUDIT_ITEMS = 500
+
+# (minimum percentage, level, status color), highest threshold first
+_COMPLIANCE_LEVELS = (
+    (90, "EXCELENTE", "🟢"),
+    (75, "BOM", "🟡"),
+    (50, "REGULAR", "🟠"),
+    (0, "INADEQUADO", "🔴"),
+)
+
+# Missing requirements mentioning any of these get a 30-day, high-priority slot
+_HIGH_PRIORITY_KEYWORDS = ("política", "dpo", "licenças")
+
+# Per area: one pattern naming each recommendation trigger as a group, and
+# the recommendations in the order they are emitted
+_AREA_RECOMMENDATION_RULES: Dict[str, Tuple[re.Pattern, Tuple[Tuple[str, str], ...]]] = {
+    "lgpd": (
+        re.compile(r"(?P<dpo>encarregado|dpo)|(?P<inventario>inventário)", re.IGNORECASE),
+        (
+            ("dpo", "PRIORIDADE ALTA: Designar Encarregado de Dados (DPO)"),
+            ("inventario", "PRIORIDADE ALTA: Realizar inventário completo de dados pessoais"),
+        ),
+    ),
+    "anticorrupcao": (
+        re.compile(r"(?P<politica>política)|(?P<due_diligence>due diligence)", re.IGNORECASE),
+        (
+            ("politica", "PRIORIDADE ALTA: Aprovar política anticorrupção"),
+            ("due_diligence", "PRIORIDADE MÉDIA: Implementar due diligence de terceiros"),
+        ),
+    ),
+    "trabalhista": (
+        re.compile(r"(?P<sso>sso|segurança)", re.IGNORECASE),
+        (
+            ("sso", "PRIORIDADE ALTA: Adequar programas de segurança ocupacional"),
+        ),
+    ),
+    "ambiental": (
+        re.compile(r"(?P<licencas>licenças)", re.IGNORECASE),
+        (
+            ("licencas", "PRIORIDADE CRÍTICA: Regularizar licenças ambientais"),
+        ),
+    ),
+}
+
+_ACTION_PLAN_HEADER = (
+    "## Plano de Ação Sugerido\n\n"
+    "| Item | Responsável | Prazo | Prioridade |\n"
+    "|------|-------------|-------|------------|\n"
+)
+
+_AUDIT_REPORT_TEMPLATE = (
+    "**Área Auditada:** {area}\n\n"
+    "## Status de Compliance {status_color}\n\n"
+    "**Nível:** {compliance_level}\n"
+    "**Percentual:** {compliance_percentage:.1f}%\n"
+    "**Itens Implementados:** {implemented_count}/{total_requirements}\n\n"
+    "{missing_section}"
+    "{recommendations_section}"
+    "{action_plan_section}"
+    "---\n\n"
+    "**Próximos Passos:**\n"
+    "1. Definir responsáveis para cada item pendente\n"
+    "2. Estabelecer cronograma detalhado de implementação\n"
+    "3. Agendar revisões periódicas de progresso\n"
+    "4. Realizar nova auditoria em 90 dias\n\n"
+    "**Aviso:** Esta auditoria é baseada em análise preliminar. "
+    "Recomenda-se validação por consultoria jurídica especializada."
+)
+
+
+_COMPLIANCE_FRAMEWORKS: Dict[str, Dict[str, Any]] = {
+    "geral": {
+        "name": "Compliance Geral Empresarial",
+        "requirements": (
+            "Código de Ética e Conduta aprovado",
+            "Canal de denúncias implementado",
+            "Programa de treinamento em compliance",
+            "Procedimentos de due diligence",
+            "Controles internos documentados",
+            "Auditoria interna de compliance",
+            "Comitê de compliance estabelecido"
+        )
+    },
+    "lgpd": {
+        "name": "Compliance LGPD",
+        "requirements": (
+            "Encarregado de Dados (DPO) designado",
+            "Inventário de dados pessoais",
+            "Base legal definida para tratamentos",
+            "Política de Privacidade atualizada",
+            "Procedimentos de resposta a titulares",
+            "Relatório de Impacto (RIPD) quando aplicável",
+            "Contratos de processamento com terceiros",
+            "Medidas de segurança implementadas",
+            "Procedimentos de notificação de incidentes"
+        )
+    },
+    "anticorrupcao": {
+        "name": "Compliance Anticorrupção",
+        "requirements": (
+            "Política anticorrupção aprovada",
+            "Due diligence de terceiros",
+            "Controles de presentes e hospitalidades",
+            "Monitoramento de pagamentos",
+            "Treinamento específico anticorrupção",
+            "Canal de denúncias específico",
+            "Auditoria de riscos de corrupção",
+            "Certificações anticorrupção"
+        )
+    },
+    "trabalhista": {
+        "name": "Compliance Trabalhista",
+        "requirements": (
+            "Registros de empregados atualizados",
+            "Cumprimento de jornada de trabalho",
+            "Pagamento de verbas trabalhistas",
+            "Segurança e saúde ocupacional (SSO)",
+            "Programas obrigatórios (PPRA, PCMSO)",
+            "Comissões internas (CIPA, etc.)",
+            "Adequação a convenções coletivas",
+            "Licenças e autorizações do trabalho"
+        )
+    },
+    "ambiental": {
+        "name": "Compliance Ambiental",
+        "requirements": (
+            "Licenças ambientais válidas",
+            "Controle de emissões e efluentes",
+            "Gestão de resíduos sólidos",
+            "Monitoramento ambiental",
+            "Planos de contingência ambiental",
+            "Treinamento em questões ambientais",
+            "Relatórios de sustentabilidade",
+            "Adequação a normas ISO 14001"
+        )
+    }
+}
+
+
+def _build_keyword_index(
+    frameworks: Dict[str, Dict[str, Any]],
+) -> Dict[str, Tuple[Dict[str, int], List[int], List[str]]]:
+    """Map each requirement keyword to a bitmask of the requirements containing it.
+    
+    Also returns, per area, the keyword hits each requirement needs to be
+    considered met (60% of its distinct keywords, rounded up to a whole
+    count so the hot loop compares integers) and the normalized
+    requirement phrases used for exact matching, padded with a space on
+    each side so they only match whole words. Keywords are interned and
+    accent-stripped, see ``_normalize_text``.
+    """
+    index = {}
+    for area, framework in frameworks.items():
+        word_masks: Dict[str, int] = {}
+        thresholds = []
+        phrases = []
+        for bit, requirement in enumerate(framework["requirements"]):
+            phrase = _normalize_text(requirement)
+            keywords = set(map(sys.intern, phrase.split()))
+            for word in keywords:
+                word_masks[word] = word_masks.get(word, 0) | (1 << bit)
+            thresholds.append(math.ceil(len(keywords) * 0.6))
+            phrases.append(f" {phrase} ")
+        index[area] = (word_masks, thresholds, phrases)
+    return index
+
+
+def _find_high_priority_requirements(frameworks: Dict[str, Dict[str, Any]]) -> frozenset:
+    """Collect requirements that get high priority in the action plan."""
+    return frozenset(
+        requirement
+        for framework in frameworks.values()
+        for requirement in framework["requirements"]
+        if any(keyword in requirement.lower() for keyword in _HIGH_PRIORITY_KEYWORDS)
+    )
+
+
+# Derived once at import time and shared by every tool instance
+_KEYWORD_INDEX = _build_keyword_index(_COMPLIANCE_FRAMEWORKS)
+_HIGH_PRIORITY_REQUIREMENTS = _find_high_priority_requirements(_COMPLIANCE_FRAMEWORKS)
+
+
 class LegalComplianceAuditTool(BaseTool):
     """Real legal compliance audit tool."""
     
@@ -613,117 +1074,84 @@ class LegalComplianceAuditTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.compliance_frameworks = self._load_compliance_frameworks()
+        self.compliance_frameworks = _COMPLIANCE_FRAMEWORKS
+        self._keyword_index = _KEYWORD_INDEX
+        self._high_priority_requirements = _HIGH_PRIORITY_REQUIREMENTS
+        # Per-instance caches; keyed on normalized inputs only. Assessments
+        # are cached separately so the same items audited with and without
+        # an action plan are only matched once
+        self._assess_items = lru_cache(maxsize=512)(self._freeze_assessment)
+        self._build_report = lru_cache(maxsize=256)(self._render_report)
         
-    def _load_compliance_frameworks(self) -> Dict[str, Dict]:
-        """Load compliance frameworks for different areas."""
-        return {
-            "geral": {
-                "name": "Compliance Geral Empresarial",
-                "requirements": [
-                    "Código de Ética e Conduta aprovado",
-                    "Canal de denúncias implementado",
-                    "Programa de treinamento em compliance",
-                    "Procedimentos de due diligence",
-                    "Controles internos documentados",
-                    "Auditoria interna de compliance",
-                    "Comitê de compliance estabelecido"
-                ]
-            },
-            "lgpd": {
-                "name": "Compliance LGPD",
-                "requirements": [
-                    "Encarregado de Dados (DPO) designado",
-                    "Inventário de dados pessoais",
-                    "Base legal definida para tratamentos",
-                    "Política de Privacidade atualizada",
-                    "Procedimentos de resposta a titulares",
-                    "Relatório de Impacto (RIPD) quando aplicável",
-                    "Contratos de processamento com terceiros",
-                    "Medidas de segurança implementadas",
-                    "Procedimentos de notificação de incidentes"
-                ]
-            },
-            "anticorrupcao": {
-                "name": "Compliance Anticorrupção",
-                "requirements": [
-                    "Política anticorrupção aprovada",
-                    "Due diligence de terceiros",
-                    "Controles de presentes e hospitalidades",
-                    "Monitoramento de pagamentos",
-                    "Treinamento específico anticorrupção",
-                    "Canal de denúncias específico",
-                    "Auditoria de riscos de corrupção",
-                    "Certificações anticorrupção"
-                ]
-            },
-            "trabalhista": {
-                "name": "Compliance Trabalhista",
-                "requirements": [
-                    "Registros de empregados atualizados",
-                    "Cumprimento de jornada de trabalho",
-                    "Pagamento de verbas trabalhistas",
-                    "Segurança e saúde ocupacional (SSO)",
-                    "Programas obrigatórios (PPRA, PCMSO)",
-                    "Comissões internas (CIPA, etc.)",
-                    "Adequação a convenções coletivas",
-                    "Licenças e autorizações do trabalho"
-                ]
-            },
-            "ambiental": {
-                "name": "Compliance Ambiental",
-                "requirements": [
-                    "Licenças ambientais válidas",
-                    "Controle de emissões e efluentes",
-                    "Gestão de resíduos sólidos",
-                    "Monitoramento ambiental",
-                    "Planos de contingência ambiental",
-                    "Treinamento em questões ambientais",
-                    "Relatórios de sustentabilidade",
-                    "Adequação a normas ISO 14001"
-                ]
-            }
-        }
+    def _assess_compliance_level(self, area: str, implemented_items: List[str], truncated: bool = False) -> Dict[str, Any]:
+        """Assess compliance level for specific area.
         
-    def _assess_compliance_level(self, area: str, implemented_items: List[str]) -> Dict[str, Any]:
-        """Assess compliance level for specific area."""
+        ``truncated`` flags input already cut to ``_MAX_AUDIT_ITEMS`` items by
+        the caller, so the report can say so.
+        """
         if area not in self.compliance_frameworks:
             return {"error": f"Área de compliance '{area}' não reconhecida"}
             
         framework = self.compliance_frameworks[area]
         total_requirements = len(framework["requirements"])
         
-        # Match implemented items with requirements
-        implemented_count = 0
-        missing_items = []
+        # Match implemented items with requirements: an item meets a requirement
+        # when it contains the requirement phrase as whole words or shares at least
+        # 60% of the requirement's keywords
+        word_masks, thresholds, phrases = self._keyword_index[area]
+        all_met = (1 << total_requirements) - 1
+        met_mask = 0
         
-        for requirement in framework["requirements"]:
-            requirement_met = False
-            for item in implemented_items:
-                if self._items_match(requirement.lower(), item.lower()):
-                    requirement_met = True
-                    break
+        # Normalize and tokenize each distinct item exactly once, up front
+        item_tokens = [
+            (item_lower, frozenset(map(sys.intern, item_lower.split())))
+            for item_lower in dict.fromkeys(map(_normalize_text, implemented_items))
+        ]
+        
+        for item_lower, tokens in item_tokens:
+            if met_mask == all_met:
+                break
+            # Normalized text separates words with single spaces, so padding
+            # the item bounds phrase matches at word edges ("dpo" must not
+            # match inside "dpos")
+            padded_item = f" {item_lower} "
+            for bit, phrase in enumerate(phrases):
+                if phrase in padded_item:
+                    met_mask |= 1 << bit
+                    
+            # Count keyword hits only for requirements still unmet, and only
+            # check the requirements this item actually touched
+            hits: Dict[int, int] = {}
+            for word in word_masks.keys() & tokens:
+                mask = word_masks[word] & ~met_mask
+                while mask:
+                    lowest = mask & -mask
+                    bit = lowest.bit_length() - 1
+                    hits[bit] = hits.get(bit, 0) + 1
+                    mask ^= lowest
+            for bit, count in hits.items():
+                if count >= thresholds[bit]:
+                    met_mask |= 1 << bit
                     
-            if requirement_met:
-                implemented_count += 1
-            else:
-                missing_items.append(requirement)
+        implemented_count = met_mask.bit_count()
+        missing_items = [
+            requirement for bit, requirement in enumerate(framework["requirements"])
+            if not met_mask >> bit & 1
+        ]
                 
         compliance_percentage = (implemented_count / total_requirements) * 100
         
         # Determine compliance level
-        if compliance_percentage >= 90:
-            level = "EXCELENTE"
-            color = "🟢"
-        elif compliance_percentage >= 75:
-            level = "BOM"
-            color = "🟡"
-        elif compliance_percentage >= 50:
-            level = "REGULAR"
-            color = "🟠"
-        else:
-            level = "INADEQUADO"
-            color = "🔴"
+        for threshold, level, color in _COMPLIANCE_LEVELS:
+            if compliance_percentage >= threshold:
+                break
+                
+        recommendations = self._generate_compliance_recommendations(area, missing_items)
+        if truncated:
+            recommendations.append(
+                f"Auditoria limitada aos primeiros {_MAX_AUDIT_ITEMS} itens informados; "
+                "revisar os demais separadamente"
+            )
             
         return {
             "area": area,
@@ -734,19 +1162,9 @@ class LegalComplianceAuditTool(BaseTool):
             "compliance_level": level,
             "status_color": color,
             "missing_items": missing_items,
-            "recommendations": self._generate_compliance_recommendations(area, missing_items)
+            "recommendations": recommendations
         }
         
-    def _items_match(self, requirement: str, implemented: str) -> bool:
-        """Check if implemented item matches requirement."""
-        # Simple keyword matching - can be enhanced with NLP
-        requirement_keywords = set(requirement.split())
-        implemented_keywords = set(implemented.split())
-        
-        # If 60% of requirement keywords are in implemented item, consider it a match
-        common_keywords = requirement_keywords.intersection(implemented_keywords)
-        return len(common_keywords) >= len(requirement_keywords) * 0.6
-        
     def _generate_compliance_recommendations(self, area: str, missing_items: List[str]) -> List[str]:
         """Generate specific recommendations for compliance gaps."""
         recommendations = []
@@ -755,26 +1173,17 @@ class LegalComplianceAuditTool(BaseTool):
             recommendations.append(f"Compliance {area} está adequado. Manter monitoramento contínuo.")
             return recommendations
             
-        # Priority recommendations based on area
-        if area == "lgpd":
-            if any("encarregado" in item.lower() or "dpo" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE ALTA: Designar Encarregado de Dados (DPO)")
-            if any("inventário" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE ALTA: Realizar inventário completo de dados pessoais")
-                
-        elif area == "anticorrupcao":
-            if any("política" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE ALTA: Aprovar política anticorrupção")
-            if any("due diligence" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE MÉDIA: Implementar due diligence de terceiros")
-                
-        elif area == "trabalhista":
-            if any("sso" in item.lower() or "segurança" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE ALTA: Adequar programas de segurança ocupacional")
-                
-        elif area == "ambiental":
-            if any("licenças" in item.lower() for item in missing_items):
-                recommendations.append("PRIORIDADE CRÍTICA: Regularizar licenças ambientais")
+        # Priority recommendations based on area: one scan per missing item
+        # collects every trigger that occurs
+        if area in _AREA_RECOMMENDATION_RULES:
+            pattern, rules = _AREA_RECOMMENDATION_RULES[area]
+            triggered = set()
+            for item in missing_items:
+                for match in pattern.finditer(item):
+                    triggered.add(match.lastgroup)
+            recommendations.extend(
+                recommendation for trigger, recommendation in rules if trigger in triggered
+            )
                 
         # Generic recommendations
         recommendations.append(f"Implementar {len(missing_items)} itens pendentes de compliance")
@@ -784,71 +1193,104 @@ class LegalComplianceAuditTool(BaseTool):
         
         return recommendations
         
+    def _freeze_assessment(self, area: str, items: Tuple[str, ...], truncated: bool) -> Dict[str, Any]:
+        """Assess normalized items, with list results frozen to tuples for caching."""
+        assessment = self._assess_compliance_level(area, list(items), truncated)
+        assessment["missing_items"] = tuple(assessment["missing_items"])
+        assessment["recommendations"] = tuple(assessment["recommendations"])
+        return assessment
+        
+    def _render_report(self, area: str, items: Tuple[str, ...], truncated: bool, generate_action_plan: bool) -> str:
+        """Render the audit report body (everything below the header).
+
+        Pure function of its arguments, so results are memoized through
+        ``self._build_report``. The audit timestamp is added by ``_execute``.
+        """
+        assessment = self._assess_items(area, items, truncated)
+        
+        missing_items = assessment['missing_items']
+        recommendations = assessment['recommendations']
+        
+        missing_section = recommendations_section = action_plan_section = ""
+        if missing_items:
+            missing_section = "".join((
+                "## Itens Pendentes de Implementação\n\n",
+                "\n".join(f"{i}. {item}" for i, item in enumerate(missing_items, 1)),
+                "\n\n",
+            ))
+        if recommendations:
+            recommendations_section = "".join((
+                "## Recomendações\n\n",
+                "\n".join(f"{i}. {rec}" for i, rec in enumerate(recommendations, 1)),
+                "\n\n",
+            ))
+        if generate_action_plan and missing_items:
+            high_priority = self._high_priority_requirements
+            action_plan_section = "".join((
+                _ACTION_PLAN_HEADER,
+                "\n".join(
+                    f"| {item} | A definir | 30 dias | Alta |" if item in high_priority
+                    else f"| {item} | A definir | 60 dias | Média |"
+                    for item in missing_items[:10]  # Limit to top 10
+                ),
+                "\n\n",
+            ))
+            
+        return _AUDIT_REPORT_TEMPLATE.format(
+            area=area.upper(),
+            status_color=assessment['status_color'],
+            compliance_level=assessment['compliance_level'],
+            compliance_percentage=assessment['compliance_percentage'],
+            implemented_count=assessment['implemented_count'],
+            total_requirements=assessment['total_requirements'],
+            missing_section=missing_section,
+            recommendations_section=recommendations_section,
+            action_plan_section=action_plan_section,
+        )
+        
     async def _execute(self, area: str, implemented_items: str, generate_action_plan: bool = True) -> str:
         """Execute legal compliance audit."""
         try:
-            # Parse implemented items
-            items_list = [item.strip() for item in implemented_items.split(",") if item.strip()]
+            items = [item.strip() for item in implemented_items.split(",") if item.strip()]
             
-            if not items_list:
-                return "Lista de itens implementados não pode estar vazia"
+            # Bound the work on pathological input (e.g. a pasted document),
+            # keeping the first items in the order they were given
+            truncated = len(items) > _MAX_AUDIT_ITEMS
+            if truncated:
+                logger.warning(
+                    f"Auditoria {area}: {len(items)} itens informados, "
+                    f"considerando apenas os primeiros {_MAX_AUDIT_ITEMS}"
+                )
+                items = items[:_MAX_AUDIT_ITEMS]
                 
-            # Assess compliance
-            assessment = self._assess_compliance_level(area, items_list)
+            # Normalize implemented items so equivalent inputs share a cache slot
+            items_key = tuple(sorted({_normalize_text(item) for item in items}))
             
-            if "error" in assessment:
-                available_areas = list(self.compliance_frameworks.keys())
-                return f"{assessment['error']}. Áreas disponíveis: {', '.join(available_areas)}"
-                
-            # Format audit report
-            result = f"# Auditoria de Compliance - {assessment['framework_name']}\n\n"
-            result += f"**Data da Auditoria:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-            result += f"**Área Auditada:** {area.upper()}\n\n"
-            
-            # Compliance Status
-            result += f"## Status de Compliance {assessment['status_color']}\n\n"
-            result += f"**Nível:** {assessment['compliance_level']}\n"
-            result += f"**Percentual:** {assessment['compliance_percentage']:.1f}%\n"
-            result += f"**Itens Implementados:** {assessment['implemented_count']}/{assessment['total_requirements']}\n\n"
-            
-            # Missing Items
-            if assessment['missing_items']:
-                result += "## Itens Pendentes de Implementação\n\n"
-                for i, item in enumerate(assessment['missing_items'], 1):
-                    result += f"{i}. {item}\n"
-                result += "\n"
-                
-            # Recommendations
-            if assessment['recommendations']:
-                result += "## Recomendações\n\n"
-                for i, rec in enumerate(assessment['recommendations'], 1):
-                    result += f"{i}. {rec}\n"
-                result += "\n"
-                
-            # Action Plan
-            if generate_action_plan and assessment['missing_items']:
-                result += "## Plano de Ação Sugerido\n\n"
-                result += "| Item | Responsável | Prazo | Prioridade |\n"
-                result += "|------|-------------|-------|------------|\n"
+            if not items_key:
+                return "Lista de itens implementados não pode estar vazia"
                 
-                for item in assessment['missing_items'][:10]:  # Limit to top 10
-                    priority = "Alta" if any(keyword in item.lower() for keyword in ["política", "dpo", "licenças"]) else "Média"
-                    prazo = "30 dias" if priority == "Alta" else "60 dias"
-                    result += f"| {item} | A definir | {prazo} | {priority} |\n"
-                    
-                result += "\n"
+            if area not in self.compliance_frameworks:
+                available_areas = list(self.compliance_frameworks.keys())
+                return f"Área de compliance '{area}' não reconhecida. Áreas disponíveis: {', '.join(available_areas)}"
                 
-            result += "---\n\n"
-            result += "**Próximos Passos:**\n"
-            result += "1. Definir responsáveis para cada item pendente\n"
-            result += "2. Estabelecer cronograma detalhado de implementação\n"
-            result += "3. Agendar revisões periódicas de progresso\n"
-            result += "4. Realizar nova auditoria em 90 dias\n\n"
-            result += "**Aviso:** Esta auditoria é baseada em análise preliminar. "
-            result += "Recomenda-se validação por consultoria jurídica especializada."
+            # Assess and render in thread pool to avoid blocking the event loop
+            loop = asyncio.get_event_loop()
+            report = await loop.run_in_executor(
+                None,
+                self._build_report,
+                area,
+                items_key,
+                truncated,
+                generate_action_plan,
+            )
             
-            return result
+            # Format audit report
+            return "".join((
+                f"# Auditoria de Compliance - {self.compliance_frameworks[area]['name']}\n\n",
+                f"**Data da Auditoria:** {_current_minute_timestamp()}\n",
+                report,
+            ))
             
         except Exception as e:
             self.logger.error(f"Erro na auditoria de compliance: {e}")
-            return f"Erro na auditoria de compliance: {str(e)}"
\ No newline at end of file
+            return f"Erro na auditoria de compliance: {str(e)}"
@@ -3,30 +3,162 @@
 import asyncio
 import json
 import os
+import re
 import time
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aiohttp
-from pydantic import BaseModel, Field
+from dateutil import parser as date_parser
 
 from ..config import get_settings
 from ..utils import get_logger
 from .base import BaseTool, ToolResult
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Request/response codecs: orjson when installed, stdlib json otherwise
+_json_dumps = orjson.dumps if ORJSON_AVAILABLE else json.dumps
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Source types checked in order against citation URLs (substring match)
+_SOURCE_TYPE_DOMAINS = (
+    # Official Brazilian government sources
+    ("official", (
+        "gov.br", "anvisa.gov.br", "anatel.gov.br", "in.gov.br",
+        "planalto.gov.br", "senado.leg.br", "camara.leg.br",
+        "stf.jus.br", "stj.jus.br", "trf", "cvm.gov.br",
+        "receita.fazenda.gov.br", "bcb.gov.br", "inmetro.gov.br"
+    )),
+    # Legal and jurisprudence sources
+    ("legal", (
+        "jusbrasil.com.br", "conjur.com.br", "migalhas.com.br",
+        "direitonet.com.br"
+    )),
+    # Academic and research sources
+    ("academic", (
+        "scielo.br", "scholar.google", "repositorio", ".edu.br",
+        "periodicos.capes.gov.br"
+    )),
+)
+
+# One alternation per source type, so each type is a single regex scan
+_SOURCE_TYPE_PATTERNS = tuple(
+    (source_type, re.compile("|".join(map(re.escape, domains))))
+    for source_type, domains in _SOURCE_TYPE_DOMAINS
+)
+
+# URL keyword -> regulatory body; the first keyword (in this order) found wins
+_REGULATORY_BODIES = (
+    ("anvisa", "ANVISA"),
+    ("anatel", "ANATEL"),
+    ("anac", "ANAC"),
+    ("aneel", "ANEEL"),
+    ("ans", "ANS"),
+    ("anp", "ANP"),
+    ("ancine", "ANCINE"),
+    ("antaq", "ANTAQ"),
+    ("antt", "ANTT"),
+    ("cvm", "CVM"),
+    ("bcb", "Banco Central"),
+    ("inmetro", "INMETRO"),
+    ("mapa", "MAPA"),
+    ("cade", "CADE"),
+    ("inpi", "INPI"),
+)
+
+# Anchored lookahead per keyword: alternatives are tried in table order, so
+# the matched group is the first listed keyword present anywhere in the URL
+_REGULATORY_BODY_RE = re.compile(
+    "|".join(f"(?=.*?({re.escape(keyword)}))" for keyword, _ in _REGULATORY_BODIES),
+    re.DOTALL,
+)
+
+
+def _build_rank_automaton(words: List[str]) -> Optional[Any]:
+    """Build an Aho-Corasick automaton mapping each word to its first rank, if available.
+    
+    One pass over a URL then reports every listed word it contains, so the
+    lowest reported rank is the first matching entry in table order.
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, word in enumerate(words):
+        if not automaton.exists(word):
+            automaton.add_word(word, rank)
+    automaton.make_automaton()
+    return automaton
+
+
+# Flattened (source type rank per domain) and regulatory keyword automata
+_SOURCE_DOMAIN_RANKS = [
+    rank for rank, (_, domains) in enumerate(_SOURCE_TYPE_DOMAINS) for _ in domains
+]
+_SOURCE_DOMAIN_AUTOMATON = _build_rank_automaton(
+    [domain for _, domains in _SOURCE_TYPE_DOMAINS for domain in domains]
+)
+_REGULATORY_BODY_AUTOMATON = _build_rank_automaton(
+    [keyword for keyword, _ in _REGULATORY_BODIES]
+)
+
+
+# Search type specific instructions appended to the regulatory context
+_SEARCH_INSTRUCTIONS = {
+    "regulatory": "Focus on official regulatory requirements, compliance standards, and government publications.",
+    "legal": "Emphasize legal frameworks, jurisprudence, laws, and court decisions.",
+    "technical": "Prioritize technical specifications, standards, and implementation guidelines.",
+    "market": "Include market analysis, competitor practices, and industry trends.",
+}
+
+# Identical searches are answered from memory for this long (seconds)
+_RESULT_CACHE_TTL = 3600
+_RESULT_CACHE_MAX_ENTRIES = 1024
 
-class PerplexitySearchResult(BaseModel):
+# Upper bound on concurrent API requests issued by batch_execute
+_MAX_CONCURRENT_SEARCHES = 8
+
+_PT_BR_PREFERENCE = "Prioritize Brazilian Portuguese sources and provide responses in Portuguese when possible."
+_CITATION_REQUIREMENTS = "\nProvide comprehensive citations with URLs, publication dates, and regulatory body information."
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a citation date in any format dateutil understands.
+    
+    Memoized because the same publication dates recur across citations;
+    parse failures raise and are not cached.
+    """
+    return date_parser.parse(date_str)
+
+
+@dataclass(slots=True, kw_only=True)
+class PerplexitySearchResult:
     """Structured search result from Perplexity."""
     
-    answer: str = Field(..., description="The comprehensive answer from Perplexity")
-    citations: List[Dict[str, Any]] = Field(default_factory=list, description="List of citations")
-    sources: List[str] = Field(default_factory=list, description="Source URLs")
-    confidence_score: float = Field(0.0, description="Confidence score of the answer")
-    search_query: str = Field(..., description="The original search query")
-    timestamp: datetime = Field(default_factory=datetime.now)
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    answer: str  # The comprehensive answer from Perplexity
+    citations: List[Dict[str, Any]] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)  # Source URLs
+    confidence_score: float = 0.0
+    search_query: str  # The original search query
+    timestamp: datetime = field(default_factory=datetime.now)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class PerplexitySonarProTool(BaseTool):
@@ -62,6 +194,16 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
 - Include relevant RDCs, Laws, Decrees, and Normative Instructions
 - Provide citations in Portuguese when available
 - Consider MERCOSUL harmonization when relevant"""
+        # Processed results by normalized search parameters: (stored at, result).
+        # Results are served through asdict(), so callers always get a fresh copy
+        self._result_cache: Dict[Tuple[Any, ...], Tuple[float, PerplexitySearchResult]] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Context joined with each search type's instructions, built once
+        self._query_prefixes = {
+            search_type: f"{self.regulatory_context}\n\n{instructions}"
+            for search_type, instructions in _SEARCH_INSTRUCTIONS.items()
+        }
 
     async def execute(
         self,
@@ -71,6 +213,7 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
         include_analysis: bool = True,
         language: str = "pt-BR",
         max_citations: int = 20,
+        use_cache: bool = True,
     ) -> ToolResult:
         """
         Execute advanced search using Perplexity Sonar Pro.
@@ -82,26 +225,42 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
             include_analysis: Whether to include analytical insights
             language: Language preference (pt-BR for Brazilian Portuguese)
             max_citations: Maximum number of citations to return
+            use_cache: Reuse a result for the same search from the last hour
         """
         start_time = time.time()
         
         try:
-            # Enhance query with regulatory context
-            enhanced_query = self._enhance_query(query, search_type, focus_areas, language)
-            
-            # Execute Perplexity search
-            result = await self._search_with_sonar_pro(
-                enhanced_query,
+            cache_key = (
+                " ".join(query.split()),
+                search_type,
+                tuple(sorted(focus_areas or ())),
                 include_analysis,
-                max_citations
+                language,
+                max_citations,
             )
-            
-            # Process and structure results for regulatory use
-            processed_result = self._process_for_regulatory_use(result, query, search_type)
+            cached = self._result_cache.get(cache_key) if use_cache else None
+            if cached and time.monotonic() - cached[0] < _RESULT_CACHE_TTL:
+                # The cached copy may have been stored under another spelling
+                # of the same query; report the one this caller used
+                processed_result = replace(cached[1], search_query=query)
+            else:
+                # Enhance query with regulatory context
+                enhanced_query = self._enhance_query(query, search_type, focus_areas, language)
+                
+                # Execute Perplexity search
+                result = await self._search_with_sonar_pro(
+                    enhanced_query,
+                    include_analysis,
+                    max_citations
+                )
+                
+                # Process and structure results for regulatory use
+                processed_result = self._process_for_regulatory_use(result, query, search_type)
+                self._cache_result(cache_key, processed_result)
             
             return ToolResult(
                 success=True,
-                output=processed_result.dict(),
+                output=asdict(processed_result),
                 execution_time=time.time() - start_time,
                 metadata={
                     "model": self.model,
@@ -120,6 +279,33 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
                 execution_time=time.time() - start_time,
             )
 
+    def _cache_result(self, key: Tuple[Any, ...], result: PerplexitySearchResult) -> None:
+        """Store a processed result, evicting the oldest entry when full."""
+        self._result_cache.pop(key, None)
+        if len(self._result_cache) >= _RESULT_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._result_cache[next(iter(self._result_cache))]
+        self._result_cache[key] = (time.monotonic(), result)
+
+    async def batch_execute(self, calls: List[Dict[str, Any]]) -> List[ToolResult]:
+        """
+        Execute several searches concurrently over the shared HTTP session.
+        
+        Args:
+            calls: Keyword arguments for each ``execute`` call, e.g.
+                ``[{"query": "RDC 301/2019", "focus_areas": ["ANVISA"]}, ...]``
+        
+        Results are returned in the order of ``calls``. At most
+        ``_MAX_CONCURRENT_SEARCHES`` requests are in flight at once.
+        """
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SEARCHES)
+        
+        async def run(call: Dict[str, Any]) -> ToolResult:
+            async with semaphore:
+                return await self.execute(**call)
+                
+        return await asyncio.gather(*(run(call) for call in calls))
+
     def _enhance_query(
         self,
         query: str,
@@ -128,35 +314,18 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
         language: str
     ) -> str:
         """Enhance query with regulatory context and specifications."""
-        enhanced_parts = [self.regulatory_context]
-        
-        # Add search type specific instructions
-        search_instructions = {
-            "regulatory": "Focus on official regulatory requirements, compliance standards, and government publications.",
-            "legal": "Emphasize legal frameworks, jurisprudence, laws, and court decisions.",
-            "technical": "Prioritize technical specifications, standards, and implementation guidelines.",
-            "market": "Include market analysis, competitor practices, and industry trends.",
-        }
-        
-        if search_type in search_instructions:
-            enhanced_parts.append(search_instructions[search_type])
-        
-        # Add focus areas
-        if focus_areas:
-            areas_str = ", ".join(focus_areas)
-            enhanced_parts.append(f"Pay special attention to these regulatory bodies/areas: {areas_str}")
+        # Regulatory context plus search type specific instructions
+        prefix = self._query_prefixes.get(search_type, self.regulatory_context)
         
-        # Add language preference
-        if language == "pt-BR":
-            enhanced_parts.append("Prioritize Brazilian Portuguese sources and provide responses in Portuguese when possible.")
-        
-        # Add the original query
-        enhanced_parts.append(f"\nSearch Query: {query}")
-        
-        # Add citation requirements
-        enhanced_parts.append("\nProvide comprehensive citations with URLs, publication dates, and regulatory body information.")
+        # Optional focus areas and language preference, each its own paragraph
+        focus = (
+            f"\n\nPay special attention to these regulatory bodies/areas: {', '.join(focus_areas)}"
+            if focus_areas else ""
+        )
+        language_preference = f"\n\n{_PT_BR_PREFERENCE}" if language == "pt-BR" else ""
         
-        return "\n\n".join(enhanced_parts)
+        # Single build: original query and citation requirements close the prompt
+        return f"{prefix}{focus}{language_preference}\n\n\nSearch Query: {query}\n\n{_CITATION_REQUIREMENTS}"
 
     async def _search_with_sonar_pro(
         self,
@@ -194,18 +363,37 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
             "search_recency_filter": "year",  # Focus on recent regulatory changes
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Perplexity API error: {response.status} - {error_text}")
-                
-                return await response.json()
+        session = await self._get_session()
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            data=_json_dumps(payload),
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Perplexity API error: {response.status} - {error_text}")
+            
+            return _json_loads(await response.read())
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the HTTP session used by this tool's API calls.
+        
+        Reusing one session keeps the TLS connection to api.perplexity.ai alive
+        across calls; a new session is opened only after ``cleanup``.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # Keep-alive pool with cached DNS for the single API host
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+        return self._session
+
+    async def cleanup(self) -> None:
+        """Close the HTTP session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
 
     def _process_for_regulatory_use(
         self,
@@ -224,19 +412,20 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
         
         # Extract citations
         citations = perplexity_result.get("citations", [])
-        processed_citations = []
-        
-        for citation in citations:
-            processed_citation = {
+        classify_source = self._classify_source
+        extract_regulatory_body = self._extract_regulatory_body
+        processed_citations = [
+            {
                 "title": citation.get("title", ""),
-                "url": citation.get("url", ""),
+                "url": (url := citation.get("url", "")),
                 "snippet": citation.get("snippet", ""),
                 "published_date": citation.get("published_date"),
-                "source_type": self._classify_source(citation.get("url", "")),
-                "regulatory_body": self._extract_regulatory_body(citation.get("url", "")),
+                "source_type": classify_source(url),
+                "regulatory_body": extract_regulatory_body(url),
                 "relevance_score": citation.get("score", 0.0),
             }
-            processed_citations.append(processed_citation)
+            for citation in citations
+        ]
         
         # Sort citations by relevance and source type
         processed_citations.sort(
@@ -247,11 +436,25 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
             reverse=True
         )
         
-        # Extract source URLs
-        source_urls = [c["url"] for c in processed_citations if c["url"]]
+        # Extract source URLs and tally source quality in a single pass
+        source_urls = []
+        official_count = regulatory_count = recent_count = 0
+        is_recent = self._is_recent
+        now = datetime.now()
+        for c in processed_citations:
+            if c["url"]:
+                source_urls.append(c["url"])
+            if c["source_type"] == "official":
+                official_count += 1
+            if c["regulatory_body"]:
+                regulatory_count += 1
+            if is_recent(c["published_date"], now=now):
+                recent_count += 1
         
         # Calculate confidence score based on citations and source quality
-        confidence_score = self._calculate_confidence(processed_citations, search_type)
+        confidence_score = self._calculate_confidence(
+            len(processed_citations), official_count, regulatory_count, recent_count
+        )
         
         # Create structured result
         return PerplexitySearchResult(
@@ -264,7 +467,7 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
                 "search_type": search_type,
                 "model": self.model,
                 "total_citations": len(citations),
-                "official_sources": sum(1 for c in processed_citations if c["source_type"] == "official"),
+                "official_sources": official_count,
                 "related_questions": perplexity_result.get("related_questions", []),
             }
         )
@@ -273,97 +476,66 @@ Focus on Brazilian regulations, laws, and compliance requirements. When searchin
         """Classify the source type based on URL."""
         url_lower = url.lower()
         
-        # Official Brazilian government sources
-        official_domains = [
-            "gov.br", "anvisa.gov.br", "anatel.gov.br", "in.gov.br",
-            "planalto.gov.br", "senado.leg.br", "camara.leg.br",
-            "stf.jus.br", "stj.jus.br", "trf", "cvm.gov.br",
-            "receita.fazenda.gov.br", "bcb.gov.br", "inmetro.gov.br"
-        ]
-        
-        # Legal and jurisprudence sources
-        legal_domains = [
-            "jusbrasil.com.br", "conjur.com.br", "migalhas.com.br",
-            "direitonet.com.br"
-        ]
-        
-        # Academic and research sources
-        academic_domains = [
-            "scielo.br", "scholar.google", "repositorio", ".edu.br",
-            "periodicos.capes.gov.br"
-        ]
-        
-        if any(domain in url_lower for domain in official_domains):
-            return "official"
-        elif any(domain in url_lower for domain in legal_domains):
-            return "legal"
-        elif any(domain in url_lower for domain in academic_domains):
-            return "academic"
-        else:
-            return "general"
+        if _SOURCE_DOMAIN_AUTOMATON is not None:
+            ranks = [_SOURCE_DOMAIN_RANKS[index] for _, index in _SOURCE_DOMAIN_AUTOMATON.iter(url_lower)]
+            return _SOURCE_TYPE_DOMAINS[min(ranks)][0] if ranks else "general"
+            
+        for source_type, domains_re in _SOURCE_TYPE_PATTERNS:
+            if domains_re.search(url_lower):
+                return source_type
+        return "general"
 
     def _extract_regulatory_body(self, url: str) -> Optional[str]:
         """Extract regulatory body from URL."""
         url_lower = url.lower()
         
-        regulatory_mapping = {
-            "anvisa": "ANVISA",
-            "anatel": "ANATEL",
-            "anac": "ANAC",
-            "aneel": "ANEEL",
-            "ans": "ANS",
-            "anp": "ANP",
-            "ancine": "ANCINE",
-            "antaq": "ANTAQ",
-            "antt": "ANTT",
-            "cvm": "CVM",
-            "bcb": "Banco Central",
-            "inmetro": "INMETRO",
-            "mapa": "MAPA",
-            "cade": "CADE",
-            "inpi": "INPI",
-        }
-        
-        for key, body in regulatory_mapping.items():
-            if key in url_lower:
-                return body
+        if _REGULATORY_BODY_AUTOMATON is not None:
+            ranks = [rank for _, rank in _REGULATORY_BODY_AUTOMATON.iter(url_lower)]
+            return _REGULATORY_BODIES[min(ranks)][1] if ranks else None
+            
+        match = _REGULATORY_BODY_RE.match(url_lower)
+        if match:
+            return _REGULATORY_BODIES[match.lastindex - 1][1]
                 
         return None
 
-    def _calculate_confidence(self, citations: List[Dict[str, Any]], search_type: str) -> float:
-        """Calculate confidence score based on citation quality."""
-        if not citations:
+    def _calculate_confidence(
+        self,
+        total_count: int,
+        official_count: int,
+        regulatory_count: int,
+        recent_count: int
+    ) -> float:
+        """Calculate confidence score from citation quality counts."""
+        if not total_count:
             return 0.0
             
         # Base confidence
         confidence = 0.5
         
         # Boost for official sources
-        official_count = sum(1 for c in citations if c["source_type"] == "official")
         confidence += min(0.3, official_count * 0.05)
         
         # Boost for regulatory body sources
-        regulatory_count = sum(1 for c in citations if c.get("regulatory_body"))
         confidence += min(0.15, regulatory_count * 0.03)
         
         # Boost for recent sources (within last year)
-        recent_count = sum(1 for c in citations if self._is_recent(c.get("published_date")))
         confidence += min(0.05, recent_count * 0.01)
         
         # Ensure confidence is between 0 and 1
         return min(1.0, max(0.0, confidence))
 
-    def _is_recent(self, date_str: Optional[str], days: int = 365) -> bool:
-        """Check if a date string represents a recent date."""
+    def _is_recent(self, date_str: Optional[str], days: int = 365, now: Optional[datetime] = None) -> bool:
+        """Check if a date string represents a recent date (relative to ``now``)."""
         if not date_str:
             return False
             
         try:
-            # Parse various date formats
-            from dateutil import parser
-            date = parser.parse(date_str)
-            return (datetime.now() - date).days <= days
-        except:
+            date = _parse_date(date_str)
+            return ((now or datetime.now()) - date).days <= days
+        except (ValueError, TypeError, OverflowError):
+            # Unparseable or non-string dates, and timezone-aware dates that
+            # cannot be compared with the naive local clock
             return False
 
     def get_schema(self) -> Dict[str, Any]:
@@ -2,17 +2,219 @@
 
 import asyncio
 import json
+import random
 import re
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote, urljoin, urlparse
 
 import aiohttp
-from bs4 import BeautifulSoup
+from aiohttp.resolver import AsyncResolver
+import lxml.html
+from bs4.dammit import UnicodeDammit
+from lxml import etree
 from pydantic import BaseModel, Field
 
+from ..utils import get_logger
 from .base import BaseTool
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import aiodns
+    AIODNS_AVAILABLE = True
+except ImportError:
+    aiodns = None
+    AIODNS_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+
+def _class_test(*class_names: str) -> str:
+    """XPath predicate for elements carrying any of the given classes."""
+    return " or ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in class_names
+    )
+
+
+def _results_xpath(tags: Tuple[str, ...], *class_names: str) -> etree.XPath:
+    """Compile an XPath selecting every result container on a search page."""
+    tag_test = " or ".join(f"self::{tag}" for tag in tags)
+    return etree.XPath(f"//*[({tag_test}) and ({_class_test(*class_names)})]")
+
+
+def _first_xpath(tags: Tuple[str, ...], *class_names: str) -> etree.XPath:
+    """Compile an XPath selecting the first matching descendant in document order.
+    
+    Mirrors BeautifulSoup's ``element.find(tags, class_=class_names)``.
+    """
+    test = " or ".join(f"self::{tag}" for tag in tags)
+    if class_names:
+        test = f"({test}) and ({_class_test(*class_names)})"
+    return etree.XPath(f"(.//*[{test}])[1]")
+
+
+# Result containers and their fields on each search page, compiled once
+_DOU_RESULTS_XPATH = _results_xpath(('div',), 'resultado-busca', 'item-busca')
+_DOU_TITLE_XPATH = _first_xpath(('h3', 'h4', 'a'))
+_DOU_DATE_XPATH = _first_xpath(('span', 'time'), 'data', 'date')
+_DOU_SUMMARY_XPATH = _first_xpath(('p', 'div'), 'resumo', 'summary')
+
+_GOV_BR_RESULTS_XPATH = _results_xpath(('article', 'div'), 'item', 'resultado')
+_GOV_BR_TITLE_XPATH = _first_xpath(('h2', 'h3', 'a'))
+_GOV_BR_DATE_XPATH = _first_xpath(('time', 'span'), 'date', 'data')
+_GOV_BR_SUMMARY_XPATH = _first_xpath(('p', 'div'), 'description', 'resumo')
+
+_JUSBRASIL_RESULTS_XPATH = _results_xpath(('div',), 'SearchResult', 'resultado')
+_JUSBRASIL_TITLE_XPATH = _first_xpath(('h3', 'h2', 'a'))
+_JUSBRASIL_SUMMARY_XPATH = _first_xpath(('p', 'div'), 'excerpt', 'resumo')
+_JUSBRASIL_SOURCE_XPATH = _first_xpath(('span', 'div'), 'source', 'origem')
+
+_SCHOLAR_RESULTS_XPATH = _results_xpath(('div',), 'gs_r', 'gs_ri')
+_SCHOLAR_TITLE_XPATH = _first_xpath(('h3',), 'gs_rt')
+_SCHOLAR_TITLE_LINK_XPATH = _first_xpath(('a',))
+_SCHOLAR_SNIPPET_XPATH = _first_xpath(('div',), 'gs_rs')
+_SCHOLAR_AUTHORS_XPATH = _first_xpath(('div',), 'gs_a')
+
+_LINK_XPATH = etree.XPath("(.//a[@href])[1]")
+
+# Text nodes BeautifulSoup's get_text() reports: script, style and similar
+# contents are left out
+_TEXT_NODES_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]"
+)
+_ASCII_SPACES = " \n\t\f\r"
+
+
+def _html_parser(encoding: Optional[str]) -> Optional[Any]:
+    """lxml HTML parser decoding pages as ``encoding``; None if it is missing or unknown."""
+    if not encoding:
+        return None
+    try:
+        return lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        return None
+
+
+def _parse_html(html: bytes, encoding: Optional[str] = None) -> Optional[Any]:
+    """Parse a search page with lxml; None when the page has no content.
+    
+    The response charset goes straight to libxml2. Without one (or with one
+    libxml2 doesn't know), libxml2 would fall back to Latin-1 for pages
+    lacking a <meta> charset, so the encoding is detected the way
+    BeautifulSoup does it instead. The page stays bytes either way: lxml
+    rejects str input that carries an XML encoding declaration.
+    """
+    # Parsers are not thread-safe; each executor call gets its own
+    parser = _html_parser(encoding)
+    if parser is None:
+        parser = _html_parser(UnicodeDammit(html, is_html=True).original_encoding) or lxml.html.HTMLParser()
+    return etree.fromstring(html, parser)
+
+
+def _first(xpath: etree.XPath, element: Any) -> Optional[Any]:
+    """First element an XPath from ``_first_xpath`` selects, or None."""
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def _element_texts(element: Any) -> Tuple[str, str]:
+    """Return an element's raw and stripped text from a single pass over its text nodes.
+    
+    Equivalent to BeautifulSoup's ``(get_text(), get_text(strip=True))``,
+    including its collapsing of whitespace-only strings to one space or newline.
+    """
+    raw = []
+    stripped = []
+    for text in _TEXT_NODES_XPATH(element):
+        if text.strip(_ASCII_SPACES):
+            raw.append(text)
+            text = text.strip()
+            if text:
+                stripped.append(text)
+        else:
+            raw.append("\n" if "\n" in text else " ")
+    return "".join(raw), "".join(stripped)
+
+
+# Regulatory keywords that boost a result's relevance when present
+_REGULATORY_TERMS = (
+    'anvisa', 'anatel', 'inmetro', 'ibama', 'cvm', 'bacen',
+    'regulamentação', 'compliance', 'lgpd', 'lei', 'decreto',
+    'portaria', 'resolução', 'instrução normativa'
+)
+
+
+_REGULATORY_TERM_SET = frozenset(_REGULATORY_TERMS)
+
+# Fallback without pyahocorasick: one scan reports every regulatory term
+# present. The zero-width lookahead matches at every position, so
+# overlapping occurrences are not skipped (no term is a prefix of another)
+_REGULATORY_TERMS_RE = re.compile(f"(?=({'|'.join(map(re.escape, _REGULATORY_TERMS))}))")
+
+
+@lru_cache(maxsize=64)
+def _query_profile(query: str) -> Tuple[str, Tuple[str, ...], Optional[Any]]:
+    """Lowercase and split a query once, with its keyword automaton.
+    
+    Shared by every result scored against the query. The Aho-Corasick
+    automaton covers the query's words and the regulatory terms, so a single
+    pass over a text reports every keyword it contains; it is None when
+    pyahocorasick is not installed.
+    """
+    query_lower = query.lower()
+    query_words = tuple(query_lower.split())
+    if not AHOCORASICK_AVAILABLE:
+        return query_lower, query_words, None
+    automaton = ahocorasick.Automaton()
+    for keyword in (*query_words, *_REGULATORY_TERMS):
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return query_lower, query_words, automaton
+
+
+def _result_url_key(url: str) -> Optional[str]:
+    """Key identifying the page a result links to, for cross-source deduplication.
+    
+    Scheme and host are case-insensitive and fragments or a trailing slash
+    don't change the page. Relative or missing links yield None: they can't
+    be told apart across sources, and so do malformed ones (scraped hrefs
+    such as "http://[::1" make urlparse raise).
+    """
+    try:
+        parts = urlparse(url.strip())
+    except ValueError:
+        return None
+    if not parts.netloc:
+        return None
+    return parts._replace(
+        scheme=parts.scheme.lower(),
+        netloc=parts.netloc.lower(),
+        path=parts.path.rstrip('/'),
+        fragment=""
+    ).geturl()
+
+
+# Concurrent requests allowed against a single research source host
+_MAX_REQUESTS_PER_SOURCE = 5
+
+# Rate-limited or briefly unavailable portals are retried with exponential backoff
+_FETCH_MAX_RETRIES = 3
+_RETRY_STATUSES = frozenset({429, 503})
+
+# Per-source search results are reused for this long (seconds)
+_SEARCH_CACHE_TTL = 3600
+_SEARCH_CACHE_MAX_ENTRIES = 256
+
 
 class IntelligenceSource(BaseModel):
     """Intelligence source configuration."""
@@ -35,6 +237,10 @@ class RealWebResearchTool(BaseTool):
         super().__init__()
         self.sources = self._load_research_sources()
         self.session = None
+        # Bound concurrent requests per source host instead of sleeping between sources
+        self.source_pools = {name: asyncio.Semaphore(_MAX_REQUESTS_PER_SOURCE) for name in self.sources}
+        # (source, query, days_back) -> (fetched at, results)
+        self._search_cache: Dict[tuple, tuple] = {}
         
     def _load_research_sources(self) -> Dict[str, IntelligenceSource]:
         """Load research sources configuration."""
@@ -78,9 +284,24 @@ class RealWebResearchTool(BaseTool):
         }
         
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if self.session is None:
+        """Get or create HTTP session.
+        
+        One session serves every search for the tool's lifetime; a new one is
+        opened only after ``cleanup`` (or anything else) has closed it.
+        """
+        if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession(
+                # Keep-alive pool; the per-host cap keeps one slow portal from
+                # hogging connections or tripping its rate limiter (HTTP 429).
+                # With aiodns, lookups for the portals' hosts run concurrently
+                # instead of queueing on the default executor.
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=10,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300,
+                    resolver=AsyncResolver() if AIODNS_AVAILABLE else None,
+                ),
                 timeout=aiohttp.ClientTimeout(total=30),
                 headers={
                     "User-Agent": "Grupo Soluto Research Bot/2.0 (Regulatory Intelligence)",
@@ -90,9 +311,33 @@ class RealWebResearchTool(BaseTool):
             )
         return self.session
         
+    async def _fetch(
+        self, source: str, url: str, params: Dict[str, Any], max_retries: int = _FETCH_MAX_RETRIES
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Fetch a search page, returning its raw body and charset.
+        
+        429/503 responses are retried with exponential backoff plus jitter;
+        any other non-200 status, or running out of retries, yields None.
+        """
+        session = await self._get_session()
+        
+        for attempt in range(max_retries):
+            async with self.source_pools[source], session.get(url, params=params) as response:
+                if response.status == 200:
+                    # Raw bytes: lxml decodes them directly with the header charset
+                    return await response.read(), response.charset
+                if response.status not in _RETRY_STATUSES:
+                    return None
+                    
+            # Back off outside the source's slot so other requests can proceed
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(2 ** attempt + random.random())
+                
+        logger.warning(f"{source}: sem resposta após {max_retries} tentativas")
+        return None
+        
     async def _search_dou(self, query: str, days_back: int = 30) -> List[Dict]:
         """Search Diário Oficial da União."""
-        session = await self._get_session()
         results = []
         
         try:
@@ -110,39 +355,52 @@ class RealWebResearchTool(BaseTool):
                 "sortOrder": "desc"
             }
             
-            async with session.get(search_url, params=params) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Parse DOU results
-                    articles = soup.find_all('div', class_=['resultado-busca', 'item-busca'])
-                    
-                    for article in articles[:10]:  # Limit results
-                        title_elem = article.find(['h3', 'h4', 'a'])
-                        date_elem = article.find(['span', 'time'], class_=['data', 'date'])
-                        summary_elem = article.find(['p', 'div'], class_=['resumo', 'summary'])
-                        link_elem = article.find('a', href=True)
-                        
-                        if title_elem:
-                            results.append({
-                                "titulo": title_elem.get_text(strip=True),
-                                "data": date_elem.get_text(strip=True) if date_elem else "N/A",
-                                "resumo": summary_elem.get_text(strip=True)[:300] + "..." if summary_elem else "",
-                                "url": link_elem.get('href') if link_elem else "N/A",
-                                "fonte": "DOU",
-                                "relevancia": self._calculate_relevance(title_elem.get_text(), query),
-                                "tipo": "Publicação Oficial"
-                            })
+            page = await self._fetch("dou", search_url, params)
+            if page is not None:
+                html, encoding = page
+                # Parsing is CPU-bound; keep it off the event loop
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None, self._parse_dou_results, html, query, encoding
+                )
                             
         except Exception as e:
             self.logger.error(f"Erro ao pesquisar DOU: {e}")
             
         return results
         
+    def _parse_dou_results(self, html: bytes, query: str, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse DOU search results."""
+        root = _parse_html(html, encoding)
+        results = []
+        if root is None:
+            return results
+            
+        # Parse DOU results
+        articles = _DOU_RESULTS_XPATH(root)
+        
+        for article in articles[:10]:  # Limit results
+            title_elem = _first(_DOU_TITLE_XPATH, article)
+            date_elem = _first(_DOU_DATE_XPATH, article)
+            summary_elem = _first(_DOU_SUMMARY_XPATH, article)
+            link_elem = _first(_LINK_XPATH, article)
+            
+            if title_elem is not None:
+                title_raw, title = _element_texts(title_elem)
+                results.append({
+                    "titulo": title,
+                    "data": _element_texts(date_elem)[1] if date_elem is not None else "N/A",
+                    "resumo": _element_texts(summary_elem)[1][:300] + "..." if summary_elem is not None else "",
+                    "url": link_elem.get('href') if link_elem is not None else "N/A",
+                    "fonte": "DOU",
+                    "relevancia": self._calculate_relevance(title_raw, query),
+                    "tipo": "Publicação Oficial"
+                })
+                
+        return results
+        
     async def _search_gov_br(self, query: str) -> List[Dict]:
         """Search gov.br portal."""
-        session = await self._get_session()
         results = []
         
         try:
@@ -154,39 +412,52 @@ class RealWebResearchTool(BaseTool):
                 "sort_order": "reverse"
             }
             
-            async with session.get(search_url, params=params) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Parse gov.br results
-                    items = soup.find_all(['article', 'div'], class_=['item', 'resultado'])
-                    
-                    for item in items[:8]:  # Limit results
-                        title_elem = item.find(['h2', 'h3', 'a'])
-                        date_elem = item.find(['time', 'span'], class_=['date', 'data'])
-                        summary_elem = item.find(['p', 'div'], class_=['description', 'resumo'])
-                        link_elem = item.find('a', href=True)
-                        
-                        if title_elem:
-                            results.append({
-                                "titulo": title_elem.get_text(strip=True),
-                                "data": date_elem.get_text(strip=True) if date_elem else "N/A",
-                                "resumo": summary_elem.get_text(strip=True)[:300] + "..." if summary_elem else "",
-                                "url": self._normalize_url(link_elem.get('href'), "https://www.gov.br") if link_elem else "N/A",
-                                "fonte": "Portal do Governo",
-                                "relevancia": self._calculate_relevance(title_elem.get_text(), query),
-                                "tipo": "Informação Governamental"
-                            })
+            page = await self._fetch("gov_br", search_url, params)
+            if page is not None:
+                html, encoding = page
+                # Parsing is CPU-bound; keep it off the event loop
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None, self._parse_gov_br_results, html, query, encoding
+                )
                             
         except Exception as e:
             self.logger.error(f"Erro ao pesquisar gov.br: {e}")
             
         return results
         
+    def _parse_gov_br_results(self, html: bytes, query: str, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse gov.br search results."""
+        root = _parse_html(html, encoding)
+        results = []
+        if root is None:
+            return results
+            
+        # Parse gov.br results
+        items = _GOV_BR_RESULTS_XPATH(root)
+        
+        for item in items[:8]:  # Limit results
+            title_elem = _first(_GOV_BR_TITLE_XPATH, item)
+            date_elem = _first(_GOV_BR_DATE_XPATH, item)
+            summary_elem = _first(_GOV_BR_SUMMARY_XPATH, item)
+            link_elem = _first(_LINK_XPATH, item)
+            
+            if title_elem is not None:
+                title_raw, title = _element_texts(title_elem)
+                results.append({
+                    "titulo": title,
+                    "data": _element_texts(date_elem)[1] if date_elem is not None else "N/A",
+                    "resumo": _element_texts(summary_elem)[1][:300] + "..." if summary_elem is not None else "",
+                    "url": self._normalize_url(link_elem.get('href'), "https://www.gov.br") if link_elem is not None else "N/A",
+                    "fonte": "Portal do Governo",
+                    "relevancia": self._calculate_relevance(title_raw, query),
+                    "tipo": "Informação Governamental"
+                })
+                
+        return results
+        
     async def _search_jusbrasil(self, query: str) -> List[Dict]:
         """Search JusBrasil for legal content."""
-        session = await self._get_session()
         results = []
         
         try:
@@ -196,39 +467,52 @@ class RealWebResearchTool(BaseTool):
                 "o": "r"  # relevance order
             }
             
-            async with session.get(search_url, params=params) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Parse JusBrasil results
-                    items = soup.find_all('div', class_=['SearchResult', 'resultado'])
-                    
-                    for item in items[:6]:  # Limit results
-                        title_elem = item.find(['h3', 'h2', 'a'])
-                        summary_elem = item.find(['p', 'div'], class_=['excerpt', 'resumo'])
-                        link_elem = item.find('a', href=True)
-                        source_elem = item.find(['span', 'div'], class_=['source', 'origem'])
-                        
-                        if title_elem:
-                            results.append({
-                                "titulo": title_elem.get_text(strip=True),
-                                "data": "N/A",
-                                "resumo": summary_elem.get_text(strip=True)[:300] + "..." if summary_elem else "",
-                                "url": link_elem.get('href') if link_elem else "N/A",
-                                "fonte": f"JusBrasil - {source_elem.get_text(strip=True) if source_elem else 'Legal'}",
-                                "relevancia": self._calculate_relevance(title_elem.get_text(), query),
-                                "tipo": "Conteúdo Jurídico"
-                            })
+            page = await self._fetch("jusbrasil", search_url, params)
+            if page is not None:
+                html, encoding = page
+                # Parsing is CPU-bound; keep it off the event loop
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None, self._parse_jusbrasil_results, html, query, encoding
+                )
                             
         except Exception as e:
             self.logger.error(f"Erro ao pesquisar JusBrasil: {e}")
             
         return results
         
+    def _parse_jusbrasil_results(self, html: bytes, query: str, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse JusBrasil search results."""
+        root = _parse_html(html, encoding)
+        results = []
+        if root is None:
+            return results
+            
+        # Parse JusBrasil results
+        items = _JUSBRASIL_RESULTS_XPATH(root)
+        
+        for item in items[:6]:  # Limit results
+            title_elem = _first(_JUSBRASIL_TITLE_XPATH, item)
+            summary_elem = _first(_JUSBRASIL_SUMMARY_XPATH, item)
+            link_elem = _first(_LINK_XPATH, item)
+            source_elem = _first(_JUSBRASIL_SOURCE_XPATH, item)
+            
+            if title_elem is not None:
+                title_raw, title = _element_texts(title_elem)
+                results.append({
+                    "titulo": title,
+                    "data": "N/A",
+                    "resumo": _element_texts(summary_elem)[1][:300] + "..." if summary_elem is not None else "",
+                    "url": link_elem.get('href') if link_elem is not None else "N/A",
+                    "fonte": f"JusBrasil - {_element_texts(source_elem)[1] if source_elem is not None else 'Legal'}",
+                    "relevancia": self._calculate_relevance(title_raw, query),
+                    "tipo": "Conteúdo Jurídico"
+                })
+                
+        return results
+        
     async def _search_scholar(self, query: str) -> List[Dict]:
         """Search Google Scholar for academic content."""
-        session = await self._get_session()
         results = []
         
         try:
@@ -240,39 +524,83 @@ class RealWebResearchTool(BaseTool):
                 "as_ylo": "2020"  # From 2020 onwards
             }
             
-            async with session.get(search_url, params=params) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Parse Scholar results
-                    items = soup.find_all('div', class_=['gs_r', 'gs_ri'])
-                    
-                    for item in items[:5]:  # Limit results
-                        title_elem = item.find('h3', class_='gs_rt')
-                        if title_elem:
-                            # Clean title (remove citations count)
-                            title_link = title_elem.find('a')
-                            title = title_link.get_text(strip=True) if title_link else title_elem.get_text(strip=True)
-                            
-                            snippet_elem = item.find('div', class_='gs_rs')
-                            authors_elem = item.find('div', class_='gs_a')
-                            
-                            results.append({
-                                "titulo": title,
-                                "data": "N/A",
-                                "resumo": snippet_elem.get_text(strip=True)[:300] + "..." if snippet_elem else "",
-                                "url": title_link.get('href') if title_link and title_link.get('href') else "N/A",
-                                "fonte": f"Google Scholar - {authors_elem.get_text(strip=True)[:50] if authors_elem else 'Academic'}",
-                                "relevancia": self._calculate_relevance(title, query),
-                                "tipo": "Artigo Acadêmico"
-                            })
+            page = await self._fetch("google_scholar", search_url, params)
+            if page is not None:
+                html, encoding = page
+                # Parsing is CPU-bound; keep it off the event loop
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None, self._parse_scholar_results, html, query, encoding
+                )
                             
         except Exception as e:
             self.logger.error(f"Erro ao pesquisar Scholar: {e}")
             
         return results
         
+    def _parse_scholar_results(self, html: bytes, query: str, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse Google Scholar search results."""
+        root = _parse_html(html, encoding)
+        results = []
+        if root is None:
+            return results
+            
+        # Parse Scholar results
+        items = _SCHOLAR_RESULTS_XPATH(root)
+        
+        for item in items[:5]:  # Limit results
+            title_elem = _first(_SCHOLAR_TITLE_XPATH, item)
+            if title_elem is not None:
+                # Clean title (remove citations count)
+                title_link = _first(_SCHOLAR_TITLE_LINK_XPATH, title_elem)
+                title = _element_texts(title_link if title_link is not None else title_elem)[1]
+                
+                snippet_elem = _first(_SCHOLAR_SNIPPET_XPATH, item)
+                authors_elem = _first(_SCHOLAR_AUTHORS_XPATH, item)
+                
+                results.append({
+                    "titulo": title,
+                    "data": "N/A",
+                    "resumo": _element_texts(snippet_elem)[1][:300] + "..." if snippet_elem is not None else "",
+                    "url": title_link.get('href') if title_link is not None and title_link.get('href') else "N/A",
+                    "fonte": f"Google Scholar - {_element_texts(authors_elem)[1][:50] if authors_elem is not None else 'Academic'}",
+                    "relevancia": self._calculate_relevance(title, query),
+                    "tipo": "Artigo Acadêmico"
+                })
+                
+        return results
+        
+    async def _dispatch(self, source: str, query: str, days_back: int, use_cache: bool = True) -> List[Dict]:
+        """Run the search for a single source, reusing results fetched in the last hour."""
+        # Only the DOU search is restricted by date
+        key = (source, query, days_back if source == "dou" else None)
+        cached = self._search_cache.get(key) if use_cache else None
+        if cached and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL:
+            return list(cached[1])
+            
+        results = await self._search_source(source, query, days_back)
+        
+        # Empty results usually mean a failed request; don't pin them
+        if results:
+            self._search_cache.pop(key, None)
+            if len(self._search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = (time.monotonic(), list(results))
+        return results
+        
+    async def _search_source(self, source: str, query: str, days_back: int) -> List[Dict]:
+        """Run the search for a single source; unknown sources yield no results."""
+        if source == "dou":
+            return await self._search_dou(query, days_back)
+        elif source == "gov_br":
+            return await self._search_gov_br(query)
+        elif source == "jusbrasil":
+            return await self._search_jusbrasil(query)
+        elif source == "google_scholar":
+            return await self._search_scholar(query)
+        return []
+        
     def _normalize_url(self, url: str, base_url: str) -> str:
         """Normalize URL to absolute format."""
         if not url:
@@ -290,70 +618,79 @@ class RealWebResearchTool(BaseTool):
             return 0.0
             
         text_lower = text.lower()
-        query_words = query.lower().split()
+        query_lower, query_words, automaton = _query_profile(query)
+        
+        # Keywords present in the text: one automaton pass when available
+        if automaton is not None:
+            found = {keyword for _, keyword in automaton.iter(text_lower)}
+        else:
+            found = set(_REGULATORY_TERMS_RE.findall(text_lower))
+            found.update(word for word in query_words if word in text_lower)
         
         score = 0.0
         
         # Exact phrase match
-        if query.lower() in text_lower:
+        if query_lower in text_lower:
             score += 2.0
             
         # Individual word matches
         for word in query_words:
-            if word in text_lower:
+            if word in found:
                 score += 0.5
                 
         # Regulatory keywords boost
-        regulatory_terms = [
-            'anvisa', 'anatel', 'inmetro', 'ibama', 'cvm', 'bacen',
-            'regulamentação', 'compliance', 'lgpd', 'lei', 'decreto',
-            'portaria', 'resolução', 'instrução normativa'
-        ]
-        
-        for term in regulatory_terms:
-            if term in text_lower:
-                score += 0.3
+        for _ in _REGULATORY_TERM_SET.intersection(found):
+            score += 0.3
                 
         return min(score, 3.0)  # Cap at 3.0
         
-    async def _execute(self, query: str, sources: str = "todas", days_back: int = 30, detailed: bool = True) -> str:
-        """Execute comprehensive web research."""
+    async def _execute(
+        self,
+        query: str,
+        sources: str = "todas",
+        days_back: int = 30,
+        detailed: bool = True,
+        cache_bypass: bool = False,
+    ) -> str:
+        """Execute comprehensive web research (``cache_bypass`` forces fresh searches)."""
         try:
             source_list = [s.strip() for s in sources.split(",")] if sources != "todas" else list(self.sources.keys())
             
             all_results = []
             
-            # Search each source
-            for source in source_list:
-                if source == "dou":
-                    dou_results = await self._search_dou(query, days_back)
-                    all_results.extend(dou_results)
-                elif source == "gov_br":
-                    gov_results = await self._search_gov_br(query)
-                    all_results.extend(gov_results)
-                elif source == "jusbrasil":
-                    jus_results = await self._search_jusbrasil(query)
-                    all_results.extend(jus_results)
-                elif source == "google_scholar":
-                    scholar_results = await self._search_scholar(query)
-                    all_results.extend(scholar_results)
-                    
-                # Add delay to respect rate limits
-                await asyncio.sleep(1)
+            # Search all sources concurrently; per-source pools bound the load on each host
+            source_results = await asyncio.gather(
+                *(self._dispatch(source, query, days_back, use_cache=not cache_bypass) for source in source_list),
+                return_exceptions=True
+            )
+            for source, results in zip(source_list, source_results):
+                if isinstance(results, Exception):
+                    self.logger.error(f"Erro ao pesquisar {source}: {results}")
+                    continue
+                all_results.extend(results)
                 
-            # Sort by relevance
-            all_results.sort(key=lambda x: x.get('relevancia', 0), reverse=True)
+            # The same page may be reported by several sources; keep its best-ranked entry
+            unique_results: Dict[Any, Dict] = {}
+            for item in all_results:
+                key = _result_url_key(item['url']) or id(item)
+                kept = unique_results.get(key)
+                if kept is None or item['relevancia'] > kept['relevancia']:
+                    unique_results[key] = item
+            all_results = list(unique_results.values())
+            
+            # Sort by relevance (every scraper sets it)
+            all_results.sort(key=itemgetter('relevancia'), reverse=True)
             
             if not all_results:
                 return f"Nenhum resultado encontrado para '{query}' nas fontes selecionadas"
                 
             # Format results
-            result = f"# Pesquisa Web - {query}\n\n"
-            result += f"**Termo pesquisado:** {query}\n"
-            result += f"**Fontes consultadas:** {sources}\n"
-            result += f"**Período:** Últimos {days_back} dias (quando aplicável)\n"
-            result += f"**Total de resultados:** {len(all_results)}\n"
-            result += f"**Data da pesquisa:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
+            parts: List[str] = [f"# Pesquisa Web - {query}\n\n"]
+            parts.append(f"**Termo pesquisado:** {query}\n")
+            parts.append(f"**Fontes consultadas:** {sources}\n")
+            parts.append(f"**Período:** Últimos {days_back} dias (quando aplicável)\n")
+            parts.append(f"**Total de resultados:** {len(all_results)}\n")
+            parts.append(f"**Data da pesquisa:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n")
             
             # Group by source
             if detailed:
@@ -361,34 +698,34 @@ class RealWebResearchTool(BaseTool):
                 for source in sources_found:
                     source_results = [r for r in all_results if r['fonte'] == source]
                     if source_results:
-                        result += f"## {source} ({len(source_results)} resultados)\n\n"
+                        parts.append(f"## {source} ({len(source_results)} resultados)\n\n")
                         
                         for i, item in enumerate(source_results[:5], 1):  # Top 5 per source
-                            result += f"### {i}. {item['titulo']}\n"
-                            result += f"**Tipo:** {item['tipo']}\n"
-                            result += f"**Data:** {item['data']}\n"
-                            result += f"**Relevância:** {item['relevancia']:.1f}/3.0\n\n"
+                            parts.append(f"### {i}. {item['titulo']}\n")
+                            parts.append(f"**Tipo:** {item['tipo']}\n")
+                            parts.append(f"**Data:** {item['data']}\n")
+                            parts.append(f"**Relevância:** {item['relevancia']:.1f}/3.0\n\n")
                             if item['resumo']:
-                                result += f"{item['resumo']}\n\n"
+                                parts.append(f"{item['resumo']}\n\n")
                             if item['url'] != "N/A":
-                                result += f"**Link:** {item['url']}\n"
-                            result += "\n"
+                                parts.append(f"**Link:** {item['url']}\n")
+                            parts.append("\n")
             else:
                 # Simple list format
                 for i, item in enumerate(all_results[:20], 1):  # Top 20 overall
-                    result += f"## {i}. {item['titulo']}\n"
-                    result += f"**Fonte:** {item['fonte']} | **Relevância:** {item['relevancia']:.1f}/3.0\n"
+                    parts.append(f"## {i}. {item['titulo']}\n")
+                    parts.append(f"**Fonte:** {item['fonte']} | **Relevância:** {item['relevancia']:.1f}/3.0\n")
                     if item['resumo']:
-                        result += f"{item['resumo'][:200]}...\n"
+                        parts.append(f"{item['resumo'][:200]}...\n")
                     if item['url'] != "N/A":
-                        result += f"[Link]({item['url']})\n"
-                    result += "\n"
+                        parts.append(f"[Link]({item['url']})\n")
+                    parts.append("\n")
                     
-            result += "---\n\n"
-            result += "**Nota:** Esta pesquisa foi realizada automaticamente. "
-            result += "Recomenda-se sempre verificar as fontes originais e validar as informações encontradas."
+            parts.append("---\n\n")
+            parts.append("**Nota:** Esta pesquisa foi realizada automaticamente. ")
+            parts.append("Recomenda-se sempre verificar as fontes originais e validar as informações encontradas.")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Erro na pesquisa web: {e}")
@@ -398,6 +735,214 @@ class RealWebResearchTool(BaseTool):
         """Clean up resources."""
         if self.session:
             await self.session.close()
+            self.session = None
+            
+    async def __aenter__(self) -> "RealWebResearchTool":
+        return self
+        
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.cleanup()
+
+
+# Static report trailers
+_COMPETITIVE_REPORT_FOOTER = (
+    "---\n\n"
+    "**Metodologia:** Análise baseada em dados públicos, tendências de mercado e conhecimento regulatório.\n"
+    "**Recomendação:** Validar informações com fontes primárias e especialistas do setor.\n"
+)
+_TREND_REPORT_FOOTER = (
+    "\n---\n\n"
+    "**Metodologia:** Análise baseada em dados de publicações regulatórias, "
+    "tendências de mercado e inteligência setorial.\n"
+    "**Atualização:** Recomenda-se nova análise em 3 meses.\n"
+    "**Fonte:** Sistema de Inteligência Regulatória Grupo Soluto"
+)
+
+
+def _bullet_section(title: str, items: Iterable[str]) -> str:
+    """Render a Markdown section listing ``items``; empty when there are none."""
+    bullets = "\n".join(f"- {item}" for item in items)
+    return f"## {title}\n\n{bullets}\n\n" if bullets else ""
+
+
+# Sector profiles for competitive intelligence, selected by keywords in the
+# sector name (first match wins)
+_SECTOR_PROFILE_KEYWORDS = (
+    ("farmaceutico", ("farmaceutico", "medicamento")),
+    ("telecom", ("telecomunicacao", "telecom")),
+    ("tecnologia", ("tecnologia", "dados")),
+)
+
+_SECTOR_PROFILES: Dict[str, Dict[str, Any]] = {
+    "farmaceutico": {
+        "market_overview": {
+            "regulatory_agency": "ANVISA",
+            "market_size": "R$ 60+ bilhões (2024)",
+            "key_regulations": ["RDC 301/2019", "RDC 200/2017", "Lei 6.360/1976"],
+            "growth_rate": "8-12% ao ano",
+            "complexity_level": "Alto"
+        },
+        "key_players": [
+            {"name": "EMS", "type": "Nacional", "specialty": "Genéricos"},
+            {"name": "Eurofarma", "type": "Nacional", "specialty": "Genéricos/Similares"},
+            {"name": "Pfizer", "type": "Multinacional", "specialty": "Inovação"},
+            {"name": "Novartis", "type": "Multinacional", "specialty": "Especialidades"},
+            {"name": "Roche", "type": "Multinacional", "specialty": "Oncologia"}
+        ],
+        "regulatory_requirements": [
+            "Autorização de Funcionamento de Empresa (AFE)",
+            "Certificado de Boas Práticas de Fabricação (BPF)",
+            "Registro de produtos na ANVISA",
+            "Responsável Técnico habilitado",
+            "Sistema de farmacovigilância"
+        ]
+    },
+    "telecom": {
+        "market_overview": {
+            "regulatory_agency": "ANATEL",
+            "market_size": "R$ 200+ bilhões (2024)",
+            "key_regulations": ["Lei 9.472/1997", "Regulamento Geral de Interconexão"],
+            "growth_rate": "5-8% ao ano",
+            "complexity_level": "Alto"
+        },
+        "key_players": [
+            {"name": "Vivo", "type": "Nacional", "specialty": "Móvel/Fixo"},
+            {"name": "Claro", "type": "Multinacional", "specialty": "Móvel/Banda Larga"},
+            {"name": "TIM", "type": "Multinacional", "specialty": "Móvel"},
+            {"name": "Oi", "type": "Nacional", "specialty": "Fixo"},
+            {"name": "Algar", "type": "Nacional", "specialty": "Regional"}
+        ],
+        "regulatory_requirements": []
+    },
+    "tecnologia": {
+        "market_overview": {
+            "regulatory_agency": "ANPD",
+            "market_size": "R$ 50+ bilhões (2024)",
+            "key_regulations": ["LGPD", "Marco Civil da Internet", "Lei de Acesso à Informação"],
+            "growth_rate": "15-25% ao ano",
+            "complexity_level": "Médio-Alto"
+        },
+        "key_players": [],
+        "regulatory_requirements": [
+            "Adequação à LGPD",
+            "Designação de Encarregado de Dados (DPO)",
+            "Implementação de medidas de segurança",
+            "Política de Privacidade adequada",
+            "Procedimentos de resposta a titulares"
+        ]
+    }
+}
+
+_MARKET_OPPORTUNITIES = (
+    "Crescimento do mercado digital pós-pandemia",
+    "Necessidade de adequação regulatória das empresas",
+    "Demanda por consultoria especializada",
+    "Expansão para mercados regionais",
+    "Parcerias com órgãos reguladores"
+)
+
+_COMMON_VIOLATIONS = (
+    "Ausência de licenças atualizadas",
+    "Falta de responsável técnico",
+    "Descumprimento de prazos regulatórios",
+    "Inadequação de documentação"
+)
+
+_REGULATORY_TRENDS = (
+    "Digitalização de processos regulatórios",
+    "Maior rigor na fiscalização",
+    "Harmonização com padrões internacionais",
+    "Foco em sustentabilidade e ESG"
+)
+
+# Sector-specific additions to the lists above and compliance cost tables,
+# keyed by _market_segment (None covers every other sector)
+_SECTOR_MARKET_DETAILS: Dict[Optional[str], Dict[str, Any]] = {
+    "farmaceutico": {
+        "opportunities": (
+            "Mercado de medicamentos genéricos em expansão",
+            "Telemedicina e saúde digital",
+            "Cannabis medicinal regulamentada",
+            "Biotecnologia e medicamentos biológicos"
+        ),
+        "compliance_cost": {
+            "pequena_empresa": "R$ 50.000 - R$ 200.000/ano",
+            "media_empresa": "R$ 200.000 - R$ 1.000.000/ano",
+            "grande_empresa": "R$ 1.000.000 - R$ 5.000.000/ano",
+            "principais_custos": "BPF, registros, responsável técnico, farmacovigilância"
+        },
+        "violations": (
+            "Desvios de BPF",
+            "Problemas em farmacovigilância",
+            "Rotulagem inadequada",
+            "Fabricação sem registro"
+        ),
+        "trends": (
+            "Regulamentação de medicamentos digitais",
+            "Agilização de aprovações para inovação",
+            "Maior controle de preços",
+            "Expansão da telemedicina"
+        )
+    },
+    "tecnologia": {
+        "opportunities": (
+            "Conformidade LGPD para PMEs",
+            "Soluções de privacy by design",
+            "Certificações de segurança da informação",
+            "Consultoria em transformação digital"
+        ),
+        "compliance_cost": {
+            "pequena_empresa": "R$ 10.000 - R$ 50.000/ano",
+            "media_empresa": "R$ 50.000 - R$ 200.000/ano",
+            "grande_empresa": "R$ 200.000 - R$ 1.000.000/ano",
+            "principais_custos": "DPO, adequação técnica, treinamentos, auditorias"
+        },
+        "violations": (
+            "Tratamento inadequado de dados pessoais",
+            "Ausência de base legal",
+            "Falhas na segurança da informação",
+            "Política de privacidade desatualizada"
+        ),
+        "trends": (
+            "Regulamentação de IA e algoritmos",
+            "Maior proteção de dados de crianças",
+            "Certificações de privacidade",
+            "Cooperação internacional em proteção de dados"
+        )
+    },
+    None: {
+        "opportunities": (),
+        "compliance_cost": {
+            "pequena_empresa": "R$ 5.000 - R$ 30.000/ano",
+            "media_empresa": "R$ 30.000 - R$ 150.000/ano",
+            "grande_empresa": "R$ 150.000 - R$ 500.000/ano",
+            "principais_custos": "Licenças, certificações, consultorias"
+        },
+        "violations": (),
+        "trends": ()
+    }
+}
+
+
+def _sector_profile(sector_lower: str) -> Optional[str]:
+    """Pick the sector profile whose keywords appear in the sector name."""
+    for profile, keywords in _SECTOR_PROFILE_KEYWORDS:
+        if any(keyword in sector_lower for keyword in keywords):
+            return profile
+    return None
+
+
+def _market_segment(sector_lower: str) -> Optional[str]:
+    """Pick the market segment for opportunities, costs, violations and trends.
+    
+    Narrower than ``_sector_profile``: only the sector names themselves
+    select a segment, not related words such as "medicamento" or "dados".
+    """
+    if "farmaceutico" in sector_lower:
+        return "farmaceutico"
+    elif "tecnologia" in sector_lower:
+        return "tecnologia"
+    return None
 
 
 class CompetitiveIntelligenceTool(BaseTool):
@@ -409,6 +954,8 @@ class CompetitiveIntelligenceTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.data_sources = self._load_intelligence_sources()
+        # Sector analyses are fixed per (sector, location); build each once
+        self._sector_analysis = lru_cache(maxsize=64)(self._build_sector_analysis)
         
     def _load_intelligence_sources(self) -> Dict[str, Dict]:
         """Load competitive intelligence sources."""
@@ -441,267 +988,227 @@ class CompetitiveIntelligenceTool(BaseTool):
         }
         
     async def _analyze_regulatory_sector(self, sector: str, location: str = "brasil") -> Dict[str, Any]:
-        """Analyze regulatory sector landscape."""
-        analysis = {
-            "sector": sector,
-            "location": location,
-            "market_overview": {},
-            "key_players": [],
-            "regulatory_requirements": [],
-            "market_opportunities": [],
-            "compliance_landscape": {}
-        }
+        """Analyze regulatory sector landscape.
+        
+        The analysis is memoized and shared between calls; treat it as read-only.
+        """
+        return self._sector_analysis(sector, location)
+        
+    def _build_sector_analysis(self, sector: str, location: str) -> Dict[str, Any]:
+        """Assemble the sector analysis from the sector tables."""
+        sector_lower = sector.lower()
         
         # Sector-specific analysis
-        if "farmaceutico" in sector.lower() or "medicamento" in sector.lower():
-            analysis["market_overview"] = {
-                "regulatory_agency": "ANVISA",
-                "market_size": "R$ 60+ bilhões (2024)",
-                "key_regulations": ["RDC 301/2019", "RDC 200/2017", "Lei 6.360/1976"],
-                "growth_rate": "8-12% ao ano",
-                "complexity_level": "Alto"
-            }
-            
-            analysis["key_players"] = [
-                {"name": "EMS", "type": "Nacional", "specialty": "Genéricos"},
-                {"name": "Eurofarma", "type": "Nacional", "specialty": "Genéricos/Similares"},
-                {"name": "Pfizer", "type": "Multinacional", "specialty": "Inovação"},
-                {"name": "Novartis", "type": "Multinacional", "specialty": "Especialidades"},
-                {"name": "Roche", "type": "Multinacional", "specialty": "Oncologia"}
-            ]
-            
-            analysis["regulatory_requirements"] = [
-                "Autorização de Funcionamento de Empresa (AFE)",
-                "Certificado de Boas Práticas de Fabricação (BPF)",
-                "Registro de produtos na ANVISA",
-                "Responsável Técnico habilitado",
-                "Sistema de farmacovigilância"
-            ]
-            
-        elif "telecomunicacao" in sector.lower() or "telecom" in sector.lower():
-            analysis["market_overview"] = {
-                "regulatory_agency": "ANATEL",
-                "market_size": "R$ 200+ bilhões (2024)",
-                "key_regulations": ["Lei 9.472/1997", "Regulamento Geral de Interconexão"],
-                "growth_rate": "5-8% ao ano",
-                "complexity_level": "Alto"
-            }
-            
-            analysis["key_players"] = [
-                {"name": "Vivo", "type": "Nacional", "specialty": "Móvel/Fixo"},
-                {"name": "Claro", "type": "Multinacional", "specialty": "Móvel/Banda Larga"},
-                {"name": "TIM", "type": "Multinacional", "specialty": "Móvel"},
-                {"name": "Oi", "type": "Nacional", "specialty": "Fixo"},
-                {"name": "Algar", "type": "Nacional", "specialty": "Regional"}
-            ]
-            
-        elif "tecnologia" in sector.lower() or "dados" in sector.lower():
-            analysis["market_overview"] = {
-                "regulatory_agency": "ANPD",
-                "market_size": "R$ 50+ bilhões (2024)",
-                "key_regulations": ["LGPD", "Marco Civil da Internet", "Lei de Acesso à Informação"],
-                "growth_rate": "15-25% ao ano",
-                "complexity_level": "Médio-Alto"
+        profile = _SECTOR_PROFILES.get(_sector_profile(sector_lower), {})
+        segment = _market_segment(sector_lower)
+        
+        return {
+            "sector": sector,
+            "location": location,
+            "market_overview": {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in profile.get("market_overview", {}).items()
+            },
+            "key_players": [dict(player) for player in profile.get("key_players", [])],
+            "regulatory_requirements": list(profile.get("regulatory_requirements", [])),
+            # Market opportunities analysis
+            "market_opportunities": self._segment_opportunities(segment),
+            # Compliance landscape
+            "compliance_landscape": {
+                "average_compliance_cost": dict(_SECTOR_MARKET_DETAILS[segment]["compliance_cost"]),
+                "common_violations": self._segment_violations(segment),
+                "regulatory_trends": self._segment_trends(segment)
             }
-            
-            analysis["regulatory_requirements"] = [
-                "Adequação à LGPD",
-                "Designação de Encarregado de Dados (DPO)",
-                "Implementação de medidas de segurança",
-                "Política de Privacidade adequada",
-                "Procedimentos de resposta a titulares"
-            ]
-            
-        # Market opportunities analysis
-        analysis["market_opportunities"] = self._identify_market_opportunities(sector)
-        
-        # Compliance landscape
-        analysis["compliance_landscape"] = {
-            "average_compliance_cost": self._estimate_compliance_cost(sector),
-            "common_violations": self._get_common_violations(sector),
-            "regulatory_trends": self._get_regulatory_trends(sector)
         }
         
-        return analysis
-        
     def _identify_market_opportunities(self, sector: str) -> List[str]:
         """Identify market opportunities in the sector."""
-        opportunities = [
-            "Crescimento do mercado digital pós-pandemia",
-            "Necessidade de adequação regulatória das empresas",
-            "Demanda por consultoria especializada",
-            "Expansão para mercados regionais",
-            "Parcerias com órgãos reguladores"
-        ]
-        
-        if "farmaceutico" in sector.lower():
-            opportunities.extend([
-                "Mercado de medicamentos genéricos em expansão",
-                "Telemedicina e saúde digital",
-                "Cannabis medicinal regulamentada",
-                "Biotecnologia e medicamentos biológicos"
-            ])
-        elif "tecnologia" in sector.lower():
-            opportunities.extend([
-                "Conformidade LGPD para PMEs",
-                "Soluções de privacy by design",
-                "Certificações de segurança da informação",
-                "Consultoria em transformação digital"
-            ])
-            
-        return opportunities
+        return self._segment_opportunities(_market_segment(sector.lower()))
         
     def _estimate_compliance_cost(self, sector: str) -> Dict[str, str]:
         """Estimate compliance costs for the sector."""
-        if "farmaceutico" in sector.lower():
-            return {
-                "pequena_empresa": "R$ 50.000 - R$ 200.000/ano",
-                "media_empresa": "R$ 200.000 - R$ 1.000.000/ano",
-                "grande_empresa": "R$ 1.000.000 - R$ 5.000.000/ano",
-                "principais_custos": "BPF, registros, responsável técnico, farmacovigilância"
-            }
-        elif "tecnologia" in sector.lower():
-            return {
-                "pequena_empresa": "R$ 10.000 - R$ 50.000/ano",
-                "media_empresa": "R$ 50.000 - R$ 200.000/ano",
-                "grande_empresa": "R$ 200.000 - R$ 1.000.000/ano",
-                "principais_custos": "DPO, adequação técnica, treinamentos, auditorias"
-            }
-        else:
-            return {
-                "pequena_empresa": "R$ 5.000 - R$ 30.000/ano",
-                "media_empresa": "R$ 30.000 - R$ 150.000/ano",
-                "grande_empresa": "R$ 150.000 - R$ 500.000/ano",
-                "principais_custos": "Licenças, certificações, consultorias"
-            }
+        return dict(_SECTOR_MARKET_DETAILS[_market_segment(sector.lower())]["compliance_cost"])
             
     def _get_common_violations(self, sector: str) -> List[str]:
         """Get common regulatory violations in the sector."""
-        common = [
-            "Ausência de licenças atualizadas",
-            "Falta de responsável técnico",
-            "Descumprimento de prazos regulatórios",
-            "Inadequação de documentação"
-        ]
-        
-        if "farmaceutico" in sector.lower():
-            common.extend([
-                "Desvios de BPF",
-                "Problemas em farmacovigilância",
-                "Rotulagem inadequada",
-                "Fabricação sem registro"
-            ])
-        elif "tecnologia" in sector.lower():
-            common.extend([
-                "Tratamento inadequado de dados pessoais",
-                "Ausência de base legal",
-                "Falhas na segurança da informação",
-                "Política de privacidade desatualizada"
-            ])
-            
-        return common
+        return self._segment_violations(_market_segment(sector.lower()))
         
     def _get_regulatory_trends(self, sector: str) -> List[str]:
         """Get regulatory trends for the sector."""
-        trends = [
-            "Digitalização de processos regulatórios",
-            "Maior rigor na fiscalização",
-            "Harmonização com padrões internacionais",
-            "Foco em sustentabilidade e ESG"
-        ]
+        return self._segment_trends(_market_segment(sector.lower()))
+        
+    def _segment_opportunities(self, segment: Optional[str]) -> List[str]:
+        """General market opportunities plus the segment's own."""
+        return [*_MARKET_OPPORTUNITIES, *_SECTOR_MARKET_DETAILS[segment]["opportunities"]]
+        
+    def _segment_violations(self, segment: Optional[str]) -> List[str]:
+        """Common violations plus the segment's own."""
+        return [*_COMMON_VIOLATIONS, *_SECTOR_MARKET_DETAILS[segment]["violations"]]
         
-        if "farmaceutico" in sector.lower():
-            trends.extend([
-                "Regulamentação de medicamentos digitais",
-                "Agilização de aprovações para inovação",
-                "Maior controle de preços",
-                "Expansão da telemedicina"
-            ])
-        elif "tecnologia" in sector.lower():
-            trends.extend([
-                "Regulamentação de IA e algoritmos",
-                "Maior proteção de dados de crianças",
-                "Certificações de privacidade",
-                "Cooperação internacional em proteção de dados"
-            ])
-            
-        return trends
+    def _segment_trends(self, segment: Optional[str]) -> List[str]:
+        """General regulatory trends plus the segment's own."""
+        return [*_REGULATORY_TRENDS, *_SECTOR_MARKET_DETAILS[segment]["trends"]]
         
     async def _execute(self, sector: str, analysis_type: str = "completa", location: str = "brasil") -> str:
         """Execute competitive intelligence analysis."""
         try:
             analysis = await self._analyze_regulatory_sector(sector, location)
+            # One clock read dates both the analysis and its next update
+            now = datetime.now()
             
             # Format analysis results
-            result = f"# Inteligência Competitiva - {sector.title()}\n\n"
-            result += f"**Setor:** {analysis['sector']}\n"
-            result += f"**Localização:** {analysis['location']}\n"
-            result += f"**Tipo de Análise:** {analysis_type}\n"
-            result += f"**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
+            parts: List[str] = [f"# Inteligência Competitiva - {sector.title()}\n\n"]
+            parts.append(f"**Setor:** {analysis['sector']}\n")
+            parts.append(f"**Localização:** {analysis['location']}\n")
+            parts.append(f"**Tipo de Análise:** {analysis_type}\n")
+            parts.append(f"**Data da Análise:** {now.strftime('%d/%m/%Y %H:%M')}\n\n")
             
             # Market Overview
-            if analysis["market_overview"]:
-                result += "## Visão Geral do Mercado\n\n"
-                for key, value in analysis["market_overview"].items():
-                    result += f"- **{key.replace('_', ' ').title()}:** {value}\n"
-                result += "\n"
-                
+            parts.append(_bullet_section("Visão Geral do Mercado", (
+                f"**{key.replace('_', ' ').title()}:** {value}"
+                for key, value in analysis["market_overview"].items()
+            )))
+            
             # Key Players
-            if analysis["key_players"]:
-                result += "## Principais Players\n\n"
-                for player in analysis["key_players"]:
-                    result += f"- **{player['name']}** ({player['type']}) - {player['specialty']}\n"
-                result += "\n"
-                
+            parts.append(_bullet_section("Principais Players", (
+                f"**{player['name']}** ({player['type']}) - {player['specialty']}"
+                for player in analysis["key_players"]
+            )))
+            
             # Regulatory Requirements
-            if analysis["regulatory_requirements"]:
-                result += "## Requisitos Regulatórios\n\n"
-                for req in analysis["regulatory_requirements"]:
-                    result += f"- {req}\n"
-                result += "\n"
-                
+            parts.append(_bullet_section("Requisitos Regulatórios", analysis["regulatory_requirements"]))
+            
             # Market Opportunities
-            if analysis["market_opportunities"]:
-                result += "## Oportunidades de Mercado\n\n"
-                for opp in analysis["market_opportunities"]:
-                    result += f"- {opp}\n"
-                result += "\n"
-                
+            parts.append(_bullet_section("Oportunidades de Mercado", analysis["market_opportunities"]))
+            
             # Compliance Landscape
             if analysis["compliance_landscape"]:
                 landscape = analysis["compliance_landscape"]
                 
                 if "average_compliance_cost" in landscape:
-                    result += "## Custos de Compliance\n\n"
-                    costs = landscape["average_compliance_cost"]
-                    for size, cost in costs.items():
-                        result += f"- **{size.replace('_', ' ').title()}:** {cost}\n"
-                    result += "\n"
+                    parts.append(_bullet_section("Custos de Compliance", (
+                        f"**{size.replace('_', ' ').title()}:** {cost}"
+                        for size, cost in landscape["average_compliance_cost"].items()
+                    )))
                     
                 if "common_violations" in landscape:
-                    result += "## Violações Mais Comuns\n\n"
-                    for violation in landscape["common_violations"]:
-                        result += f"- {violation}\n"
-                    result += "\n"
+                    parts.append(_bullet_section("Violações Mais Comuns", landscape["common_violations"]))
                     
                 if "regulatory_trends" in landscape:
-                    result += "## Tendências Regulatórias\n\n"
-                    for trend in landscape["regulatory_trends"]:
-                        result += f"- {trend}\n"
-                    result += "\n"
+                    parts.append(_bullet_section("Tendências Regulatórias", landscape["regulatory_trends"]))
                     
-            result += "---\n\n"
-            result += "**Metodologia:** Análise baseada em dados públicos, tendências de mercado e conhecimento regulatório.\n"
-            result += "**Recomendação:** Validar informações com fontes primárias e especialistas do setor.\n"
-            result += f"**Próxima Atualização:** {(datetime.now() + timedelta(days=90)).strftime('%d/%m/%Y')}"
+            parts.append(_COMPETITIVE_REPORT_FOOTER)
+            parts.append(f"**Próxima Atualização:** {(now + timedelta(days=90)).strftime('%d/%m/%Y')}")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Erro na análise de inteligência competitiva: {e}")
             return f"Erro na análise: {str(e)}"
 
 
+# Sector-specific regulatory trends, selected by the first key found in the
+# sector name
+_TREND_SECTOR_PROFILES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "farmaceutico": {
+        "emerging_regulations": (
+            "Regulamentação de Cannabis Medicinal (RDC 327/2019)",
+            "Medicamentos Digitais e Software como Dispositivo Médico",
+            "Rastreabilidade de Medicamentos (SNGPC)",
+            "Telemedicina e Prescrição Eletrônica",
+            "Medicamentos Biológicos e Biossimilares"
+        ),
+        "compliance_focus_areas": (
+            "Boas Práticas de Fabricação (BPF) - Indústria 4.0",
+            "Farmacovigilância Digital",
+            "Qualificação de Fornecedores Internacionais",
+            "Gestão de Riscos da Qualidade (ICH Q9)",
+            "Sustentabilidade e Green Chemistry"
+        ),
+        "enforcement_trends": (
+            "Aumento de inspeções não anunciadas",
+            "Multas mais rigorosas por desvios de BPF",
+            "Foco em medicamentos de alto risco",
+            "Cooperação internacional na fiscalização",
+            "Uso de tecnologia (drones, IA) na fiscalização"
+        )
+    },
+    "tecnologia": {
+        "emerging_regulations": (
+            "Regulamentação de Inteligência Artificial",
+            "Marco Legal das Startups",
+            "Lei do Governo Digital",
+            "Regulamentação de Criptomoedas (Projeto de Lei)",
+            "Open Banking e Open Finance"
+        ),
+        "compliance_focus_areas": (
+            "Privacy by Design e by Default",
+            "Transferências Internacionais de Dados",
+            "Segurança Cibernética (Lei 14.133/2021)",
+            "Proteção de Dados de Menores",
+            "Auditoria e Certificação de IA"
+        ),
+        "enforcement_trends": ()
+    },
+    "telecomunicacao": {
+        "emerging_regulations": (
+            "5G e Infraestrutura Crítica",
+            "Internet das Coisas (IoT)",
+            "Neutralidade da Rede",
+            "Compartilhamento de Infraestrutura",
+            "Satélites de Baixa Órbita"
+        ),
+        "compliance_focus_areas": (),
+        "enforcement_trends": ()
+    }
+}
+
+_NO_SECTOR_TRENDS: Dict[str, Tuple[str, ...]] = {
+    "emerging_regulations": (),
+    "compliance_focus_areas": (),
+    "enforcement_trends": ()
+}
+
+_INNOVATION_DRIVERS = (
+    "Digitalização de processos regulatórios",
+    "Análise de dados para tomada de decisões",
+    "Inteligência artificial na fiscalização",
+    "Blockchain para rastreabilidade",
+    "APIs para integração com órgãos reguladores"
+)
+
+_TREND_RISK_FACTORS = (
+    "Mudanças políticas e regulatórias",
+    "Aumento da complexidade compliance",
+    "Escassez de profissionais especializados",
+    "Custos crescentes de adequação",
+    "Pressão por sustentabilidade"
+)
+
+
+# Trend score reported until factors are scored from real data
+_PLACEHOLDER_TREND_SCORE = 0.7
+
+# Strategic recommendations for trend scores above each threshold, highest first
+_TREND_RECOMMENDATION_TIERS = (
+    (0.7, (
+        "- **Alta Atividade Regulatória:** Monitoramento intensivo recomendado\n"
+        "- Estabelecer grupo de trabalho dedicado ao tema\n"
+        "- Considerar investimento em soluções proativas\n"
+    )),
+    (0.4, (
+        "- **Atividade Moderada:** Acompanhamento regular recomendado\n"
+        "- Revisar políticas internas trimestralmente\n"
+        "- Manter canais de comunicação com reguladores\n"
+    ))
+)
+_LOW_ACTIVITY_RECOMMENDATIONS = (
+    "- **Baixa Atividade:** Monitoramento básico suficiente\n"
+    "- Revisão semestral das tendências\n"
+    "- Foco em compliance básico\n"
+)
+
+
 class TrendAnalysisTool(BaseTool):
     """Real trend analysis tool for regulatory and market intelligence."""
     
@@ -711,6 +1218,8 @@ class TrendAnalysisTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.trend_sources = self._load_trend_sources()
+        # Reports depend only on (topic, period, sector) apart from the analysis date
+        self._trend_report = lru_cache(maxsize=256)(self._render_trend_report)
         
     def _load_trend_sources(self) -> Dict[str, Dict]:
         """Load trend analysis sources."""
@@ -733,179 +1242,74 @@ class TrendAnalysisTool(BaseTool):
         }
         
     def _analyze_regulatory_trends(self, sector: str, period: str = "12m") -> Dict[str, Any]:
-        """Analyze regulatory trends for a specific sector."""
-        trends = {
-            "emerging_regulations": [],
-            "compliance_focus_areas": [],
-            "enforcement_trends": [],
-            "innovation_drivers": [],
-            "risk_factors": []
-        }
+        """Analyze regulatory trends for a specific sector.
         
-        # Sector-specific trend analysis
-        if "farmaceutico" in sector.lower():
-            trends["emerging_regulations"] = [
-                "Regulamentação de Cannabis Medicinal (RDC 327/2019)",
-                "Medicamentos Digitais e Software como Dispositivo Médico",
-                "Rastreabilidade de Medicamentos (SNGPC)",
-                "Telemedicina e Prescrição Eletrônica",
-                "Medicamentos Biológicos e Biossimilares"
-            ]
-            
-            trends["compliance_focus_areas"] = [
-                "Boas Práticas de Fabricação (BPF) - Indústria 4.0",
-                "Farmacovigilância Digital",
-                "Qualificação de Fornecedores Internacionais",
-                "Gestão de Riscos da Qualidade (ICH Q9)",
-                "Sustentabilidade e Green Chemistry"
-            ]
-            
-            trends["enforcement_trends"] = [
-                "Aumento de inspeções não anunciadas",
-                "Multas mais rigorosas por desvios de BPF",
-                "Foco em medicamentos de alto risco",
-                "Cooperação internacional na fiscalização",
-                "Uso de tecnologia (drones, IA) na fiscalização"
-            ]
-            
-        elif "tecnologia" in sector.lower():
-            trends["emerging_regulations"] = [
-                "Regulamentação de Inteligência Artificial",
-                "Marco Legal das Startups",
-                "Lei do Governo Digital",
-                "Regulamentação de Criptomoedas (Projeto de Lei)",
-                "Open Banking e Open Finance"
-            ]
-            
-            trends["compliance_focus_areas"] = [
-                "Privacy by Design e by Default",
-                "Transferências Internacionais de Dados",
-                "Segurança Cibernética (Lei 14.133/2021)",
-                "Proteção de Dados de Menores",
-                "Auditoria e Certificação de IA"
-            ]
-            
-        elif "telecomunicacao" in sector.lower():
-            trends["emerging_regulations"] = [
-                "5G e Infraestrutura Crítica",
-                "Internet das Coisas (IoT)",
-                "Neutralidade da Rede",
-                "Compartilhamento de Infraestrutura",
-                "Satélites de Baixa Órbita"
-            ]
-            
-        # Common innovation drivers
-        trends["innovation_drivers"] = [
-            "Digitalização de processos regulatórios",
-            "Análise de dados para tomada de decisões",
-            "Inteligência artificial na fiscalização",
-            "Blockchain para rastreabilidade",
-            "APIs para integração com órgãos reguladores"
-        ]
+        The trend lists are shared module constants (tuples).
+        """
+        sector_lower = sector.lower()
         
-        # Common risk factors
-        trends["risk_factors"] = [
-            "Mudanças políticas e regulatórias",
-            "Aumento da complexidade compliance",
-            "Escassez de profissionais especializados",
-            "Custos crescentes de adequação",
-            "Pressão por sustentabilidade"
-        ]
+        # Sector-specific trend analysis; sector names like "setor farmaceutico
+        # nacional" fall back to a keyword scan
+        profile = _TREND_SECTOR_PROFILES.get(sector_lower) or next(
+            (profile for key, profile in _TREND_SECTOR_PROFILES.items() if key in sector_lower),
+            _NO_SECTOR_TRENDS
+        )
         
-        return trends
+        return {
+            **profile,
+            # Common innovation drivers and risk factors
+            "innovation_drivers": _INNOVATION_DRIVERS,
+            "risk_factors": _TREND_RISK_FACTORS
+        }
         
     def _calculate_trend_score(self, trend_data: Dict[str, Any]) -> float:
-        """Calculate overall trend score based on multiple factors."""
-        score = 0.0
-        
-        # Weight factors
-        weights = {
-            "regulatory_activity": 0.4,
-            "market_interest": 0.3,
-            "enforcement_activity": 0.2,
-            "innovation_potential": 0.1
-        }
+        """Calculate overall trend score based on multiple factors.
         
-        # Simulate trend scoring (in production, use real data)
-        for factor, weight in weights.items():
-            # Simulate factor score (0-1)
-            factor_score = 0.7  # Placeholder
-            score += factor_score * weight
-            
-        return score
+        Regulatory activity (0.4), market interest (0.3), enforcement activity
+        (0.2) and innovation potential (0.1) all still score the 0.7
+        placeholder, so their weighted sum is the placeholder itself.
+        """
+        # Simulated trend scoring (in production, score each factor from real data)
+        return _PLACEHOLDER_TREND_SCORE
         
     async def _execute(self, topic: str, period: str = "12m", sector: str = "geral") -> str:
         """Execute trend analysis."""
         try:
-            trends = self._analyze_regulatory_trends(sector, period)
-            trend_score = self._calculate_trend_score(trends)
-            
-            # Format analysis results
-            result = f"# Análise de Tendências - {topic}\n\n"
-            result += f"**Tópico:** {topic}\n"
-            result += f"**Setor:** {sector}\n"
-            result += f"**Período:** {period}\n"
-            result += f"**Score de Tendência:** {trend_score:.2f}/1.00\n"
-            result += f"**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
-            
-            # Emerging Regulations
-            if trends["emerging_regulations"]:
-                result += "## Regulamentações Emergentes\n\n"
-                for reg in trends["emerging_regulations"]:
-                    result += f"- {reg}\n"
-                result += "\n"
-                
-            # Compliance Focus Areas
-            if trends["compliance_focus_areas"]:
-                result += "## Áreas de Foco em Compliance\n\n"
-                for area in trends["compliance_focus_areas"]:
-                    result += f"- {area}\n"
-                result += "\n"
-                
-            # Enforcement Trends
-            if trends["enforcement_trends"]:
-                result += "## Tendências de Fiscalização\n\n"
-                for trend in trends["enforcement_trends"]:
-                    result += f"- {trend}\n"
-                result += "\n"
-                
-            # Innovation Drivers
-            if trends["innovation_drivers"]:
-                result += "## Drivers de Inovação\n\n"
-                for driver in trends["innovation_drivers"]:
-                    result += f"- {driver}\n"
-                result += "\n"
-                
-            # Risk Factors
-            if trends["risk_factors"]:
-                result += "## Fatores de Risco\n\n"
-                for risk in trends["risk_factors"]:
-                    result += f"- {risk}\n"
-                result += "\n"
-                
-            # Recommendations
-            result += "## Recomendações Estratégicas\n\n"
-            if trend_score > 0.7:
-                result += "- **Alta Atividade Regulatória:** Monitoramento intensivo recomendado\n"
-                result += "- Estabelecer grupo de trabalho dedicado ao tema\n"
-                result += "- Considerar investimento em soluções proativas\n"
-            elif trend_score > 0.4:
-                result += "- **Atividade Moderada:** Acompanhamento regular recomendado\n"
-                result += "- Revisar políticas internas trimestralmente\n"
-                result += "- Manter canais de comunicação com reguladores\n"
-            else:
-                result += "- **Baixa Atividade:** Monitoramento básico suficiente\n"
-                result += "- Revisão semestral das tendências\n"
-                result += "- Foco em compliance básico\n"
-                
-            result += "\n---\n\n"
-            result += "**Metodologia:** Análise baseada em dados de publicações regulatórias, "
-            result += "tendências de mercado e inteligência setorial.\n"
-            result += "**Atualização:** Recomenda-se nova análise em 3 meses.\n"
-            result += "**Fonte:** Sistema de Inteligência Regulatória Grupo Soluto"
-            
-            return result
+            header, body = self._trend_report(topic, period, sector)
+            return f"{header}**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n{body}"
             
         except Exception as e:
             self.logger.error(f"Erro na análise de tendências: {e}")
-            return f"Erro na análise de tendências: {str(e)}"
\ No newline at end of file
+            return f"Erro na análise de tendências: {str(e)}"
+            
+    def _render_trend_report(self, topic: str, period: str, sector: str) -> Tuple[str, str]:
+        """Render the trend report as the text before and after its analysis date line."""
+        trends = self._analyze_regulatory_trends(sector, period)
+        trend_score = self._calculate_trend_score(trends)
+        
+        # Format analysis results
+        header = (
+            f"# Análise de Tendências - {topic}\n\n"
+            f"**Tópico:** {topic}\n"
+            f"**Setor:** {sector}\n"
+            f"**Período:** {period}\n"
+            f"**Score de Tendência:** {trend_score:.2f}/1.00\n"
+        )
+        
+        # Recommendations
+        recommendations = next(
+            (block for threshold, block in _TREND_RECOMMENDATION_TIERS if trend_score > threshold),
+            _LOW_ACTIVITY_RECOMMENDATIONS
+        )
+        
+        body = (
+            f"{_bullet_section('Regulamentações Emergentes', trends['emerging_regulations'])}"
+            f"{_bullet_section('Áreas de Foco em Compliance', trends['compliance_focus_areas'])}"
+            f"{_bullet_section('Tendências de Fiscalização', trends['enforcement_trends'])}"
+            f"{_bullet_section('Drivers de Inovação', trends['innovation_drivers'])}"
+            f"{_bullet_section('Fatores de Risco', trends['risk_factors'])}"
+            "## Recomendações Estratégicas\n\n"
+            f"{recommendations}"
+            f"{_TREND_REPORT_FOOTER}"
+        )
+        return header, body
\ No newline at end of file
@@ -2,11 +2,16 @@
 
 import asyncio
 import json
+import math
 import re
+import sys
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
@@ -16,7 +21,7 @@ from .base import BaseTool
 
 
 class RiskLevel(Enum):
-    """Risk level enumeration."""
+    """Risk level enumeration, from lowest to highest."""
     VERY_LOW = "very_low"
     LOW = "low"
     MEDIUM = "medium"
@@ -34,7 +39,7 @@ class RiskCategory(Enum):
     STRATEGIC = "strategic"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RiskFactor:
     """Risk factor data class."""
     name: str
@@ -46,6 +51,450 @@ class RiskFactor:
     mitigation_cost: float
     regulatory_basis: str
     last_updated: datetime
+    # Lowercased regulatory basis, interned, for the sector keyword checks
+    _basis_lower: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "_basis_lower", sys.intern(self.regulatory_basis.lower()))
+
+
+# Timestamp of the built-in risk database, taken once at import
+_DB_LOAD_TIME = datetime.now()
+
+def _iso_31000_score(probability, impact):
+    """Standard multiplication method."""
+    return probability * impact
+
+
+def _coso_erm_score(probability, impact):
+    """Weighted average with higher impact weight."""
+    return (probability * 0.4) + (impact * 0.6)
+
+
+def _anvisa_gestao_risco_score(probability, impact):
+    """Pharmaceutical-specific calculation."""
+    return probability * impact * 1.2  # Higher weighting for pharma risks
+
+
+# Risk score formula of each assessment framework; unknown frameworks use
+# ISO 31000. Each takes scalars or NumPy arrays (elementwise)
+_RISK_SCORERS: Dict[str, Callable[[Any, Any], Any]] = {
+    "iso_31000": _iso_31000_score,
+    "coso_erm": _coso_erm_score,
+    "anvisa_gestao_risco": _anvisa_gestao_risco_score
+}
+
+# Column position of each risk category, in declaration order
+_RISK_CATEGORY_CODES = {category: code for code, category in enumerate(RiskCategory)}
+
+# Base financial impact of each category (indexed by its code) and the
+# multiplier applied per company size
+_CATEGORY_BASE_IMPACTS = np.array([
+    1000000.0,  # REGULATORY
+    500000.0,  # COMPLIANCE
+    300000.0,  # OPERATIONAL
+    800000.0,  # FINANCIAL
+    1500000.0,  # REPUTATIONAL
+    2000000.0  # STRATEGIC
+])
+_COMPANY_SIZE_MULTIPLIERS = {
+    "small": 0.5,
+    "medium": 1.0,
+    "large": 2.0,
+    "multinational": 5.0
+}
+
+# Integer code of each risk level (its position in declaration order, so
+# codes grow with severity); the enum values stay strings for the reports
+_RISK_LEVELS_BY_CODE = tuple(RiskLevel)
+_RISK_LEVEL_CODES = {level: code for code, level in enumerate(_RISK_LEVELS_BY_CODE)}
+_RISK_LEVEL_LABELS = {level: level.value.replace('_', ' ').title() for level in RiskLevel}
+
+# Lower score bounds of LOW, MEDIUM, HIGH and CRITICAL; bisect_right (or
+# np.digitize for arrays) maps a score to its level code
+_RISK_LEVEL_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+
+# Sector databases combined for a general assessment (top two risks of each)
+_GENERAL_ASSESSMENT = "geral"
+
+# Keywords routing a sector to its risk database, in priority order
+_SECTOR_ROUTES = (
+    ("anvisa_farmaceutico", ("farmaceutico", "anvisa")),
+    ("anatel_telecomunicacoes", ("telecomunicacao", "anatel")),
+    ("lgpd_dados", ("tecnologia", "dados", "lgpd"))
+)
+
+# One anchored alternative per route, each a lookahead for any of its
+# keywords followed by an empty group named after the database. Alternatives
+# are tried in order, so an earlier route wins even if a later route's
+# keyword appears first in the text; lastgroup names the database.
+_SECTOR_ROUTE_RE = re.compile(
+    "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))(?P<{database}>)"
+        for database, keywords in _SECTOR_ROUTES
+    ),
+    re.DOTALL
+)
+
+
+# Report block for each analysed risk; strategy_section is the rendered
+# _RISK_STRATEGY_TEMPLATE, or empty when the risk has no strategy
+_RISK_DETAIL_TEMPLATE = (
+    "### {index}. {name}\n\n"
+    "**Descrição:** {description}\n\n"
+    "**Categoria:** {category}\n"
+    "**Base Regulatória:** {regulatory_basis}\n"
+    "**Probabilidade:** {probability:.1%}\n"
+    "**Impacto:** {impact:.1%}\n"
+    "**Score de Risco:** {risk_score:.2f}/1.00\n"
+    "**Nível de Risco:** {risk_level}\n\n"
+    "**Impacto Financeiro Estimado:**\n"
+    "- Custos Diretos: R$ {direct_costs:,.2f}\n"
+    "- Custos de Oportunidade: R$ {opportunity_costs:,.2f}\n"
+    "- Custos de Mitigação: R$ {mitigation_costs:,.2f}\n"
+    "- **Total Estimado: R$ {total_estimated_impact:,.2f}**\n\n"
+    "{strategy_section}"
+    "---\n\n"
+)
+_RISK_STRATEGY_TEMPLATE = (
+    "**Estratégia de Mitigação Recomendada:**\n"
+    "- **Estratégia:** {strategy}\n"
+    "- **Descrição:** {description}\n"
+    "- **Efetividade:** {effectiveness:.1%}\n"
+    "- **Custo:** R$ {cost:,.2f}\n"
+    "- **Prazo:** {timeline}\n"
+    "- **Risco Residual:** {residual_risk:.2f}/1.00 ({residual_level})\n\n"
+)
+
+
+# Strategic recommendations by number of high/critical risks
+_URGENT_RISK_RECOMMENDATIONS = (
+    "**URGENTE:** Implementar plano de emergência para riscos críticos",
+    "Priorizar investimentos em compliance preventivo",
+    "Estabelecer comitê de gestão de riscos regulatórios"
+)
+_FOCUSED_RISK_RECOMMENDATIONS = (
+    "Focar na mitigação dos riscos de maior impacto",
+    "Implementar monitoramento contínuo dos riscos identificados",
+    "Desenvolver planos de contingência específicos"
+)
+_ROUTINE_RISK_RECOMMENDATIONS = (
+    "Manter programa de monitoramento de riscos",
+    "Revisar avaliação semestralmente",
+    "Continuar investimentos em prevenção"
+)
+
+_RISK_OUTPUT_FORMATS = ("markdown", "json")
+
+# Outside the comprehensive scope, risks below this level only get their
+# recommended (best) mitigation strategy
+_SUMMARY_STRATEGY_MIN_LEVEL = RiskLevel.MEDIUM
+
+
+def _strategic_recommendations(high_critical_count: int) -> Tuple[str, ...]:
+    """Recommendations for a portfolio with this many high/critical risks."""
+    if high_critical_count > 3:
+        return _URGENT_RISK_RECOMMENDATIONS
+    elif high_critical_count > 0:
+        return _FOCUSED_RISK_RECOMMENDATIONS
+    return _ROUTINE_RISK_RECOMMENDATIONS
+
+
+class _StrategyTemplate(NamedTuple):
+    """Mitigation strategy; its cost is a fraction of the risk's mitigation cost."""
+    strategy: str
+    description: str
+    effectiveness: float
+    cost_fraction: float
+    timeline: str
+
+
+# Mitigation strategies offered for each risk category
+_STRATEGY_TEMPLATES = {
+    RiskCategory.REGULATORY: (
+        _StrategyTemplate(
+            "Monitoramento Regulatório Contínuo",
+            "Implementar sistema de acompanhamento de mudanças regulatórias",
+            0.8, 0.3, "3-6 meses"
+        ),
+        _StrategyTemplate(
+            "Relacionamento com Órgãos Reguladores",
+            "Estabelecer canais diretos de comunicação com reguladores",
+            0.6, 0.2, "1-3 meses"
+        )
+    ),
+    RiskCategory.COMPLIANCE: (
+        _StrategyTemplate(
+            "Programa de Compliance Robusto",
+            "Implementar programa estruturado de compliance regulatório",
+            0.85, 0.8, "6-12 meses"
+        ),
+        _StrategyTemplate(
+            "Auditoria Interna Regular",
+            "Estabelecer rotina de auditorias preventivas",
+            0.7, 0.4, "3-6 meses"
+        )
+    ),
+    RiskCategory.OPERATIONAL: (
+        _StrategyTemplate(
+            "Melhoria de Processos",
+            "Otimizar processos operacionais para reduzir riscos",
+            0.75, 0.6, "6-9 meses"
+        ),
+        _StrategyTemplate(
+            "Treinamento de Equipes",
+            "Capacitar equipes em procedimentos de risco",
+            0.65, 0.3, "2-4 meses"
+        )
+    )
+}
+
+# Sector-specific strategies, added when the keyword appears in the
+# risk's regulatory basis
+_SECTOR_STRATEGIES = (
+    ("anvisa", _StrategyTemplate(
+        "Sistema de Qualidade Farmacêutica",
+        "Implementar PQS conforme ICH Q10",
+        0.9, 1.2, "12-18 meses"
+    )),
+    ("lgpd", _StrategyTemplate(
+        "Privacy by Design",
+        "Incorporar proteção de dados desde o design",
+        0.85, 0.7, "6-12 meses"
+    ))
+)
+
+
+@lru_cache(maxsize=64)
+def _strategy_templates(category: RiskCategory, basis_lower: str) -> Tuple[_StrategyTemplate, ...]:
+    """Strategies for a risk, most effective first.
+    
+    The sort is stable, so among equally effective strategies the category
+    ones stay ahead of the sector-specific ones and the first entry is the
+    one max() picked over the unsorted list.
+    """
+    templates = _STRATEGY_TEMPLATES.get(category, ())
+    templates += tuple(template for keyword, template in _SECTOR_STRATEGIES if keyword in basis_lower)
+    return tuple(sorted(templates, key=lambda template: -template.effectiveness))
+
+
+class _RiskColumns(NamedTuple):
+    """A list of risk factors with their numeric fields laid out as arrays."""
+    risks: Tuple[RiskFactor, ...]
+    probability: np.ndarray
+    impact: np.ndarray
+    mitigation_cost: np.ndarray
+    category_code: np.ndarray
+
+
+class _RiskAssessment(NamedTuple):
+    """Per-risk analysis entries, highest score first.
+    
+    The arrays hold the numeric fields of the entries in the same order;
+    best_strategy_costs is 0 for risks without a mitigation strategy.
+    """
+    analysis: List[Dict[str, Any]]
+    level_codes: np.ndarray
+    risk_scores: np.ndarray
+    total_impacts: np.ndarray
+    best_strategy_costs: np.ndarray
+    
+    @property
+    def high_critical_count(self) -> int:
+        """Number of risks classified as high or critical."""
+        return int(np.count_nonzero(self.level_codes >= _RISK_LEVEL_CODES[RiskLevel.HIGH]))
+
+
+def _risk_columns(risks: Sequence[RiskFactor]) -> _RiskColumns:
+    """Lay out the numeric fields of ``risks`` as arrays."""
+    return _RiskColumns(
+        risks=tuple(risks),
+        probability=np.array([risk.probability for risk in risks], dtype=np.float64),
+        impact=np.array([risk.impact for risk in risks], dtype=np.float64),
+        mitigation_cost=np.array([risk.mitigation_cost for risk in risks], dtype=np.float64),
+        category_code=np.array([_RISK_CATEGORY_CODES[risk.category] for risk in risks], dtype=np.intp)
+    )
+
+
+# Comprehensive risk database (read-only, shared by all tools)
+_RISK_DATABASE: Mapping[str, Tuple[RiskFactor, ...]] = MappingProxyType({
+    "anvisa_farmaceutico": (
+        RiskFactor(
+            name="Desvios de Boas Práticas de Fabricação (BPF)",
+            description="Não conformidades com RDC 301/2019 durante inspeção",
+            category=RiskCategory.REGULATORY,
+            probability=0.25,
+            impact=0.85,
+            level=RiskLevel.HIGH,
+            mitigation_cost=500000.0,
+            regulatory_basis="RDC 301/2019",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Farmacovigilância Inadequada",
+            description="Falhas no sistema de monitoramento pós-comercialização",
+            category=RiskCategory.COMPLIANCE,
+            probability=0.30,
+            impact=0.70,
+            level=RiskLevel.HIGH,
+            mitigation_cost=300000.0,
+            regulatory_basis="RDC 4/2009",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Registro de Produto Vencido",
+            description="Comercialização com registro ANVISA vencido",
+            category=RiskCategory.REGULATORY,
+            probability=0.15,
+            impact=0.90,
+            level=RiskLevel.CRITICAL,
+            mitigation_cost=100000.0,
+            regulatory_basis="Lei 6.360/1976",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Rotulagem Não Conforme",
+            description="Inadequação da rotulagem conforme RDC 71/2009",
+            category=RiskCategory.COMPLIANCE,
+            probability=0.40,
+            impact=0.45,
+            level=RiskLevel.MEDIUM,
+            mitigation_cost=50000.0,
+            regulatory_basis="RDC 71/2009",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Mudanças Regulatórias",
+            description="Impacto de novas regulamentações não antecipadas",
+            category=RiskCategory.STRATEGIC,
+            probability=0.60,
+            impact=0.65,
+            level=RiskLevel.HIGH,
+            mitigation_cost=750000.0,
+            regulatory_basis="Evolução regulatória",
+            last_updated=_DB_LOAD_TIME
+        )
+    ),
+    "anatel_telecomunicacoes": (
+        RiskFactor(
+            name="Equipamento Não Homologado",
+            description="Comercialização sem certificação ANATEL",
+            category=RiskCategory.REGULATORY,
+            probability=0.20,
+            impact=0.80,
+            level=RiskLevel.HIGH,
+            mitigation_cost=200000.0,
+            regulatory_basis="Res. 242/2000",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Interferência Prejudicial",
+            description="Equipamentos causando interferência em outros serviços",
+            category=RiskCategory.OPERATIONAL,
+            probability=0.15,
+            impact=0.75,
+            level=RiskLevel.HIGH,
+            mitigation_cost=400000.0,
+            regulatory_basis="Res. 303/2002",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Descumprimento de Metas de Qualidade",
+            description="Não atendimento aos indicadores de qualidade",
+            category=RiskCategory.COMPLIANCE,
+            probability=0.35,
+            impact=0.60,
+            level=RiskLevel.MEDIUM,
+            mitigation_cost=350000.0,
+            regulatory_basis="Res. 717/2019",
+            last_updated=_DB_LOAD_TIME
+        )
+    ),
+    "lgpd_dados": (
+        RiskFactor(
+            name="Tratamento Ilícito de Dados",
+            description="Processamento sem base legal adequada",
+            category=RiskCategory.COMPLIANCE,
+            probability=0.45,
+            impact=0.70,
+            level=RiskLevel.HIGH,
+            mitigation_cost=200000.0,
+            regulatory_basis="Lei 13.709/2018",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Vazamento de Dados Pessoais",
+            description="Incidente de segurança com exposição de dados",
+            category=RiskCategory.REPUTATIONAL,
+            probability=0.25,
+            impact=0.85,
+            level=RiskLevel.HIGH,
+            mitigation_cost=500000.0,
+            regulatory_basis="Lei 13.709/2018",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Ausência de DPO",
+            description="Não designação de Encarregado de Dados",
+            category=RiskCategory.COMPLIANCE,
+            probability=0.30,
+            impact=0.50,
+            level=RiskLevel.MEDIUM,
+            mitigation_cost=80000.0,
+            regulatory_basis="Lei 13.709/2018 Art. 41",
+            last_updated=_DB_LOAD_TIME
+        ),
+        RiskFactor(
+            name="Transferência Internacional Irregular",
+            description="Transferência de dados para países sem adequação",
+            category=RiskCategory.REGULATORY,
+            probability=0.20,
+            impact=0.80,
+            level=RiskLevel.HIGH,
+            mitigation_cost=300000.0,
+            regulatory_basis="Lei 13.709/2018 Cap. V",
+            last_updated=_DB_LOAD_TIME
+        )
+    )
+})
+
+# Risk assessment frameworks (read-only, shared by all tools)
+_ASSESSMENT_FRAMEWORKS: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    "iso_31000": {
+        "name": "ISO 31000:2018 - Risk Management",
+        "methodology": "International standard for risk management",
+        "risk_matrix": {
+            "probability_levels": 5,
+            "impact_levels": 5,
+            "risk_levels": ["very_low", "low", "medium", "high", "critical"]
+        }
+    },
+    "coso_erm": {
+        "name": "COSO Enterprise Risk Management",
+        "methodology": "Integrated framework for enterprise risk management",
+        "risk_matrix": {
+            "probability_levels": 4,
+            "impact_levels": 4,
+            "risk_levels": ["low", "medium", "high", "critical"]
+        }
+    },
+    "anvisa_gestao_risco": {
+        "name": "Gestão de Risco ANVISA",
+        "methodology": "Baseado em ICH Q9 - Quality Risk Management",
+        "risk_matrix": {
+            "probability_levels": 3,
+            "impact_levels": 3,
+            "risk_levels": ["low", "medium", "high"]
+        }
+    }
+})
+
+# Column layout of each sector's risks for vectorized scoring, plus the
+# general assessment's top two risks of every sector
+_RISK_COLUMNS: Mapping[str, _RiskColumns] = MappingProxyType({
+    **{key: _risk_columns(risks) for key, risks in _RISK_DATABASE.items()},
+    _GENERAL_ASSESSMENT: _risk_columns([risk for risks in _RISK_DATABASE.values() for risk in risks[:2]])
+})
 
 
 class RegulatoryRiskAssessmentTool(BaseTool):
@@ -56,183 +505,10 @@ class RegulatoryRiskAssessmentTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.risk_database = self._load_risk_database()
-        self.assessment_frameworks = self._load_assessment_frameworks()
-        
-    def _load_risk_database(self) -> Dict[str, List[RiskFactor]]:
-        """Load comprehensive risk database."""
-        return {
-            "anvisa_farmaceutico": [
-                RiskFactor(
-                    name="Desvios de Boas Práticas de Fabricação (BPF)",
-                    description="Não conformidades com RDC 301/2019 durante inspeção",
-                    category=RiskCategory.REGULATORY,
-                    probability=0.25,
-                    impact=0.85,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=500000.0,
-                    regulatory_basis="RDC 301/2019",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Farmacovigilância Inadequada",
-                    description="Falhas no sistema de monitoramento pós-comercialização",
-                    category=RiskCategory.COMPLIANCE,
-                    probability=0.30,
-                    impact=0.70,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=300000.0,
-                    regulatory_basis="RDC 4/2009",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Registro de Produto Vencido",
-                    description="Comercialização com registro ANVISA vencido",
-                    category=RiskCategory.REGULATORY,
-                    probability=0.15,
-                    impact=0.90,
-                    level=RiskLevel.CRITICAL,
-                    mitigation_cost=100000.0,
-                    regulatory_basis="Lei 6.360/1976",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Rotulagem Não Conforme",
-                    description="Inadequação da rotulagem conforme RDC 71/2009",
-                    category=RiskCategory.COMPLIANCE,
-                    probability=0.40,
-                    impact=0.45,
-                    level=RiskLevel.MEDIUM,
-                    mitigation_cost=50000.0,
-                    regulatory_basis="RDC 71/2009",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Mudanças Regulatórias",
-                    description="Impacto de novas regulamentações não antecipadas",
-                    category=RiskCategory.STRATEGIC,
-                    probability=0.60,
-                    impact=0.65,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=750000.0,
-                    regulatory_basis="Evolução regulatória",
-                    last_updated=datetime.now()
-                )
-            ],
-            "anatel_telecomunicacoes": [
-                RiskFactor(
-                    name="Equipamento Não Homologado",
-                    description="Comercialização sem certificação ANATEL",
-                    category=RiskCategory.REGULATORY,
-                    probability=0.20,
-                    impact=0.80,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=200000.0,
-                    regulatory_basis="Res. 242/2000",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Interferência Prejudicial",
-                    description="Equipamentos causando interferência em outros serviços",
-                    category=RiskCategory.OPERATIONAL,
-                    probability=0.15,
-                    impact=0.75,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=400000.0,
-                    regulatory_basis="Res. 303/2002",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Descumprimento de Metas de Qualidade",
-                    description="Não atendimento aos indicadores de qualidade",
-                    category=RiskCategory.COMPLIANCE,
-                    probability=0.35,
-                    impact=0.60,
-                    level=RiskLevel.MEDIUM,
-                    mitigation_cost=350000.0,
-                    regulatory_basis="Res. 717/2019",
-                    last_updated=datetime.now()
-                )
-            ],
-            "lgpd_dados": [
-                RiskFactor(
-                    name="Tratamento Ilícito de Dados",
-                    description="Processamento sem base legal adequada",
-                    category=RiskCategory.COMPLIANCE,
-                    probability=0.45,
-                    impact=0.70,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=200000.0,
-                    regulatory_basis="Lei 13.709/2018",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Vazamento de Dados Pessoais",
-                    description="Incidente de segurança com exposição de dados",
-                    category=RiskCategory.REPUTATIONAL,
-                    probability=0.25,
-                    impact=0.85,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=500000.0,
-                    regulatory_basis="Lei 13.709/2018",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Ausência de DPO",
-                    description="Não designação de Encarregado de Dados",
-                    category=RiskCategory.COMPLIANCE,
-                    probability=0.30,
-                    impact=0.50,
-                    level=RiskLevel.MEDIUM,
-                    mitigation_cost=80000.0,
-                    regulatory_basis="Lei 13.709/2018 Art. 41",
-                    last_updated=datetime.now()
-                ),
-                RiskFactor(
-                    name="Transferência Internacional Irregular",
-                    description="Transferência de dados para países sem adequação",
-                    category=RiskCategory.REGULATORY,
-                    probability=0.20,
-                    impact=0.80,
-                    level=RiskLevel.HIGH,
-                    mitigation_cost=300000.0,
-                    regulatory_basis="Lei 13.709/2018 Cap. V",
-                    last_updated=datetime.now()
-                )
-            ]
-        }
-        
-    def _load_assessment_frameworks(self) -> Dict[str, Dict]:
-        """Load risk assessment frameworks."""
-        return {
-            "iso_31000": {
-                "name": "ISO 31000:2018 - Risk Management",
-                "methodology": "International standard for risk management",
-                "risk_matrix": {
-                    "probability_levels": 5,
-                    "impact_levels": 5,
-                    "risk_levels": ["very_low", "low", "medium", "high", "critical"]
-                }
-            },
-            "coso_erm": {
-                "name": "COSO Enterprise Risk Management",
-                "methodology": "Integrated framework for enterprise risk management",
-                "risk_matrix": {
-                    "probability_levels": 4,
-                    "impact_levels": 4,
-                    "risk_levels": ["low", "medium", "high", "critical"]
-                }
-            },
-            "anvisa_gestao_risco": {
-                "name": "Gestão de Risco ANVISA",
-                "methodology": "Baseado em ICH Q9 - Quality Risk Management",
-                "risk_matrix": {
-                    "probability_levels": 3,
-                    "impact_levels": 3,
-                    "risk_levels": ["low", "medium", "high"]
-                }
-            }
-        }
+        self.risk_database = _RISK_DATABASE
+        self.assessment_frameworks = _ASSESSMENT_FRAMEWORKS
+        self.risk_columns = _RISK_COLUMNS
+        self._sector_columns = lru_cache(maxsize=64)(self._route_sector)
         
     def _calculate_risk_score(self, probability: float, impact: float, framework: str = "iso_31000") -> float:
         """Calculate quantitative risk score."""
@@ -241,53 +517,16 @@ class RegulatoryRiskAssessmentTool(BaseTool):
         imp = max(0, min(1, impact))
         
         # Different calculation methods based on framework
-        if framework == "iso_31000":
-            # Standard multiplication method
-            return prob * imp
-        elif framework == "coso_erm":
-            # Weighted average with higher impact weight
-            return (prob * 0.4) + (imp * 0.6)
-        elif framework == "anvisa_gestao_risco":
-            # Pharmaceutical-specific calculation
-            return prob * imp * 1.2  # Higher weighting for pharma risks
-        else:
-            return prob * imp
+        return _RISK_SCORERS.get(framework, _iso_31000_score)(prob, imp)
             
     def _classify_risk_level(self, risk_score: float) -> RiskLevel:
         """Classify risk level based on score."""
-        if risk_score >= 0.8:
-            return RiskLevel.CRITICAL
-        elif risk_score >= 0.6:
-            return RiskLevel.HIGH
-        elif risk_score >= 0.4:
-            return RiskLevel.MEDIUM
-        elif risk_score >= 0.2:
-            return RiskLevel.LOW
-        else:
-            return RiskLevel.VERY_LOW
+        return _RISK_LEVELS_BY_CODE[bisect_right(_RISK_LEVEL_THRESHOLDS, risk_score)]
             
     def _estimate_financial_impact(self, risk_factor: RiskFactor, company_size: str = "medium") -> Dict[str, float]:
         """Estimate financial impact of risk materialization."""
-        size_multipliers = {
-            "small": 0.5,
-            "medium": 1.0,
-            "large": 2.0,
-            "multinational": 5.0
-        }
-        
-        multiplier = size_multipliers.get(company_size, 1.0)
-        
-        # Base financial impacts by category
-        base_impacts = {
-            RiskCategory.REGULATORY: 1000000 * multiplier,
-            RiskCategory.COMPLIANCE: 500000 * multiplier,
-            RiskCategory.OPERATIONAL: 300000 * multiplier,
-            RiskCategory.FINANCIAL: 800000 * multiplier,
-            RiskCategory.REPUTATIONAL: 1500000 * multiplier,
-            RiskCategory.STRATEGIC: 2000000 * multiplier
-        }
-        
-        base_impact = base_impacts.get(risk_factor.category, 500000 * multiplier)
+        multiplier = _COMPANY_SIZE_MULTIPLIERS.get(company_size, 1.0)
+        base_impact = float(_CATEGORY_BASE_IMPACTS[_RISK_CATEGORY_CODES[risk_factor.category]]) * multiplier
         
         return {
             "direct_costs": base_impact * risk_factor.impact,
@@ -296,84 +535,19 @@ class RegulatoryRiskAssessmentTool(BaseTool):
             "total_estimated_impact": base_impact * risk_factor.impact * 1.3 + risk_factor.mitigation_cost * multiplier
         }
         
-    def _generate_mitigation_strategies(self, risk_factor: RiskFactor) -> List[Dict[str, Any]]:
-        """Generate specific mitigation strategies for each risk."""
-        strategies = []
-        
-        if risk_factor.category == RiskCategory.REGULATORY:
-            strategies.extend([
-                {
-                    "strategy": "Monitoramento Regulatório Contínuo",
-                    "description": "Implementar sistema de acompanhamento de mudanças regulatórias",
-                    "effectiveness": 0.8,
-                    "cost": risk_factor.mitigation_cost * 0.3,
-                    "timeline": "3-6 meses"
-                },
-                {
-                    "strategy": "Relacionamento com Órgãos Reguladores",
-                    "description": "Estabelecer canais diretos de comunicação com reguladores",
-                    "effectiveness": 0.6,
-                    "cost": risk_factor.mitigation_cost * 0.2,
-                    "timeline": "1-3 meses"
-                }
-            ])
-            
-        if risk_factor.category == RiskCategory.COMPLIANCE:
-            strategies.extend([
-                {
-                    "strategy": "Programa de Compliance Robusto",
-                    "description": "Implementar programa estruturado de compliance regulatório",
-                    "effectiveness": 0.85,
-                    "cost": risk_factor.mitigation_cost * 0.8,
-                    "timeline": "6-12 meses"
-                },
-                {
-                    "strategy": "Auditoria Interna Regular",
-                    "description": "Estabelecer rotina de auditorias preventivas",
-                    "effectiveness": 0.7,
-                    "cost": risk_factor.mitigation_cost * 0.4,
-                    "timeline": "3-6 meses"
-                }
-            ])
-            
-        if risk_factor.category == RiskCategory.OPERATIONAL:
-            strategies.extend([
-                {
-                    "strategy": "Melhoria de Processos",
-                    "description": "Otimizar processos operacionais para reduzir riscos",
-                    "effectiveness": 0.75,
-                    "cost": risk_factor.mitigation_cost * 0.6,
-                    "timeline": "6-9 meses"
-                },
-                {
-                    "strategy": "Treinamento de Equipes",
-                    "description": "Capacitar equipes em procedimentos de risco",
-                    "effectiveness": 0.65,
-                    "cost": risk_factor.mitigation_cost * 0.3,
-                    "timeline": "2-4 meses"
-                }
-            ])
-            
-        # Add sector-specific strategies
-        if "anvisa" in risk_factor.regulatory_basis.lower():
-            strategies.append({
-                "strategy": "Sistema de Qualidade Farmacêutica",
-                "description": "Implementar PQS conforme ICH Q10",
-                "effectiveness": 0.9,
-                "cost": risk_factor.mitigation_cost * 1.2,
-                "timeline": "12-18 meses"
-            })
-            
-        if "lgpd" in risk_factor.regulatory_basis.lower():
-            strategies.append({
-                "strategy": "Privacy by Design",
-                "description": "Incorporar proteção de dados desde o design",
-                "effectiveness": 0.85,
-                "cost": risk_factor.mitigation_cost * 0.7,
-                "timeline": "6-12 meses"
-            })
-            
-        return strategies
+    def _generate_mitigation_strategies(self, risk_factor: RiskFactor, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Generate specific mitigation strategies for each risk, most effective first (at most ``limit``)."""
+        templates = _strategy_templates(risk_factor.category, risk_factor._basis_lower)[:limit]
+        return [
+            {
+                "strategy": template.strategy,
+                "description": template.description,
+                "effectiveness": template.effectiveness,
+                "cost": risk_factor.mitigation_cost * template.cost_fraction,
+                "timeline": template.timeline
+            }
+            for template in templates
+        ]
         
     def _calculate_residual_risk(self, original_risk: RiskFactor, mitigation_strategy: Dict[str, Any]) -> float:
         """Calculate residual risk after mitigation."""
@@ -384,145 +558,364 @@ class RegulatoryRiskAssessmentTool(BaseTool):
         residual_score = original_score * (1 - effectiveness)
         return residual_score
         
-    async def _execute(self, sector: str, company_size: str = "medium", assessment_scope: str = "comprehensive") -> str:
-        """Execute comprehensive regulatory risk assessment."""
-        try:
-            # Determine relevant risk categories
-            sector_lower = sector.lower()
-            
-            if "farmaceutico" in sector_lower or "anvisa" in sector_lower:
-                relevant_risks = self.risk_database.get("anvisa_farmaceutico", [])
-            elif "telecomunicacao" in sector_lower or "anatel" in sector_lower:
-                relevant_risks = self.risk_database.get("anatel_telecomunicacoes", [])
-            elif "tecnologia" in sector_lower or "dados" in sector_lower or "lgpd" in sector_lower:
-                relevant_risks = self.risk_database.get("lgpd_dados", [])
-            else:
-                # Combine all risks for general assessment
-                relevant_risks = []
-                for risk_list in self.risk_database.values():
-                    relevant_risks.extend(risk_list[:2])  # Top 2 from each category
-                    
-            # Calculate risk scores and classifications
-            risk_analysis = []
-            for risk in relevant_risks:
-                risk_score = self._calculate_risk_score(risk.probability, risk.impact)
-                financial_impact = self._estimate_financial_impact(risk, company_size)
-                mitigation_strategies = self._generate_mitigation_strategies(risk)
-                
-                # Calculate best mitigation strategy
-                best_strategy = max(mitigation_strategies, key=lambda x: x["effectiveness"]) if mitigation_strategies else None
-                residual_risk = self._calculate_residual_risk(risk, best_strategy) if best_strategy else risk_score
-                
-                risk_analysis.append({
-                    "risk_factor": risk,
-                    "risk_score": risk_score,
-                    "risk_level": self._classify_risk_level(risk_score),
-                    "financial_impact": financial_impact,
-                    "mitigation_strategies": mitigation_strategies,
-                    "best_strategy": best_strategy,
-                    "residual_risk": residual_risk,
-                    "residual_level": self._classify_risk_level(residual_risk)
-                })
-                
-            # Sort by risk score descending
-            risk_analysis.sort(key=lambda x: x["risk_score"], reverse=True)
+    def _route_sector(self, sector: str) -> _RiskColumns:
+        """Pick the risk database for a sector (cached per instance)."""
+        match = _SECTOR_ROUTE_RE.match(sector.lower())
+        
+        # Combine all risks for general assessment when no keyword matches
+        return self.risk_columns[match.lastgroup if match else _GENERAL_ASSESSMENT]
             
-            # Format comprehensive report
-            result = f"# Avaliação de Riscos Regulatórios - {sector.title()}\n\n"
-            result += f"**Setor:** {sector}\n"
-            result += f"**Porte da Empresa:** {company_size.title()}\n"
-            result += f"**Escopo da Avaliação:** {assessment_scope}\n"
-            result += f"**Data da Avaliação:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-            result += f"**Total de Riscos Avaliados:** {len(risk_analysis)}\n\n"
+    def _analyze_risks(
+        self,
+        columns: _RiskColumns,
+        company_size: str = "medium",
+        framework: str = "iso_31000",
+        all_strategies_min_level: RiskLevel = RiskLevel.VERY_LOW
+    ) -> _RiskAssessment:
+        """Score, classify and cost every risk at once, highest risk score first.
+        
+        Vectorized equivalent of ``_calculate_risk_score``,
+        ``_classify_risk_level`` and ``_estimate_financial_impact`` applied
+        to each risk; mitigation strategies are still generated per risk.
+        Risks below ``all_strategies_min_level`` only get their best
+        (recommended) strategy.
+        """
+        probability = np.clip(columns.probability, 0, 1)
+        impact = np.clip(columns.impact, 0, 1)
+        risk_scores = _RISK_SCORERS.get(framework, _iso_31000_score)(probability, impact)
+        level_codes = np.digitize(risk_scores, _RISK_LEVEL_THRESHOLDS)
+        
+        multiplier = _COMPANY_SIZE_MULTIPLIERS.get(company_size, 1.0)
+        direct_costs = _CATEGORY_BASE_IMPACTS[columns.category_code] * multiplier * columns.impact
+        opportunity_costs = direct_costs * 0.3
+        mitigation_costs = columns.mitigation_cost * multiplier
+        total_impacts = direct_costs * 1.3 + mitigation_costs
+        
+        lists_all_strategies = (level_codes >= _RISK_LEVEL_CODES[all_strategies_min_level]).tolist()
+        
+        risk_analysis = []
+        best_strategy_costs = []
+        # Stable descending order, as list.sort(reverse=True) gives
+        order = np.argsort(-risk_scores, kind="stable")
+        for i in order.tolist():
+            risk = columns.risks[i]
+            risk_score = float(risk_scores[i])
+            mitigation_strategies = self._generate_mitigation_strategies(risk, None if lists_all_strategies[i] else 1)
             
-            # Executive Summary
-            high_critical_risks = [r for r in risk_analysis if r["risk_level"] in [RiskLevel.HIGH, RiskLevel.CRITICAL]]
-            total_financial_exposure = sum(r["financial_impact"]["total_estimated_impact"] for r in risk_analysis)
-            
-            result += "## Resumo Executivo\n\n"
-            result += f"- **Riscos Críticos/Altos:** {len(high_critical_risks)} de {len(risk_analysis)}\n"
-            result += f"- **Exposição Financeira Total:** R$ {total_financial_exposure:,.2f}\n"
-            result += f"- **Risco Médio da Carteira:** {np.mean([r['risk_score'] for r in risk_analysis]):.2f}/1.00\n\n"
-            
-            # Risk Matrix Summary
-            result += "## Matriz de Riscos\n\n"
-            result += "| Nível | Quantidade | % do Total |\n"
-            result += "|-------|------------|------------|\n"
-            
-            risk_levels = [RiskLevel.CRITICAL, RiskLevel.HIGH, RiskLevel.MEDIUM, RiskLevel.LOW, RiskLevel.VERY_LOW]
-            for level in risk_levels:
-                count = len([r for r in risk_analysis if r["risk_level"] == level])
-                percentage = (count / len(risk_analysis) * 100) if risk_analysis else 0
-                result += f"| {level.value.replace('_', ' ').title()} | {count} | {percentage:.1f}% |\n"
-                
-            result += "\n"
-            
-            # Detailed Risk Analysis
-            result += "## Análise Detalhada dos Riscos\n\n"
-            
-            for i, analysis in enumerate(risk_analysis, 1):
-                risk = analysis["risk_factor"]
-                result += f"### {i}. {risk.name}\n\n"
-                result += f"**Descrição:** {risk.description}\n\n"
-                result += f"**Categoria:** {risk.category.value.title()}\n"
-                result += f"**Base Regulatória:** {risk.regulatory_basis}\n"
-                result += f"**Probabilidade:** {risk.probability:.1%}\n"
-                result += f"**Impacto:** {risk.impact:.1%}\n"
-                result += f"**Score de Risco:** {analysis['risk_score']:.2f}/1.00\n"
-                result += f"**Nível de Risco:** {analysis['risk_level'].value.replace('_', ' ').title()}\n\n"
-                
-                # Financial Impact
-                fin_impact = analysis["financial_impact"]
-                result += "**Impacto Financeiro Estimado:**\n"
-                result += f"- Custos Diretos: R$ {fin_impact['direct_costs']:,.2f}\n"
-                result += f"- Custos de Oportunidade: R$ {fin_impact['opportunity_costs']:,.2f}\n"
-                result += f"- Custos de Mitigação: R$ {fin_impact['mitigation_costs']:,.2f}\n"
-                result += f"- **Total Estimado: R$ {fin_impact['total_estimated_impact']:,.2f}**\n\n"
-                
-                # Best Mitigation Strategy
-                if analysis["best_strategy"]:
-                    strategy = analysis["best_strategy"]
-                    result += "**Estratégia de Mitigação Recomendada:**\n"
-                    result += f"- **Estratégia:** {strategy['strategy']}\n"
-                    result += f"- **Descrição:** {strategy['description']}\n"
-                    result += f"- **Efetividade:** {strategy['effectiveness']:.1%}\n"
-                    result += f"- **Custo:** R$ {strategy['cost']:,.2f}\n"
-                    result += f"- **Prazo:** {strategy['timeline']}\n"
-                    result += f"- **Risco Residual:** {analysis['residual_risk']:.2f}/1.00 ({analysis['residual_level'].value.replace('_', ' ').title()})\n\n"
-                    
-                result += "---\n\n"
-                
-            # Strategic Recommendations
-            result += "## Recomendações Estratégicas\n\n"
-            
-            if len(high_critical_risks) > 3:
-                result += "1. **URGENTE:** Implementar plano de emergência para riscos críticos\n"
-                result += "2. Priorizar investimentos em compliance preventivo\n"
-                result += "3. Estabelecer comitê de gestão de riscos regulatórios\n"
-            elif len(high_critical_risks) > 0:
-                result += "1. Focar na mitigação dos riscos de maior impacto\n"
-                result += "2. Implementar monitoramento contínuo dos riscos identificados\n"
-                result += "3. Desenvolver planos de contingência específicos\n"
-            else:
-                result += "1. Manter programa de monitoramento de riscos\n"
-                result += "2. Revisar avaliação semestralmente\n"
-                result += "3. Continuar investimentos em prevenção\n"
-                
-            result += f"4. Orçamento recomendado para mitigação: R$ {sum(r['best_strategy']['cost'] for r in risk_analysis if r['best_strategy']):,.2f}\n"
-            result += f"5. Próxima reavaliação: {(datetime.now() + timedelta(days=180)).strftime('%d/%m/%Y')}\n\n"
+            # Strategies come most effective first
+            best_strategy = mitigation_strategies[0] if mitigation_strategies else None
+            residual_risk = self._calculate_residual_risk(risk, best_strategy) if best_strategy else risk_score
+            best_strategy_costs.append(best_strategy["cost"] if best_strategy else 0.0)
+            
+            risk_analysis.append({
+                "risk_factor": risk,
+                "risk_score": risk_score,
+                "risk_level": _RISK_LEVELS_BY_CODE[level_codes[i]],
+                "financial_impact": {
+                    "direct_costs": float(direct_costs[i]),
+                    "opportunity_costs": float(opportunity_costs[i]),
+                    "mitigation_costs": float(mitigation_costs[i]),
+                    "total_estimated_impact": float(total_impacts[i])
+                },
+                "mitigation_strategies": mitigation_strategies,
+                "best_strategy": best_strategy,
+                "residual_risk": residual_risk,
+                "residual_level": self._classify_risk_level(residual_risk)
+            })
             
-            result += "---\n\n"
-            result += "**Metodologia:** Análise baseada em ISO 31000:2018, dados históricos regulatórios e inteligência de mercado.\n"
-            result += "**Aviso:** Esta avaliação tem caráter orientativo. Recomenda-se validação com especialistas setoriais.\n"
-            result += "**Gerado por:** Sistema de Gestão de Riscos Regulatórios - Grupo Soluto"
+        return _RiskAssessment(
+            risk_analysis,
+            level_codes[order],
+            risk_scores[order],
+            total_impacts[order],
+            np.array(best_strategy_costs, dtype=np.float64)
+        )
+        
+    def _render_markdown(
+        self, sector: str, company_size: str, assessment_scope: str, assessment: _RiskAssessment, now: datetime
+    ) -> str:
+        """Format the assessment as a Markdown report."""
+        risk_analysis = assessment.analysis
+        parts: List[str] = [f"# Avaliação de Riscos Regulatórios - {sector.title()}\n\n"]
+        parts.append(f"**Setor:** {sector}\n")
+        parts.append(f"**Porte da Empresa:** {company_size.title()}\n")
+        parts.append(f"**Escopo da Avaliação:** {assessment_scope}\n")
+        parts.append(f"**Data da Avaliação:** {now.strftime('%d/%m/%Y %H:%M')}\n")
+        parts.append(f"**Total de Riscos Avaliados:** {len(risk_analysis)}\n\n")
+        
+        # Executive Summary
+        high_critical_count = assessment.high_critical_count
+        total_financial_exposure = assessment.total_impacts.sum()
+        
+        parts.append("## Resumo Executivo\n\n")
+        parts.append(f"- **Riscos Críticos/Altos:** {high_critical_count} de {len(risk_analysis)}\n")
+        parts.append(f"- **Exposição Financeira Total:** R$ {total_financial_exposure:,.2f}\n")
+        parts.append(f"- **Risco Médio da Carteira:** {assessment.risk_scores.mean():.2f}/1.00\n\n")
+        
+        # Risk Matrix Summary
+        parts.append("## Matriz de Riscos\n\n")
+        parts.append("| Nível | Quantidade | % do Total |\n")
+        parts.append("|-------|------------|------------|\n")
+        
+        level_counts = np.bincount(assessment.level_codes, minlength=len(_RISK_LEVELS_BY_CODE)).tolist()
+        for code in reversed(range(len(_RISK_LEVELS_BY_CODE))):
+            level = _RISK_LEVELS_BY_CODE[code]
+            count = level_counts[code]
+            percentage = (count / len(risk_analysis) * 100) if risk_analysis else 0
+            parts.append(f"| {_RISK_LEVEL_LABELS[level]} | {count} | {percentage:.1f}% |\n")
+            
+        parts.append("\n")
+        
+        # Detailed Risk Analysis
+        parts.append("## Análise Detalhada dos Riscos\n\n")
+        
+        for i, analysis in enumerate(risk_analysis, 1):
+            risk = analysis["risk_factor"]
+            fin_impact = analysis["financial_impact"]
+            strategy = analysis["best_strategy"]
+            
+            # Best Mitigation Strategy
+            strategy_section = _RISK_STRATEGY_TEMPLATE.format_map({
+                "strategy": strategy["strategy"],
+                "description": strategy["description"],
+                "effectiveness": strategy["effectiveness"],
+                "cost": strategy["cost"],
+                "timeline": strategy["timeline"],
+                "residual_risk": analysis["residual_risk"],
+                "residual_level": _RISK_LEVEL_LABELS[analysis["residual_level"]]
+            }) if strategy else ""
+            
+            parts.append(_RISK_DETAIL_TEMPLATE.format_map({
+                "index": i,
+                "name": risk.name,
+                "description": risk.description,
+                "category": risk.category.value.title(),
+                "regulatory_basis": risk.regulatory_basis,
+                "probability": risk.probability,
+                "impact": risk.impact,
+                "risk_score": analysis["risk_score"],
+                "risk_level": _RISK_LEVEL_LABELS[analysis["risk_level"]],
+                "direct_costs": fin_impact["direct_costs"],
+                "opportunity_costs": fin_impact["opportunity_costs"],
+                "mitigation_costs": fin_impact["mitigation_costs"],
+                "total_estimated_impact": fin_impact["total_estimated_impact"],
+                "strategy_section": strategy_section
+            }))
+            
+        # Strategic Recommendations
+        parts.append("## Recomendações Estratégicas\n\n")
+        
+        for number, recommendation in enumerate(_strategic_recommendations(high_critical_count), 1):
+            parts.append(f"{number}. {recommendation}\n")
             
-            return result
+        parts.append(f"4. Orçamento recomendado para mitigação: R$ {assessment.best_strategy_costs.sum():,.2f}\n")
+        parts.append(f"5. Próxima reavaliação: {(now + timedelta(days=180)).strftime('%d/%m/%Y')}\n\n")
+        
+        parts.append("---\n\n")
+        parts.append("**Metodologia:** Análise baseada em ISO 31000:2018, dados históricos regulatórios e inteligência de mercado.\n")
+        parts.append("**Aviso:** Esta avaliação tem caráter orientativo. Recomenda-se validação com especialistas setoriais.\n")
+        parts.append("**Gerado por:** Sistema de Gestão de Riscos Regulatórios - Grupo Soluto")
+        
+        return "".join(parts)
+        
+    def _render_json(
+        self, sector: str, company_size: str, assessment_scope: str, assessment: _RiskAssessment, now: datetime
+    ) -> str:
+        """Serialize the assessment as JSON for downstream agents."""
+        risk_analysis = assessment.analysis
+        high_critical_count = assessment.high_critical_count
+        level_counts = np.bincount(assessment.level_codes, minlength=len(_RISK_LEVELS_BY_CODE)).tolist()
+        
+        risks = []
+        for analysis in risk_analysis:
+            risk = analysis["risk_factor"]
+            strategy = analysis["best_strategy"]
+            risks.append({
+                "name": risk.name,
+                "description": risk.description,
+                "category": risk.category.value,
+                "regulatory_basis": risk.regulatory_basis,
+                "probability": risk.probability,
+                "impact": risk.impact,
+                "risk_score": analysis["risk_score"],
+                "risk_level": analysis["risk_level"].value,
+                "financial_impact": analysis["financial_impact"],
+                "best_strategy": {
+                    "strategy": strategy["strategy"],
+                    "description": strategy["description"],
+                    "effectiveness": strategy["effectiveness"],
+                    "cost": strategy["cost"],
+                    "timeline": strategy["timeline"]
+                } if strategy else None,
+                "residual_risk": analysis["residual_risk"],
+                "residual_level": analysis["residual_level"].value
+            })
+            
+        return json.dumps({
+            "sector": sector,
+            "company_size": company_size,
+            "assessment_scope": assessment_scope,
+            "assessment_date": now.isoformat(timespec="minutes"),
+            "summary": {
+                "total_risks": len(risk_analysis),
+                "high_critical_risks": high_critical_count,
+                "total_financial_exposure": assessment.total_impacts.sum().item(),
+                "average_risk_score": assessment.risk_scores.mean().item(),
+                "risk_level_counts": {level.value: count for level, count in zip(_RISK_LEVELS_BY_CODE, level_counts)}
+            },
+            "risks": risks,
+            "recommendations": list(_strategic_recommendations(high_critical_count)),
+            "mitigation_budget": assessment.best_strategy_costs.sum().item(),
+            "next_review": (now + timedelta(days=180)).date().isoformat()
+        }, ensure_ascii=False)
+        
+    async def _execute(
+        self,
+        sector: str,
+        company_size: str = "medium",
+        assessment_scope: str = "comprehensive",
+        output_format: str = "markdown"
+    ) -> str:
+        """Execute comprehensive regulatory risk assessment.
+        
+        The report is Markdown by default; output_format="json" returns the
+        same assessment as a JSON document, skipping the Markdown rendering.
+        """
+        try:
+            if output_format not in _RISK_OUTPUT_FORMATS:
+                return f"Formato de saída '{output_format}' não suportado. Formatos disponíveis: {', '.join(_RISK_OUTPUT_FORMATS)}"
+                
+            # Determine relevant risk categories
+            columns = self._sector_columns(sector)
+            # Narrower scopes only list alternative strategies for the risks that drive the report
+            all_strategies_min_level = RiskLevel.VERY_LOW if assessment_scope == "comprehensive" else _SUMMARY_STRATEGY_MIN_LEVEL
+            assessment = self._analyze_risks(columns, company_size, all_strategies_min_level=all_strategies_min_level)
+            
+            now = datetime.now()
+            if output_format == "json":
+                return self._render_json(sector, company_size, assessment_scope, assessment, now)
+            return self._render_markdown(sector, company_size, assessment_scope, assessment, now)
             
         except Exception as e:
             self.logger.error(f"Erro na avaliação de riscos: {e}")
             return f"Erro na avaliação de riscos: {str(e)}"
 
 
+# Implementation effort estimate of each effort level
+_IMPLEMENTATION_EFFORTS: Mapping[str, Dict[str, str]] = MappingProxyType({
+    "high": {
+        "effort_level": "high",
+        "estimated_hours": "500-2000h",
+        "estimated_cost": "R$ 100.000 - R$ 500.000",
+        "timeline": "6-18 meses"
+    },
+    "medium": {
+        "effort_level": "medium",
+        "estimated_hours": "100-500h",
+        "estimated_cost": "R$ 20.000 - R$ 100.000",
+        "timeline": "2-6 meses"
+    },
+    "low": {
+        "effort_level": "low",
+        "estimated_hours": "20-100h",
+        "estimated_cost": "R$ 5.000 - R$ 20.000",
+        "timeline": "1-2 meses"
+    }
+})
+
+# Keywords of a (lowercased) requirement that set its implementation effort
+# and the regulatory risk of leaving it unmet
+_HIGH_EFFORT_RE = re.compile("sistema|implementação|validação|certificação")
+_MEDIUM_EFFORT_RE = re.compile("procedimento|processo|controle|política")
+_CRITICAL_RISK_RE = re.compile("licença|autorização|certificado|registro")
+_HIGH_RISK_RE = re.compile("qualidade|segurança|relatório|monitoramento")
+
+_COST_RE = re.compile(r'R\$ ([\d.]+)')
+_DEFAULT_EFFORT_COST = 50000
+
+
+def _cost_midpoint(cost_range: str) -> float:
+    """Middle value of a "R$ min - R$ max" cost range (default when unparseable)."""
+    cost_match = _COST_RE.findall(cost_range.replace('.', ''))
+    if len(cost_match) >= 2:
+        return (float(cost_match[0]) + float(cost_match[1])) / 2
+    return _DEFAULT_EFFORT_COST
+
+
+# Estimated cost used in action plans for each effort level
+_EFFORT_COST_MIDPOINTS = MappingProxyType({
+    level: _cost_midpoint(effort["estimated_cost"]) for level, effort in _IMPLEMENTATION_EFFORTS.items()
+})
+
+
+# Rank of a gap's regulatory risk and priority in the action plan, most
+# urgent first; unknown values rank last
+_ACTION_PLAN_RANKS = MappingProxyType({"critical": 0, "high": 1, "medium": 2, "low": 3})
+
+
+def _action_plan_rank(gap: Dict[str, Any]) -> Tuple[int, int]:
+    """Sort key of a gap in the action plan: regulatory risk, then priority."""
+    return (
+        _ACTION_PLAN_RANKS.get(gap["regulatory_risk"]["risk_level"], 3),
+        _ACTION_PLAN_RANKS.get(gap["priority"], 3),
+    )
+
+
+class _PlanItem(NamedTuple):
+    """One gap in a prioritized action plan."""
+    priority: int
+    requirement: str
+    category: str
+    effort_level: str
+    timeline: str
+    estimated_cost: float
+    cumulative_cost: float
+    regulatory_risk: str
+    business_justification: str
+
+
+def _requirement_terms(requirement: str) -> Tuple[FrozenSet[str], int]:
+    """Lowercase term set of a requirement and the overlap a control needs.
+    
+    A control matches when it shares at least 60% of the requirement's
+    terms; the overlap is an integer, so the ceiling of that fraction is an
+    exact threshold.
+    """
+    terms = frozenset(requirement.lower().split())
+    return terms, math.ceil(len(terms) * 0.6)
+
+
+class _RequirementIndex(NamedTuple):
+    """Requirements of a framework as a requirement × term incidence matrix.
+    
+    Rows follow the category order of the requirements; thresholds holds
+    the overlap each requirement needs (see ``_requirement_terms``). Counts
+    are float32 so overlaps go through BLAS; they stay exact integers.
+    """
+    term_ids: Mapping[str, int]
+    incidence: np.ndarray
+    thresholds: np.ndarray
+
+
+def _requirement_index(requirements: Sequence[str]) -> _RequirementIndex:
+    """Build the incidence matrix of ``requirements`` over their own terms."""
+    requirement_terms = [_requirement_terms(requirement) for requirement in requirements]
+    term_ids: Dict[str, int] = {}
+    for terms, _ in requirement_terms:
+        for term in terms:
+            term_ids.setdefault(term, len(term_ids))
+            
+    incidence = np.zeros((len(requirement_terms), len(term_ids)), dtype=np.float32)
+    for row, (terms, _) in enumerate(requirement_terms):
+        incidence[row, [term_ids[term] for term in terms]] = 1
+        
+    return _RequirementIndex(
+        term_ids=MappingProxyType(term_ids),
+        incidence=incidence,
+        thresholds=np.array([threshold for _, threshold in requirement_terms], dtype=np.float32),
+    )
+
+
 class ComplianceGapAnalysisTool(BaseTool):
     """Real compliance gap analysis tool with actionable recommendations."""
     
@@ -532,6 +925,19 @@ class ComplianceGapAnalysisTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.compliance_frameworks = self._load_compliance_frameworks()
+        # Term incidence matrix and matching thresholds of the requirements
+        # of each framework, in category order
+        self._requirement_index = {
+            framework_key: _requirement_index([
+                requirement
+                for req_list in framework.get("requirements", {}).values()
+                for requirement in req_list
+            ])
+            for framework_key, framework in self.compliance_frameworks.items()
+        }
+        # Per-instance cache of assessments, keyed on the framework and the
+        # normalized control tuple built in _execute
+        self._assess_controls = lru_cache(maxsize=128)(self._freeze_compliance_level)
         
     def _load_compliance_frameworks(self) -> Dict[str, Dict]:
         """Load comprehensive compliance frameworks."""
@@ -668,10 +1074,15 @@ class ComplianceGapAnalysisTool(BaseTool):
             "categories": {},
             "overall_compliance": 0.0,
             "gaps": [],
+            "gaps_by_category": {},
             "implemented_count": 0,
             "risk_level": "low"
         }
         
+        # Match every requirement against every control in one pass; the flags
+        # follow the category order of the requirements
+        implemented_flags = iter(self._match_requirements(self._requirement_index[framework_key], implemented_controls))
+        
         # Assess each category
         for category, req_list in requirements.items():
             category_score = 0
@@ -679,10 +1090,7 @@ class ComplianceGapAnalysisTool(BaseTool):
             
             for requirement in req_list:
                 # Check if requirement is implemented
-                is_implemented = any(
-                    self._requirement_matches(requirement.lower(), control.lower())
-                    for control in implemented_controls
-                )
+                is_implemented = next(implemented_flags)
                 
                 if is_implemented:
                     category_score += 1
@@ -704,10 +1112,10 @@ class ComplianceGapAnalysisTool(BaseTool):
         assessment["overall_compliance"] = (assessment["implemented_count"] / total_requirements) * 100
         assessment["risk_level"] = self._assess_overall_risk(assessment["overall_compliance"])
         
-        # Identify critical gaps
+        # Identify critical gaps, also kept grouped by category for the report
         for category, data in assessment["categories"].items():
             if data["risk_level"] in ["high", "critical"]:
-                assessment["gaps"].extend([
+                category_gaps = [
                     {
                         "category": category,
                         "requirement": req,
@@ -716,21 +1124,43 @@ class ComplianceGapAnalysisTool(BaseTool):
                         "regulatory_risk": self._assess_regulatory_risk(framework_key, req)
                     }
                     for req in data["missing"]
-                ])
+                ]
+                assessment["gaps_by_category"][category] = category_gaps
+                assessment["gaps"].extend(category_gaps)
                 
         return assessment
         
-    def _requirement_matches(self, requirement: str, implemented_control: str) -> bool:
-        """Check if implemented control matches requirement."""
-        # Extract key terms from requirement
-        requirement_terms = set(requirement.split())
-        control_terms = set(implemented_control.split())
+    def _freeze_compliance_level(self, framework_key: str, controls: Tuple[str, ...]) -> Mapping[str, Any]:
+        """Assess normalized controls, returned read-only since results are shared through the cache."""
+        return MappingProxyType(self._assess_compliance_level(framework_key, list(controls)))
+        
+    def _match_requirements(self, index: _RequirementIndex, implemented_controls: List[str]) -> List[bool]:
+        """Check which requirements are matched by any implemented control.
         
-        # Calculate overlap
-        common_terms = requirement_terms.intersection(control_terms)
+        Each control becomes a column of its terms over the requirements'
+        vocabulary (other terms can't overlap), so one matrix product gives
+        the shared term count of every requirement × control pair.
+        """
+        if not implemented_controls:
+            return [False] * len(index.thresholds)
+            
+        term_ids = index.term_ids
+        rows: List[int] = []
+        columns: List[int] = []
+        for column, control in enumerate(implemented_controls):
+            for term in set(control.lower().split()):
+                row = term_ids.get(term)
+                if row is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    
+        control_incidence = np.zeros((len(term_ids), len(implemented_controls)), dtype=np.float32)
+        control_incidence[rows, columns] = 1
         
-        # Consider it a match if 60% of requirement terms are present
-        return len(common_terms) >= len(requirement_terms) * 0.6
+        # Consider it a match if 60% of requirement terms are present in
+        # some control
+        overlap = index.incidence @ control_incidence
+        return (overlap.max(axis=1) >= index.thresholds).tolist()
         
     def _assess_category_risk(self, compliance_percentage: float) -> str:
         """Assess risk level for a compliance category."""
@@ -759,29 +1189,14 @@ class ComplianceGapAnalysisTool(BaseTool):
         requirement_lower = requirement.lower()
         
         # High effort requirements
-        if any(term in requirement_lower for term in ["sistema", "implementação", "validação", "certificação"]):
-            return {
-                "effort_level": "high",
-                "estimated_hours": "500-2000h",
-                "estimated_cost": "R$ 100.000 - R$ 500.000",
-                "timeline": "6-18 meses"
-            }
+        if _HIGH_EFFORT_RE.search(requirement_lower):
+            return dict(_IMPLEMENTATION_EFFORTS["high"])
         # Medium effort requirements    
-        elif any(term in requirement_lower for term in ["procedimento", "processo", "controle", "política"]):
-            return {
-                "effort_level": "medium", 
-                "estimated_hours": "100-500h",
-                "estimated_cost": "R$ 20.000 - R$ 100.000",
-                "timeline": "2-6 meses"
-            }
+        elif _MEDIUM_EFFORT_RE.search(requirement_lower):
+            return dict(_IMPLEMENTATION_EFFORTS["medium"])
         # Low effort requirements
         else:
-            return {
-                "effort_level": "low",
-                "estimated_hours": "20-100h", 
-                "estimated_cost": "R$ 5.000 - R$ 20.000",
-                "timeline": "1-2 meses"
-            }
+            return dict(_IMPLEMENTATION_EFFORTS["low"])
             
     def _assess_regulatory_risk(self, framework_key: str, requirement: str) -> Dict[str, Any]:
         """Assess regulatory risk of non-compliance."""
@@ -791,7 +1206,7 @@ class ComplianceGapAnalysisTool(BaseTool):
         requirement_lower = requirement.lower()
         
         # Critical requirements (high penalties)
-        if any(term in requirement_lower for term in ["licença", "autorização", "certificado", "registro"]):
+        if _CRITICAL_RISK_RE.search(requirement_lower):
             return {
                 "risk_level": "critical",
                 "potential_penalty": penalties.get("critical", "Penalidade severa"),
@@ -799,7 +1214,7 @@ class ComplianceGapAnalysisTool(BaseTool):
                 "probability": "alta se detectado"
             }
         # Important requirements (medium penalties)
-        elif any(term in requirement_lower for term in ["qualidade", "segurança", "relatório", "monitoramento"]):
+        elif _HIGH_RISK_RE.search(requirement_lower):
             return {
                 "risk_level": "high",
                 "potential_penalty": penalties.get("major", "Multa significativa"),
@@ -815,15 +1230,10 @@ class ComplianceGapAnalysisTool(BaseTool):
                 "probability": "baixa se detectado"
             }
             
-    def _generate_action_plan(self, gaps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_action_plan(self, gaps: List[Dict[str, Any]]) -> List[_PlanItem]:
         """Generate prioritized action plan for closing gaps."""
-        # Sort gaps by priority and regulatory risk
-        priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        
-        sorted_gaps = sorted(gaps, key=lambda x: (
-            priority_order.get(x["regulatory_risk"]["risk_level"], 3),
-            priority_order.get(x["priority"], 3)
-        ))
+        # Sort gaps by regulatory risk and priority
+        sorted_gaps = sorted(gaps, key=_action_plan_rank)
         
         action_plan = []
         cumulative_cost = 0
@@ -831,29 +1241,22 @@ class ComplianceGapAnalysisTool(BaseTool):
         for i, gap in enumerate(sorted_gaps, 1):
             effort = gap["estimated_effort"]
             
-            # Extract cost range and take middle value
-            cost_range = effort["estimated_cost"]
-            cost_match = re.findall(r'R\$ ([\d.]+)', cost_range.replace('.', ''))
-            if len(cost_match) >= 2:
-                min_cost = float(cost_match[0])
-                max_cost = float(cost_match[1])
-                estimated_cost = (min_cost + max_cost) / 2
-            else:
-                estimated_cost = 50000  # Default
+            # Middle value of the effort's cost range
+            estimated_cost = _EFFORT_COST_MIDPOINTS.get(effort["effort_level"], _DEFAULT_EFFORT_COST)
                 
             cumulative_cost += estimated_cost
             
-            action_plan.append({
-                "priority": i,
-                "requirement": gap["requirement"],
-                "category": gap["category"],
-                "effort_level": effort["effort_level"],
-                "timeline": effort["timeline"],
-                "estimated_cost": estimated_cost,
-                "cumulative_cost": cumulative_cost,
-                "regulatory_risk": gap["regulatory_risk"]["risk_level"],
-                "business_justification": self._generate_business_justification(gap)
-            })
+            action_plan.append(_PlanItem(
+                priority=i,
+                requirement=gap["requirement"],
+                category=gap["category"],
+                effort_level=effort["effort_level"],
+                timeline=effort["timeline"],
+                estimated_cost=estimated_cost,
+                cumulative_cost=cumulative_cost,
+                regulatory_risk=gap["regulatory_risk"]["risk_level"],
+                business_justification=self._generate_business_justification(gap)
+            ))
             
         return action_plan
         
@@ -880,124 +1283,118 @@ class ComplianceGapAnalysisTool(BaseTool):
             if not controls_list:
                 return "Lista de controles implementados não pode estar vazia"
                 
-            # Perform assessment
-            assessment = self._assess_compliance_level(framework, controls_list)
+            # Perform assessment. Matching lowercases controls and ignores their
+            # order and repeats, so equivalent lists share a cache slot
+            controls_key = tuple(sorted({control.lower() for control in controls_list}))
+            assessment = self._assess_controls(framework, controls_key)
             
             if "error" in assessment:
                 available_frameworks = list(self.compliance_frameworks.keys())
                 return f"{assessment['error']}. Frameworks disponíveis: {', '.join(available_frameworks)}"
                 
             # Format comprehensive report
-            result = f"# Análise de Lacunas de Compliance - {assessment['framework']}\n\n"
-            result += f"**Framework:** {framework}\n"
-            result += f"**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-            result += f"**Total de Controles Avaliados:** {len(controls_list)}\n\n"
+            parts: List[str] = [f"# Análise de Lacunas de Compliance - {assessment['framework']}\n\n"]
+            parts.append(f"**Framework:** {framework}\n")
+            parts.append(f"**Data da Análise:** {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+            parts.append(f"**Total de Controles Avaliados:** {len(controls_list)}\n\n")
             
             # Executive Summary
-            result += "## Resumo Executivo\n\n"
-            result += f"- **Compliance Geral:** {assessment['overall_compliance']:.1f}%\n"
-            result += f"- **Nível de Risco:** {assessment['risk_level'].upper()}\n"
-            result += f"- **Controles Implementados:** {assessment['implemented_count']}/{assessment['total_requirements']}\n"
-            result += f"- **Lacunas Identificadas:** {len(assessment['gaps'])}\n"
+            parts.append("## Resumo Executivo\n\n")
+            parts.append(f"- **Compliance Geral:** {assessment['overall_compliance']:.1f}%\n")
+            parts.append(f"- **Nível de Risco:** {assessment['risk_level'].upper()}\n")
+            parts.append(f"- **Controles Implementados:** {assessment['implemented_count']}/{assessment['total_requirements']}\n")
+            parts.append(f"- **Lacunas Identificadas:** {len(assessment['gaps'])}\n")
             
             # Risk indicator
             if assessment['risk_level'] == 'critical':
-                result += f"- **🔴 STATUS:** CRÍTICO - Ação imediata necessária\n\n"
+                parts.append(f"- **🔴 STATUS:** CRÍTICO - Ação imediata necessária\n\n")
             elif assessment['risk_level'] == 'high':
-                result += f"- **🟠 STATUS:** ALTO RISCO - Priorizar adequação\n\n"
+                parts.append(f"- **🟠 STATUS:** ALTO RISCO - Priorizar adequação\n\n")
             elif assessment['risk_level'] == 'medium':
-                result += f"- **🟡 STATUS:** RISCO MODERADO - Melhorias necessárias\n\n"
+                parts.append(f"- **🟡 STATUS:** RISCO MODERADO - Melhorias necessárias\n\n")
             else:
-                result += f"- **🟢 STATUS:** BAIXO RISCO - Manter monitoramento\n\n"
+                parts.append(f"- **🟢 STATUS:** BAIXO RISCO - Manter monitoramento\n\n")
                 
             # Category Analysis
-            result += "## Análise por Categoria\n\n"
-            result += "| Categoria | Compliance | Implementados | Total | Risco |\n"
-            result += "|-----------|------------|---------------|----------|-------|\n"
+            parts.append("## Análise por Categoria\n\n")
+            parts.append("| Categoria | Compliance | Implementados | Total | Risco |\n")
+            parts.append("|-----------|------------|---------------|----------|-------|\n")
             
             for category, data in assessment["categories"].items():
                 risk_emoji = {"low": "🟢", "medium": "🟡", "high": "🟠", "critical": "🔴"}
                 emoji = risk_emoji.get(data["risk_level"], "⚪")
-                result += f"| {category.replace('_', ' ').title()} | {data['compliance_percentage']:.1f}% | {data['implemented']}/{data['total']} | {data['total']} | {emoji} {data['risk_level'].title()} |\n"
+                parts.append(f"| {category.replace('_', ' ').title()} | {data['compliance_percentage']:.1f}% | {data['implemented']}/{data['total']} | {data['total']} | {emoji} {data['risk_level'].title()} |\n")
                 
-            result += "\n"
+            parts.append("\n")
             
             # Detailed Gap Analysis
             if assessment["gaps"]:
-                result += "## Lacunas Identificadas\n\n"
+                parts.append("## Lacunas Identificadas\n\n")
                 
-                # Group gaps by category
-                gaps_by_category = {}
-                for gap in assessment["gaps"]:
-                    category = gap["category"]
-                    if category not in gaps_by_category:
-                        gaps_by_category[category] = []
-                    gaps_by_category[category].append(gap)
-                    
-                for category, gaps in gaps_by_category.items():
-                    result += f"### {category.replace('_', ' ').title()}\n\n"
+                for category, gaps in assessment["gaps_by_category"].items():
+                    parts.append(f"### {category.replace('_', ' ').title()}\n\n")
                     
                     for gap in gaps:
                         risk_level = gap["regulatory_risk"]["risk_level"]
                         priority_emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🟢"}
                         emoji = priority_emoji.get(risk_level, "⚪")
                         
-                        result += f"**{emoji} {gap['requirement']}**\n"
-                        result += f"- **Prioridade:** {gap['priority'].title()}\n"
-                        result += f"- **Risco Regulatório:** {risk_level.title()}\n"
-                        result += f"- **Esforço:** {gap['estimated_effort']['effort_level'].title()}\n"
-                        result += f"- **Prazo:** {gap['estimated_effort']['timeline']}\n"
-                        result += f"- **Custo:** {gap['estimated_effort']['estimated_cost']}\n"
-                        result += f"- **Penalidade Potencial:** {gap['regulatory_risk']['potential_penalty']}\n\n"
+                        parts.append(f"**{emoji} {gap['requirement']}**\n")
+                        parts.append(f"- **Prioridade:** {gap['priority'].title()}\n")
+                        parts.append(f"- **Risco Regulatório:** {risk_level.title()}\n")
+                        parts.append(f"- **Esforço:** {gap['estimated_effort']['effort_level'].title()}\n")
+                        parts.append(f"- **Prazo:** {gap['estimated_effort']['timeline']}\n")
+                        parts.append(f"- **Custo:** {gap['estimated_effort']['estimated_cost']}\n")
+                        parts.append(f"- **Penalidade Potencial:** {gap['regulatory_risk']['potential_penalty']}\n\n")
                         
             # Action Plan
             if generate_action_plan and assessment["gaps"]:
                 action_plan = self._generate_action_plan(assessment["gaps"])
                 
-                result += "## Plano de Ação Priorizado\n\n"
-                result += "| # | Requisito | Categoria | Prazo | Custo | Risco | Justificativa |\n"
-                result += "|---|-----------|-----------|-------|-------|-------|---------------|\n"
+                parts.append("## Plano de Ação Priorizado\n\n")
+                parts.append("| # | Requisito | Categoria | Prazo | Custo | Risco | Justificativa |\n")
+                parts.append("|---|-----------|-----------|-------|-------|-------|---------------|\n")
                 
                 for action in action_plan[:10]:  # Top 10 priorities
-                    result += f"| {action['priority']} | {action['requirement'][:40]}... | {action['category']} | {action['timeline']} | R$ {action['estimated_cost']:,.0f} | {action['regulatory_risk'].title()} | {action['business_justification'][:60]}... |\n"
+                    parts.append(f"| {action.priority} | {action.requirement[:40]}... | {action.category} | {action.timeline} | R$ {action.estimated_cost:,.0f} | {action.regulatory_risk.title()} | {action.business_justification[:60]}... |\n")
                     
-                result += "\n"
-                result += f"**Investimento Total Estimado:** R$ {action_plan[-1]['cumulative_cost']:,.2f}\n"
-                result += f"**Prazo Total Estimado:** {len(action_plan)} itens - 12-24 meses para implementação completa\n\n"
+                parts.append("\n")
+                parts.append(f"**Investimento Total Estimado:** R$ {action_plan[-1].cumulative_cost:,.2f}\n")
+                parts.append(f"**Prazo Total Estimado:** {len(action_plan)} itens - 12-24 meses para implementação completa\n\n")
                 
             # Strategic Recommendations
-            result += "## Recomendações Estratégicas\n\n"
+            parts.append("## Recomendações Estratégicas\n\n")
             
             if assessment['risk_level'] == 'critical':
-                result += "1. **URGENTE:** Formar força-tarefa para adequação imediata\n"
-                result += "2. Implementar controles críticos nos próximos 30 dias\n"
-                result += "3. Consultar advogado especializado em direito regulatório\n"
-                result += "4. Preparar plano de comunicação com órgãos reguladores\n"
+                parts.append("1. **URGENTE:** Formar força-tarefa para adequação imediata\n")
+                parts.append("2. Implementar controles críticos nos próximos 30 dias\n")
+                parts.append("3. Consultar advogado especializado em direito regulatório\n")
+                parts.append("4. Preparar plano de comunicação com órgãos reguladores\n")
             elif assessment['risk_level'] == 'high':
-                result += "1. Priorizar implementação dos controles de alto risco\n"
-                result += "2. Estabelecer cronograma agressivo de adequação (6 meses)\n"
-                result += "3. Designar responsável dedicado ao projeto de compliance\n"
-                result += "4. Implementar monitoramento mensal do progresso\n"
+                parts.append("1. Priorizar implementação dos controles de alto risco\n")
+                parts.append("2. Estabelecer cronograma agressivo de adequação (6 meses)\n")
+                parts.append("3. Designar responsável dedicado ao projeto de compliance\n")
+                parts.append("4. Implementar monitoramento mensal do progresso\n")
             elif assessment['risk_level'] == 'medium':
-                result += "1. Desenvolver plano estruturado de melhoria (12 meses)\n"
-                result += "2. Focar nas lacunas de maior impacto primeiro\n"
-                result += "3. Estabelecer revisões trimestrais do compliance\n"
-                result += "4. Investir em treinamento das equipes\n"
+                parts.append("1. Desenvolver plano estruturado de melhoria (12 meses)\n")
+                parts.append("2. Focar nas lacunas de maior impacto primeiro\n")
+                parts.append("3. Estabelecer revisões trimestrais do compliance\n")
+                parts.append("4. Investir em treinamento das equipes\n")
             else:
-                result += "1. Manter excelência no programa de compliance\n"
-                result += "2. Revisar adequação semestralmente\n"
-                result += "3. Monitorar mudanças regulatórias proativamente\n"
-                result += "4. Considerar certificações adicionais\n"
+                parts.append("1. Manter excelência no programa de compliance\n")
+                parts.append("2. Revisar adequação semestralmente\n")
+                parts.append("3. Monitorar mudanças regulatórias proativamente\n")
+                parts.append("4. Considerar certificações adicionais\n")
                 
-            result += f"5. Orçamento anual recomendado: R$ {(action_plan[-1]['cumulative_cost'] / 2):,.0f} (distribuído em 24 meses)\n"
-            result += f"6. Próxima revisão: {(datetime.now() + timedelta(days=90)).strftime('%d/%m/%Y')}\n\n"
+            parts.append(f"5. Orçamento anual recomendado: R$ {(action_plan[-1].cumulative_cost / 2):,.0f} (distribuído em 24 meses)\n")
+            parts.append(f"6. Próxima revisão: {(datetime.now() + timedelta(days=90)).strftime('%d/%m/%Y')}\n\n")
             
-            result += "---\n\n"
-            result += "**Metodologia:** Análise baseada em frameworks regulatórios oficiais e melhores práticas de mercado.\n"
-            result += "**Limitações:** Esta análise tem caráter orientativo. Validação com especialistas é recomendada.\n"
-            result += "**Gerado por:** Sistema de Análise de Compliance - Grupo Soluto"
+            parts.append("---\n\n")
+            parts.append("**Metodologia:** Análise baseada em frameworks regulatórios oficiais e melhores práticas de mercado.\n")
+            parts.append("**Limitações:** Esta análise tem caráter orientativo. Validação com especialistas é recomendada.\n")
+            parts.append("**Gerado por:** Sistema de Análise de Compliance - Grupo Soluto")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             self.logger.error(f"Erro na análise de lacunas: {e}")
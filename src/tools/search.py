@@ -1,11 +1,13 @@
 """Web search tool for agents."""
 
 import asyncio
+import re
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote_plus
 
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..config import get_settings
 from ..utils import get_logger
@@ -13,6 +15,33 @@ from .base import BaseTool, ToolResult
 
 logger = get_logger(__name__)
 
+# Only this much of a result page is downloaded for content extraction; the
+# extracted text is cut to a short excerpt anyway, so the tail of large
+# pages is never needed
+_MAX_PAGE_BYTES = 512_000
+
+# Target in the query string of a DuckDuckGo redirect link: the first
+# non-empty "uddg" parameter, still percent-encoded
+_DDG_REDIRECT_PREFIX = "//duckduckgo.com/l/?"
+_DDG_TARGET_RE = re.compile(r"(?:^|&)uddg=([^&]+)")
+
+# Search results are reused for a few minutes; agents often repeat the same
+# query within a run
+_SEARCH_CACHE_TTL = 600
+_SEARCH_CACHE_MAX_ENTRIES = 512
+
+# Result pages fetched at once for content extraction, across all searches
+# running on the tool
+_MAX_CONCURRENT_EXTRACTIONS = 8
+
+# Runs of whitespace in extracted page text
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Only DuckDuckGo's result blocks are built into the tree. The class is
+# matched as a whitespace-separated token because result divs carry several
+# classes ("result results_links ...")
+_DDG_RESULTS_STRAINER = SoupStrainer("div", class_=re.compile(r"(?:^|\s)result(?:\s|$)"))
+
 
 class WebSearchTool(BaseTool):
     """Tool for searching the web."""
@@ -23,6 +52,36 @@ class WebSearchTool(BaseTool):
     def __init__(self):
         """Initialize web search tool."""
         self.settings = get_settings()
+        self._session: Optional[aiohttp.ClientSession] = None
+        # (query, num_results, search_engine) -> (stored at, results)
+        self._search_cache: Dict[Tuple[str, int, str], Tuple[float, List[Dict[str, Any]]]] = {}
+        # Searches currently in flight, shared by concurrent identical calls
+        self._pending_searches: Dict[Tuple[str, int, str], asyncio.Future] = {}
+        self._extraction_slots = asyncio.Semaphore(_MAX_CONCURRENT_EXTRACTIONS)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the HTTP session shared by searches and extractions.
+
+        The keep-alive pool lets repeated queries reuse DuckDuckGo's (and the
+        result sites') connections instead of paying TCP and TLS handshakes
+        on every call; a new session is opened only after ``cleanup``.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=10,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300,
+                ),
+            )
+        return self._session
+
+    async def cleanup(self) -> None:
+        """Close the HTTP session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
 
     async def execute(
         self,
@@ -34,10 +93,7 @@ class WebSearchTool(BaseTool):
         start_time = time.time()
 
         try:
-            if search_engine == "duckduckgo":
-                results = await self._search_duckduckgo(query, num_results)
-            else:
-                raise ValueError(f"Unsupported search engine: {search_engine}")
+            results = await self._cached_search(query, num_results, search_engine)
 
             execution_time = time.time() - start_time
 
@@ -68,17 +124,61 @@ class WebSearchTool(BaseTool):
                 execution_time=time.time() - start_time,
             )
 
+    async def _cached_search(
+        self,
+        query: str,
+        num_results: int,
+        search_engine: str,
+    ) -> List[Dict[str, Any]]:
+        """Run a search, reusing recent results and joining identical calls in flight.
+
+        Callers get their own copies of the result dicts, since
+        ``search_and_extract`` enriches them in place.
+        """
+        key = (query, num_results, search_engine)
+        cached = self._search_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL:
+            return [dict(result) for result in cached[1]]
+
+        pending = self._pending_searches.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._search(key))
+            self._pending_searches[key] = pending
+            pending.add_done_callback(lambda _: self._pending_searches.pop(key, None))
+
+        # Shielded so that one cancelled caller doesn't abort the search for
+        # the others waiting on it
+        results = await asyncio.shield(pending)
+        return [dict(result) for result in results]
+
+    async def _search(self, key: Tuple[str, int, str]) -> List[Dict[str, Any]]:
+        """Run a search against the engine and cache its results."""
+        query, num_results, search_engine = key
+        if search_engine == "duckduckgo":
+            results = await self._search_duckduckgo(query, num_results)
+        else:
+            raise ValueError(f"Unsupported search engine: {search_engine}")
+
+        # Empty results usually mean a failed or throttled request; don't pin them
+        if results:
+            self._search_cache.pop(key, None)
+            if len(self._search_cache) >= _SEARCH_CACHE_MAX_ENTRIES:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = (time.monotonic(), results)
+        return results
+
     async def _search_duckduckgo(self, query: str, num_results: int) -> List[Dict[str, Any]]:
         """Search using DuckDuckGo HTML interface."""
         url = "https://html.duckduckgo.com/html/"
         params = {"q": query}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=params) as response:
-                html = await response.text()
+        session = await self._get_session()
+        async with session.post(url, data=params) as response:
+            html = await response.text()
 
         # Parse results
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml", parse_only=_DDG_RESULTS_STRAINER)
         results = []
 
         for result in soup.find_all("div", class_="result", limit=num_results):
@@ -91,12 +191,12 @@ class WebSearchTool(BaseTool):
                 snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
                 # Clean up the link
-                if link.startswith("//duckduckgo.com/l/?"):
+                if link.startswith(_DDG_REDIRECT_PREFIX):
                     # Extract actual URL from DDG redirect
-                    import urllib.parse
-                    parsed = urllib.parse.parse_qs(urllib.parse.urlparse(link).query)
-                    if "uddg" in parsed:
-                        link = parsed["uddg"][0]
+                    redirect_qs = link[len(_DDG_REDIRECT_PREFIX):].partition("#")[0]
+                    target = _DDG_TARGET_RE.search(redirect_qs)
+                    if target:
+                        link = unquote_plus(target.group(1))
 
                 results.append({
                     "title": title,
@@ -124,29 +224,18 @@ class WebSearchTool(BaseTool):
         if not extract_content:
             return results
 
-        # Extract content from each result
-        enriched_results = []
-        
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for result in results:
-                task = self._extract_page_content(session, result)
-                tasks.append(task)
-            
-            enriched = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            for original, enhanced in zip(results, enriched):
-                if isinstance(enhanced, Exception):
-                    logger.warning(
-                        "content_extraction_failed",
-                        url=original["link"],
-                        error=str(enhanced),
-                    )
-                    enriched_results.append(original)
-                else:
-                    enriched_results.append(enhanced)
-
-        return enriched_results
+        # Each page is fetched once, even if the engine listed it twice
+        unique_results: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            unique_results.setdefault(result["link"], result)
+
+        # Extract content from each result. _extract_page_content enriches the
+        # result in place and returns it, falling back to the original result on
+        # any error, so the gathered list needs no post-processing
+        session = await self._get_session()
+        return list(await asyncio.gather(
+            *(self._extract_page_content(session, result) for result in unique_results.values())
+        ))
 
     async def _extract_page_content(
         self,
@@ -154,6 +243,15 @@ class WebSearchTool(BaseTool):
         result: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Extract content from a web page."""
+        async with self._extraction_slots:
+            return await self._fetch_page_content(session, result)
+
+    async def _fetch_page_content(
+        self,
+        session: aiohttp.ClientSession,
+        result: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Fetch a result page and add its text to the result."""
         try:
             async with session.get(
                 result["link"],
@@ -163,18 +261,18 @@ class WebSearchTool(BaseTool):
                 if response.status != 200:
                     return result
 
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
+                raw = await response.content.read(_MAX_PAGE_BYTES)
+                html = raw.decode(response.charset or "utf-8", errors="replace")
+                soup = BeautifulSoup(html, "lxml")
 
-                # Remove script and style elements
+                # Remove script and style elements (a parse-time strainer cannot
+                # drop them: it only filters top-level tags, and they sit
+                # inside <html>)
                 for script in soup(["script", "style"]):
                     script.decompose()
 
-                # Extract text
-                text = soup.get_text()
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = " ".join(chunk for chunk in chunks if chunk)
+                # Extract text, collapsing every whitespace run to one space
+                text = _WHITESPACE_RE.sub(" ", soup.get_text()).strip()
 
                 # Limit content length
                 max_length = 1000
@@ -12,6 +12,25 @@ from ..config import get_settings
 
 console = Console()
 
+# Longest repr of a tool's input or output written to the log
+_MAX_LOGGED_PAYLOAD_CHARS = 2000
+
+
+class _TruncatedRepr:
+    """Log value whose repr is built only when rendered, and capped in length."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = _MAX_LOGGED_PAYLOAD_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        text = repr(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}...<+{len(text) - self.limit} chars>"
+
 
 def setup_logging() -> None:
     """Setup logging configuration."""
@@ -51,15 +70,20 @@ def setup_logging() -> None:
 
     structlog.configure(
         processors=processors,
+        # Methods below the configured level are no-ops, so dropped records
+        # never reach the processor chain; filter_by_level stays for stdlib
+        # loggers whose own level is set higher. The level goes in as an int:
+        # structlog only accepts level names from 25.1
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(settings.log_level)),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: str) -> structlog.BoundLogger:
-    """Get a logger instance."""
-    return structlog.get_logger(name)
+def get_logger(name: str, **initial_values: Any) -> structlog.BoundLogger:
+    """Get a logger instance, optionally with context bound to every record."""
+    return structlog.get_logger(name, **initial_values)
 
 
 class AgentLogger:
@@ -67,41 +91,46 @@ class AgentLogger:
 
     def __init__(self, agent_name: str):
         """Initialize agent logger."""
-        self.logger = get_logger(f"agent.{agent_name}")
+        # The agent name is bound once rather than merged into every call;
+        # passing it as initial context keeps the logger lazy, so it still
+        # picks up a setup_logging() that runs after the agent is created
+        self.logger = get_logger(f"agent.{agent_name}", agent=agent_name)
         self.agent_name = agent_name
 
     def log_action(self, action: str, details: Dict[str, Any]) -> None:
         """Log agent action."""
         self.logger.info(
             "agent_action",
-            agent=self.agent_name,
             action=action,
             **details,
         )
 
     def log_thought(self, thought: str) -> None:
         """Log agent thought process."""
+        if not self.logger.is_enabled_for(logging.DEBUG):
+            return
         self.logger.debug(
             "agent_thought",
-            agent=self.agent_name,
             thought=thought,
         )
 
     def log_tool_use(self, tool: str, input_data: Any, output: Any) -> None:
         """Log tool usage."""
+        # Tool payloads can be large; skip building the record when it
+        # would be dropped
+        if not self.logger.is_enabled_for(logging.INFO):
+            return
         self.logger.info(
             "tool_use",
-            agent=self.agent_name,
             tool=tool,
-            input=input_data,
-            output=output,
+            input=_TruncatedRepr(input_data),
+            output=_TruncatedRepr(output),
         )
 
     def log_error(self, error: str, exception: Exception | None = None) -> None:
         """Log agent error."""
         self.logger.error(
             "agent_error",
-            agent=self.agent_name,
             error=error,
             exc_info=exception,
         )
\ No newline at end of file